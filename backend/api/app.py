@@ -1,20 +1,43 @@
+import hmac
 import sys
 import os
 import eventlet
 eventlet.monkey_patch()
-from flask import Flask, g, current_app
+import threading
+import time
+from flask import Flask, Response, g, current_app, request
 from flask_cors import CORS
 import pymysql
 from flask_jwt_extended import JWTManager
 from config import Config
 from socket_wrapper import socketio
+from utils.compression_utils import compress_response
+from utils.db_metrics import InstrumentedConnection, record_request
+from utils.json_provider import init_json_provider
+from utils.metrics import render_prometheus
+from utils.replica_utils import PRIMARY, choose_target, reads_from_replica, record_writes, replica_usable
 
 cors = CORS()
 jwt = JWTManager()
 
 class MySQL:
+    """
+    Per-app-context pymysql connections, borrowed from small pools of idle connections.
+
+    A context takes a connection on first use and gives it back at teardown after a rollback,
+    so the next borrower starts outside any transaction. Up to MYSQL_POOL_SIZE idle connections
+    are kept per server; ones idle longer than MYSQL_POOL_RECYCLE_SECONDS are pinged before reuse.
+
+    Reads in @read_only views go to a replica when one is configured and fresh enough
+    (see utils/replica_utils.py); a context can hold one primary and one replica connection.
+
+    limit_statement_time() caps the SELECTs of a context with MySQL's max_execution_time; the
+    session limit is reset before its connections go back to the pool.
+    """
     def __init__(self, app=None):
         self.app = app
+        self._pools = {}
+        self._pool_lock = threading.Lock()
         if app is not None:
             self.init_app(app)
     
@@ -23,9 +46,12 @@ class MySQL:
         app.mysql = self 
         app.teardown_appcontext(self.teardown)
     
-    def connect(self):
+    def connect(self, target=PRIMARY):
+        host, port = (current_app.config['MYSQL_HOST'], current_app.config.get('MYSQL_PORT', 3306)) \
+            if target == PRIMARY else target
         return pymysql.connect(
-            host=current_app.config['MYSQL_HOST'],
+            host=host,
+            port=port,
             user=current_app.config['MYSQL_USER'],
             password=current_app.config['MYSQL_PASSWORD'],
             database=current_app.config['MYSQL_DB'],
@@ -33,22 +59,107 @@ class MySQL:
             cursorclass=pymysql.cursors.DictCursor,
             autocommit=False
         )
+
+    def _checkout(self, target):
+        recycle = current_app.config.get('MYSQL_POOL_RECYCLE_SECONDS', 300)
+        while True:
+            with self._pool_lock:
+                pool = self._pools.get(target)
+                if not pool:
+                    break
+                connection, returned_at = pool.pop()
+            if time.monotonic() - returned_at < recycle:
+                return connection
+            try:
+                connection.ping(reconnect=False)
+                return connection
+            except Exception:
+                self._discard(connection)
+
+        connection = self.connect(target)
+        if current_app.config.get('DB_INSTRUMENTATION', True):
+            connection = InstrumentedConnection(connection)
+        return connection
+
+    def _checkin(self, target, connection):
+        with self._pool_lock:
+            pool = self._pools.setdefault(target, [])
+            if len(pool) < current_app.config.get('MYSQL_POOL_SIZE', 10):
+                pool.append((connection, time.monotonic()))
+                return
+        self._discard(connection)
+
+    @staticmethod
+    def _discard(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
     
+    @staticmethod
+    def _session_execute(connection, statement, args=None):
+        # Session settings are not the view's queries, so they bypass query instrumentation
+        if isinstance(connection, InstrumentedConnection):
+            connection = connection._connection
+        cursor = connection.cursor()
+        try:
+            cursor.execute(statement, args)
+        finally:
+            cursor.close()
+
+    def limit_statement_time(self, milliseconds):
+        """
+        Makes MySQL abort any SELECT of the current app context running longer than milliseconds.
+        Call it before the context's first query.
+        """
+        g._mysql_statement_limit_ms = int(milliseconds)
+
+    def _borrowed(self, connection):
+        limit_ms = g.get('_mysql_statement_limit_ms')
+        if limit_ms:
+            self._session_execute(connection, "SET SESSION max_execution_time = %s", (limit_ms,))
+        return connection
+
     def teardown(self, exception):
-        ctx = g.pop('_mysql_connection', None)
-        if ctx is not None:
+        limited = g.pop('_mysql_statement_limit_ms', None)
+        for target, connection in g.pop('_mysql_connections', {}).values():
             try:
-                if exception:
-                    ctx.rollback()
-                ctx.close()
+                if limited:
+                    self._session_execute(connection, "SET SESSION max_execution_time = DEFAULT")
+                connection.rollback()
             except Exception:
-                pass
+                self._discard(connection)
+                continue
+            self._checkin(target, connection)
+
+    def _replica_connection(self, replica):
+        try:
+            connection = self._checkout(replica)
+        except pymysql.MySQLError as e:
+            current_app.logger.warning(f"Replica {replica[0]}:{replica[1]} unavailable, reading from primary: {e}")
+            return None
+        if not replica_usable(replica, connection):
+            self._checkin(replica, connection)
+            return None
+        return connection
     
     @property
     def connection(self):
-        if '_mysql_connection' not in g:
-            g._mysql_connection = self.connect()
-        return g._mysql_connection
+        connections = g.setdefault('_mysql_connections', {})
+        if reads_from_replica():
+            if 'replica' not in connections:
+                target = choose_target()
+                connection = self._replica_connection(target) if target != PRIMARY else None
+                if connection is None:
+                    # Decided once per context: the rest of its reads stay on the primary
+                    g._mysql_read_only = False
+                else:
+                    connections['replica'] = (target, self._borrowed(connection))
+            if 'replica' in connections:
+                return connections['replica'][1]
+        if PRIMARY not in connections:
+            connections[PRIMARY] = (PRIMARY, self._borrowed(self._checkout(PRIMARY)))
+        return connections[PRIMARY][1]
 
 mysql = MySQL()
 
@@ -72,6 +183,10 @@ def init_extensions(app):
         response.headers['Cross-Origin-Opener-Policy'] = 'unsafe-none'
         return response
 
+    app.after_request(compress_response)
+    app.after_request(record_request)
+    app.after_request(record_writes)
+
 def create_app(testing: bool = False) -> Flask:
     app = Flask(__name__)
 
@@ -79,6 +194,7 @@ def create_app(testing: bool = False) -> Flask:
     if testing:
         app.config['TESTING'] = True
 
+    init_json_provider(app)
     init_extensions(app)
 
     # Register routes
@@ -91,6 +207,9 @@ def create_app(testing: bool = False) -> Flask:
     from routes.admin import bp as admin_bp
     from routes.preferences import bp as preferences_bp
     from routes.embedding import bp as embedding_bp
+    from routes.home import bp as home_bp
+    from routes.batch import bp as batch_bp
+    from routes.search import bp as search_bp
 
     app.register_blueprint(auth_bp)
     app.register_blueprint(users_bp)
@@ -101,11 +220,23 @@ def create_app(testing: bool = False) -> Flask:
     app.register_blueprint(admin_bp)
     app.register_blueprint(preferences_bp)
     app.register_blueprint(embedding_bp)
+    app.register_blueprint(home_bp)
+    app.register_blueprint(batch_bp)
+    app.register_blueprint(search_bp)
 
     @app.route('/health', methods=['GET'])
     def health_check():
         return {'status': 'healthy', 'service': 'skywise-api'}, 200
 
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        if not app.config.get('METRICS_ENABLED', False):
+            return {'error': 'Not found'}, 404
+        token = app.config.get('METRICS_TOKEN')
+        if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            return {'error': 'Unauthorized'}, 401
+        return Response(render_prometheus(), mimetype='text/plain; version=0.0.4')
+
     if not testing:
         _init_background_tasks(app)
     
@@ -117,6 +248,7 @@ def _init_background_tasks(app):
     import routes.bot as bot
     import threading
     from utils.embedding_utils import ensure_courses_embedded
+    from utils.transcript_search import index_transcripts
     
     app.bot_module = bot
     app._bot_initialized = False
@@ -129,6 +261,7 @@ def _init_background_tasks(app):
                 ensure_courses_embedded()
                 app._embeddings_initialized = True
                 app.logger.info("Course embeddings initialized successfully")
+                app.logger.info(f"Transcript indexing: {index_transcripts() or 'already running elsewhere'}")
         except Exception as e:
             app.logger.warning(f"Embeddings initialization error: {e}")
     
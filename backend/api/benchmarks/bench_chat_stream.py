@@ -0,0 +1,132 @@
+"""
+/chat streaming cost: one socket frame per model delta versus coalesced frames.
+
+Boots the API twice against the local OpenAI stand-in (benchmarks/fake_openai.py), first with
+CHAT_FLUSH_MS=0 (a frame per delta, the previous behaviour) and then with the given flush settings,
+and has --chats concurrent socket.io clients each send one message. Reports frames received per
+second, frames per answer, time to the first and last frame, and the API process's CPU seconds
+(from /proc, so Linux only).
+
+Needs MySQL like the load test (the bot loads the course catalog on its first request).
+
+Usage (from backend/api, with the MYSQL_* variables set):
+    python -m benchmarks.bench_chat_stream [--chats 200] [--flush-ms 50] [--flush-chars 64] [--json results.json]
+"""
+import argparse
+import json
+import os
+import threading
+import time
+
+import socketio
+
+from benchmarks.fake_openai import start_fake_openai
+from benchmarks.load_test import boot_api, percentile
+
+LONG_REPLY = ("Sky Wise has several beginner courses that build confidence with everyday digital skills, "
+              "from staying safe online and spotting scams to video calls with family, online banking "
+              "and managing your email. ") * 6
+
+
+def cpu_seconds(pid):
+    with open(f'/proc/{pid}/stat') as f:
+        fields = f.read().rsplit(')', 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+
+def run_chat(base_url, results, lock):
+    frames = []
+    done = threading.Event()
+    client = socketio.Client(reconnection=False)
+    client.on('response', lambda data: frames.append(time.perf_counter()), namespace='/chat')
+    client.on('completed', lambda data: done.set(), namespace='/chat')
+
+    ok = False
+    start = time.perf_counter()
+    try:
+        client.connect(base_url, namespaces=['/chat'], transports=['websocket'], wait_timeout=30)
+        start = time.perf_counter()
+        client.send('What courses are there for beginners?', namespace='/chat')
+        ok = done.wait(timeout=120)
+    except Exception:
+        ok = False
+    finally:
+        try:
+            client.disconnect()
+        except Exception:
+            pass
+    with lock:
+        results.append({
+            'ok': ok, 'frames': len(frames),
+            'first_ms': (frames[0] - start) * 1000 if frames else None,
+            'last_ms': (frames[-1] - start) * 1000 if frames else None,
+        })
+
+
+def run_variant(name, chats, port, openai_url, extra_env):
+    process, base_url = boot_api(port, openai_url, extra_env)
+    try:
+        # First message loads the catalog into the bot; keep it out of the measurement
+        warm = []
+        run_chat(base_url, warm, threading.Lock())
+
+        results, lock = [], threading.Lock()
+        cpu_before = cpu_seconds(process.pid)
+        started = time.perf_counter()
+        threads = [threading.Thread(target=run_chat, args=(base_url, results, lock)) for _ in range(chats)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+        cpu = cpu_seconds(process.pid) - cpu_before
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+    ok = [r for r in results if r['ok']]
+    frames = sum(r['frames'] for r in results)
+    first = sorted(r['first_ms'] for r in ok if r['first_ms'] is not None)
+    last = sorted(r['last_ms'] for r in ok if r['last_ms'] is not None)
+    return {
+        'variant': name,
+        'chats_ok': len(ok),
+        'frames': frames,
+        'frames_per_answer': round(frames / max(len(results), 1), 1),
+        'frames_per_second': round(frames / wall, 1),
+        'first_frame_p50_ms': round(percentile(first, 0.5), 1) if first else None,
+        'last_frame_p95_ms': round(percentile(last, 0.95), 1) if last else None,
+        'server_cpu_seconds': round(cpu, 2),
+        'wall_seconds': round(wall, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--chats', type=int, default=200, help='concurrent chat sessions')
+    parser.add_argument('--flush-ms', type=int, default=50)
+    parser.add_argument('--flush-chars', type=int, default=64)
+    parser.add_argument('--token-delay-ms', type=float, default=5, help='delay between fake model deltas')
+    parser.add_argument('--port', type=int, default=5098)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    stub, openai_url = start_fake_openai(token_delay_ms=args.token_delay_ms, reply=LONG_REPLY)
+    try:
+        results = [
+            run_variant('per-delta', args.chats, args.port, openai_url, {'CHAT_FLUSH_MS': '0'}),
+            run_variant(f'coalesced {args.flush_ms}ms/{args.flush_chars}ch', args.chats, args.port, openai_url,
+                        {'CHAT_FLUSH_MS': str(args.flush_ms), 'CHAT_FLUSH_CHARS': str(args.flush_chars)}),
+        ]
+    finally:
+        stub.shutdown()
+
+    for row in results:
+        print(json.dumps(row))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Bytes-on-wire and CPU cost of response compression per endpoint.
+
+Builds payloads shaped like the real responses (public catalog, tutorial list, tutorial with
+transcript, admin listings) and reports raw size, compressed size and CPU time per response
+for gzip and brotli at the configured levels.
+
+Usage (from backend/api):
+    python -m benchmarks.bench_compression [--iterations 200] [--json results.json]
+"""
+import argparse
+import gzip
+import json
+import time
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from config import Config
+
+
+def _vtt_transcript(cues):
+    lines = ["WEBVTT", ""]
+    for i in range(cues):
+        start, end = i * 4, i * 4 + 4
+        lines.append(f"00:{start // 60:02d}:{start % 60:02d}.000 --> 00:{end // 60:02d}:{end % 60:02d}.000")
+        lines.append(f"In this part of the tutorial we look at step {i} of keeping your account secure.")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def build_payloads():
+    courses = [
+        {
+            "id": i, "name": f"Course {i}", "difficulty": "Beginner",
+            "description": "Build confidence with everyday digital skills. " * 4,
+            "duration_min_minutes": 30, "duration_max_minutes": 90,
+            "thumbnail_url": f"https://cdn.example.com/thumbs/{i}.png",
+        }
+        for i in range(40)
+    ]
+    tutorials = [
+        {
+            "id": i, "title": f"Tutorial {i}", "description": "Learn the basics step by step. " * 3,
+            "category": "digital-skills", "video_provider": "synthesia",
+            "video_url": f"https://share.synthesia.io/{i:08x}", "course_id": i % 40,
+            "created_at": "Mon, 01 Jan 2024 10:00:00 GMT",
+        }
+        for i in range(300)
+    ]
+    tutorial = dict(tutorials[0], video_transcript=_vtt_transcript(150),
+                    has_completed_quiz=False, is_completed=False)
+    users = [
+        {
+            "id": i, "username": f"user_{i}", "email": f"user_{i}@example.com", "role": "user",
+            "created_at": "2024-01-01 10:00:00", "courses_enrolled": i % 7,
+            "tutorials_watched": i % 31, "avg_progress": round((i * 7.3) % 100, 2),
+        }
+        for i in range(5000)
+    ]
+    return {
+        "/courses/public": courses,
+        "/tutorials": tutorials,
+        "/courses/<id>/tutorials/<id>": tutorial,
+        "/admin/users": users,
+    }
+
+
+def _measure(fn, data, iterations):
+    start = time.process_time()
+    for _ in range(iterations):
+        out = fn(data)
+    elapsed = time.process_time() - start
+    return len(out), elapsed / iterations * 1000
+
+
+def run(iterations):
+    codecs = {"gzip": lambda d: gzip.compress(d, compresslevel=Config.COMPRESS_GZIP_LEVEL)}
+    if brotli is not None:
+        codecs["br"] = lambda d: brotli.compress(d, quality=Config.COMPRESS_BR_LEVEL)
+
+    results = []
+    for endpoint, payload in build_payloads().items():
+        raw = json.dumps(payload).encode()
+        row = {"endpoint": endpoint, "raw_bytes": len(raw)}
+        for name, fn in codecs.items():
+            size, cpu_ms = _measure(fn, raw, iterations)
+            row[f"{name}_bytes"] = size
+            row[f"{name}_ratio"] = round(size / len(raw), 3)
+            row[f"{name}_cpu_ms"] = round(cpu_ms, 3)
+        results.append(row)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = run(args.iterations)
+    for row in results:
+        print(json.dumps(row))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Serialisation cost of API responses: Flask's default JSON provider versus FastJSONProvider.
+
+Builds payloads shaped like the real DictCursor rows (Decimal averages, datetime columns,
+NumPy similarity scores) for the biggest responses and reports the CPU time per response of
+Flask's stdlib provider, FastJSONProvider without orjson, and FastJSONProvider with orjson
+(when installed), plus the response sizes.
+
+Usage (from backend/api):
+    python -m benchmarks.bench_json [--iterations 200] [--json results.json]
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+import utils.json_provider as json_provider
+
+
+def build_payloads():
+    created = datetime(2024, 1, 1, 10, 0)
+    courses = [
+        {
+            "id": i, "name": f"Course {i}", "difficulty": "Beginner",
+            "description": "Build confidence with everyday digital skills. " * 4,
+            "duration_min_minutes": 30, "duration_max_minutes": 90,
+            "thumbnail_url": f"https://cdn.example.com/thumbs/{i}.png",
+        }
+        for i in range(40)
+    ]
+    quiz = {
+        "id": 1, "tutorial_id": 1, "title": "Staying safe online",
+        "questions": [
+            {
+                "id": q, "question_text": f"Which of these is the safest choice in situation {q}?",
+                "options": [
+                    {"id": q * 10 + o, "option_text": f"Option {o} for question {q}", "is_correct": o == 0}
+                    for o in range(4)
+                ],
+            }
+            for q in range(25)
+        ],
+    }
+    users = [
+        {
+            "id": i, "username": f"user_{i}", "email": f"user_{i}@example.com", "role": "user",
+            "created_at": created + timedelta(minutes=i), "courses_enrolled": i % 7,
+            "tutorials_watched": i % 31, "avg_progress": Decimal(f"{(i * 7.3) % 100:.2f}"),
+            "last_active": created + timedelta(hours=i),
+        }
+        for i in range(5000)
+    ]
+    recommendations = [
+        dict(course, similarity=np.float64(1 / (i + 1)), last_updated=created) for i, course in enumerate(courses)
+    ]
+    return {
+        "/courses/public": courses,
+        "/quizzes/<id>/full": quiz,
+        "/admin/users": users,
+        "/embedding/recommended": recommendations,
+    }
+
+
+def _measure(fn, payload, iterations):
+    start = time.process_time()
+    for _ in range(iterations):
+        out = fn(payload)
+    return len(out), (time.process_time() - start) / iterations * 1000
+
+
+def _stdlib_safe(payload):
+    """
+    Flask's default provider cannot encode NumPy scalars; convert them so it can be measured too.
+    """
+    return json.loads(json.dumps(payload, default=json_provider._default))
+
+
+def run(iterations):
+    app = Flask(__name__)
+    default = DefaultJSONProvider(app)
+    fast = json_provider.FastJSONProvider(app)
+    orjson = json_provider.orjson
+
+    def fast_stdlib(payload):
+        json_provider.orjson = None
+        try:
+            return fast.dumps_bytes(payload)
+        finally:
+            json_provider.orjson = orjson
+
+    results = []
+    for endpoint, payload in build_payloads().items():
+        plain = _stdlib_safe(payload) if endpoint == "/embedding/recommended" else payload
+        size, default_ms = _measure(lambda p: default.dumps(p, separators=(",", ":")).encode(), plain, iterations)
+        row = {"endpoint": endpoint, "bytes": size, "flask_default_ms": round(default_ms, 3)}
+        _, stdlib_ms = _measure(fast_stdlib, payload, iterations)
+        row["fast_stdlib_ms"] = round(stdlib_ms, 3)
+        if orjson is not None:
+            _, orjson_ms = _measure(fast.dumps_bytes, payload, iterations)
+            row["fast_orjson_ms"] = round(orjson_ms, 3)
+            row["speedup"] = round(default_ms / orjson_ms, 1) if orjson_ms else None
+        results.append(row)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = run(args.iterations)
+    for row in results:
+        print(json.dumps(row))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
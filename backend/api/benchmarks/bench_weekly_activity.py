@@ -0,0 +1,155 @@
+"""
+Weekly activity queries: YEARWEEK()/DAYNAME() predicates versus computed range bounds.
+
+Runs the dashboard's former and current "this week" queries for one heavy user against a real
+database and reports median latency and the rows MySQL expects to examine (from EXPLAIN).
+Load a large dataset first (backend/database/generate_synthetic_data.py) and apply the
+migrations, otherwise both variants finish in microseconds.
+
+Usage (from backend/api, with the MYSQL_* variables set):
+    python -m benchmarks.bench_weekly_activity [--user-id 42] [--iterations 50] [--json results.json]
+
+Without --user-id the user with the most quiz attempts is used.
+"""
+import argparse
+import json
+import statistics
+import time
+
+import pymysql
+from flask import Flask
+
+from config import Config
+from utils.activity_utils import user_timezone, week_bounds
+
+LEGACY_QUERIES = {
+    'tutorials_this_week': ("""
+        SELECT COUNT(*) AS tutorials_completed_this_week
+        FROM user_tutorial_progress
+        WHERE user_id = %s
+          AND completed = TRUE
+          AND YEARWEEK(completed_at, 1) = YEARWEEK(CURDATE(), 1)
+    """, lambda user_id, start, end: (user_id,)),
+    'weekly_activity': ("""
+        SELECT DAYNAME(activity_date) AS day_name
+        FROM (
+            SELECT completed_at AS activity_date
+            FROM user_tutorial_progress
+            WHERE user_id = %s AND completed = TRUE
+            UNION ALL
+            SELECT last_updated AS activity_date
+            FROM user_course_progress
+            WHERE user_id = %s AND progress_percentage = 100
+            UNION ALL
+            SELECT attempted_at AS activity_date
+            FROM user_quiz_results
+            WHERE user_id = %s
+        ) AS all_activity
+        WHERE YEARWEEK(activity_date, 1) = YEARWEEK(CURDATE(), 1)
+        GROUP BY DAYNAME(activity_date)
+    """, lambda user_id, start, end: (user_id, user_id, user_id)),
+}
+
+RANGE_QUERIES = {
+    'weekly_activity': ("""
+        SELECT 'tutorial' AS source, completed_at AS activity_at
+        FROM user_tutorial_progress
+        WHERE user_id = %s AND completed = TRUE
+          AND completed_at >= %s AND completed_at < %s
+        UNION ALL
+        SELECT 'course' AS source, last_updated AS activity_at
+        FROM user_course_progress
+        WHERE user_id = %s AND progress_percentage = 100
+          AND last_updated >= %s AND last_updated < %s
+        UNION ALL
+        SELECT 'quiz' AS source, attempted_at AS activity_at
+        FROM user_quiz_results
+        WHERE user_id = %s
+          AND attempted_at >= %s AND attempted_at < %s
+    """, lambda user_id, start, end: (user_id, start, end) * 3),
+}
+
+
+def connect():
+    return pymysql.connect(
+        host=Config.MYSQL_HOST,
+        port=Config.MYSQL_PORT,
+        user=Config.MYSQL_USER,
+        password=Config.MYSQL_PASSWORD,
+        database=Config.MYSQL_DB,
+        cursorclass=pymysql.cursors.DictCursor,
+    )
+
+
+def heaviest_user(cursor):
+    cursor.execute("""
+        SELECT user_id, COUNT(*) AS attempts FROM user_quiz_results
+        GROUP BY user_id ORDER BY attempts DESC LIMIT 1
+    """)
+    row = cursor.fetchone()
+    return row['user_id'] if row else 1
+
+
+def measure(cursor, queries, params, iterations):
+    results = {}
+    for name, (sql, build_params) in queries.items():
+        args = build_params(*params)
+        cursor.execute(f'EXPLAIN {sql}', args)
+        examined = sum(row.get('rows') or 0 for row in cursor.fetchall())
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            cursor.execute(sql, args)
+            cursor.fetchall()
+            timings.append(time.perf_counter() - start)
+        results[name] = {
+            'median_ms': round(statistics.median(timings) * 1000, 3),
+            'p95_ms': round(sorted(timings)[int(len(timings) * 0.95) - 1] * 1000, 3),
+            'rows_examined_estimate': examined,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--user-id', type=int)
+    parser.add_argument('--timezone', default=None, help='IANA timezone for the week (default: DEFAULT_USER_TIMEZONE)')
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    flask_app = Flask(__name__)
+    flask_app.config.from_object(Config)
+
+    connection = connect()
+    try:
+        with flask_app.app_context(), connection.cursor() as cursor:
+            user_id = args.user_id or heaviest_user(cursor)
+            week_start, week_end = week_bounds(user_timezone(args.timezone))
+            params = (user_id, week_start, week_end)
+            results = {
+                'user_id': user_id,
+                'week': [str(week_start), str(week_end)],
+                'legacy': measure(cursor, LEGACY_QUERIES, params, args.iterations),
+                'range': measure(cursor, RANGE_QUERIES, params, args.iterations),
+            }
+    finally:
+        connection.close()
+
+    print(f"user {results['user_id']}, week {results['week'][0]} .. {results['week'][1]}")
+    print(f"{'variant':<8} {'query':<22} {'median ms':>10} {'p95 ms':>10} {'rows (EXPLAIN)':>15}")
+    for variant in ('legacy', 'range'):
+        for name, stats in results[variant].items():
+            print(f"{variant:<8} {name:<22} {stats['median_ms']:>10} {stats['p95_ms']:>10} "
+                  f"{stats['rows_examined_estimate']:>15}")
+    legacy_total = sum(s['median_ms'] for s in results['legacy'].values())
+    range_total = sum(s['median_ms'] for s in results['range'].values())
+    print(f"\nper dashboard load: legacy {legacy_total:.2f} ms vs range {range_total:.2f} ms")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
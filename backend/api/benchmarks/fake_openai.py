@@ -0,0 +1,194 @@
+"""
+Local stand-in for the OpenAI API used by load tests and benchmarks.
+
+Implements the two endpoints the app calls:
+    POST /v1/embeddings  deterministic bag-of-words hashed vectors (similar text -> similar vectors)
+    POST /v1/responses   a streamed (SSE) or plain text reply, split into word deltas
+
+Latency is configurable so upstream slowness can be simulated:
+    --latency-ms      delay before the first byte of every response
+    --token-delay-ms  delay between streamed deltas
+
+Point the app at it with OPENAI_BASE_URL=http://127.0.0.1:<port>/v1 and any OPENAI_API_KEY.
+
+Usage (from backend/api):
+    python -m benchmarks.fake_openai --port 8089 --latency-ms 150 --token-delay-ms 15
+"""
+import argparse
+import base64
+import hashlib
+import json
+import struct
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+EMBEDDING_DIMENSIONS = 1536
+DEFAULT_REPLY = (
+    "Sky Wise has beginner friendly courses such as **Digital Kickstart** and **Everyday Computing**. "
+    "Open the courses page from your dashboard to browse every course, and use the sidebar to log out."
+)
+
+
+def fake_embedding(text, dimensions=EMBEDDING_DIMENSIONS):
+    """
+    Hashes each word of text into a fixed-size unit vector.
+    """
+    vector = [0.0] * dimensions
+    for word in text.lower().split():
+        digest = hashlib.md5(word.encode()).digest()
+        index = int.from_bytes(digest[:4], 'little') % dimensions
+        vector[index] += 1.0 if digest[4] % 2 else -1.0
+    norm = sum(v * v for v in vector) ** 0.5 or 1.0
+    return [v / norm for v in vector]
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    latency = 0.0
+    token_delay = 0.0
+    reply = DEFAULT_REPLY
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        time.sleep(self.latency)
+        if self.path.endswith('/embeddings'):
+            return self._embeddings(self._read_json())
+        if self.path.endswith('/responses'):
+            return self._responses(self._read_json())
+        self._send_json({'error': {'message': f'Unknown path {self.path}'}}, status=404)
+
+    def _embeddings(self, body):
+        inputs = body.get('input', [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        data = []
+        for index, text in enumerate(inputs):
+            vector = fake_embedding(str(text))
+            if body.get('encoding_format') == 'base64':
+                vector = base64.b64encode(struct.pack(f'<{len(vector)}f', *vector)).decode()
+            data.append({'object': 'embedding', 'index': index, 'embedding': vector})
+        tokens = sum(len(str(text).split()) for text in inputs)
+        self._send_json({
+            'object': 'list',
+            'data': data,
+            'model': body.get('model', 'text-embedding-3-small'),
+            'usage': {'prompt_tokens': tokens, 'total_tokens': tokens},
+        })
+
+    def _response_object(self, response_id, message_id, text, status):
+        output = []
+        if text is not None:
+            output = [{
+                'type': 'message', 'id': message_id, 'role': 'assistant', 'status': status,
+                'content': [{'type': 'output_text', 'text': text, 'annotations': []}],
+            }]
+        words = len(self.reply.split())
+        return {
+            'id': response_id, 'object': 'response', 'created_at': int(time.time()),
+            'model': 'gpt-4.1-nano', 'status': status, 'output': output,
+            'parallel_tool_calls': True, 'tool_choice': 'auto', 'tools': [],
+            'usage': {
+                'input_tokens': 1000, 'output_tokens': words, 'total_tokens': 1000 + words,
+                'input_tokens_details': {'cached_tokens': 0},
+                'output_tokens_details': {'reasoning_tokens': 0},
+            },
+        }
+
+    def _responses(self, body):
+        response_id = f'resp_{uuid.uuid4().hex}'
+        message_id = f'msg_{uuid.uuid4().hex}'
+
+        if not body.get('stream'):
+            return self._send_json(self._response_object(response_id, message_id, self.reply, 'completed'))
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        sequence = 0
+
+        def send(event_type, **payload):
+            nonlocal sequence
+            data = json.dumps({'type': event_type, 'sequence_number': sequence, **payload})
+            chunk = f'event: {event_type}\ndata: {data}\n\n'.encode()
+            self.wfile.write(f'{len(chunk):x}\r\n'.encode() + chunk + b'\r\n')
+            self.wfile.flush()
+            sequence += 1
+
+        send('response.created', response=self._response_object(response_id, message_id, None, 'in_progress'))
+        send('response.output_item.added', output_index=0, item={
+            'type': 'message', 'id': message_id, 'role': 'assistant', 'status': 'in_progress', 'content': []})
+        send('response.content_part.added', item_id=message_id, output_index=0, content_index=0,
+             part={'type': 'output_text', 'text': '', 'annotations': []})
+
+        words = self.reply.split(' ')
+        for i, word in enumerate(words):
+            send('response.output_text.delta', item_id=message_id, output_index=0, content_index=0,
+                 delta=word if i == 0 else ' ' + word, logprobs=[])
+            time.sleep(self.token_delay)
+
+        send('response.output_text.done', item_id=message_id, output_index=0, content_index=0,
+             text=self.reply, logprobs=[])
+        send('response.content_part.done', item_id=message_id, output_index=0, content_index=0,
+             part={'type': 'output_text', 'text': self.reply, 'annotations': []})
+        send('response.output_item.done', output_index=0, item={
+            'type': 'message', 'id': message_id, 'role': 'assistant', 'status': 'completed',
+            'content': [{'type': 'output_text', 'text': self.reply, 'annotations': []}]})
+        send('response.completed', response=self._response_object(response_id, message_id, self.reply, 'completed'))
+        self.wfile.write(b'0\r\n\r\n')
+        self.wfile.flush()
+
+
+def start_fake_openai(host='127.0.0.1', port=0, latency_ms=0, token_delay_ms=0, reply=None):
+    """
+    Starts the stub server on a background thread.
+
+    Returns:
+        (server, base_url) - call server.shutdown() to stop it
+    """
+    handler = type('ConfiguredFakeOpenAIHandler', (FakeOpenAIHandler,), {
+        'latency': latency_ms / 1000,
+        'token_delay': token_delay_ms / 1000,
+        'reply': reply or DEFAULT_REPLY,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://{host}:{server.server_address[1]}/v1'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--token-delay-ms', type=float, default=0)
+    args = parser.parse_args()
+
+    server, base_url = start_fake_openai(args.host, args.port, args.latency_ms, args.token_delay_ms)
+    print(f'Fake OpenAI listening on {base_url}')
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
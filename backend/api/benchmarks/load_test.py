@@ -0,0 +1,290 @@
+"""
+End-to-end load test for the SkyWise API.
+
+Drives realistic learner journeys against a running API (or one it boots itself) and reports
+p50/p95/p99 latency and requests/second per endpoint. Results are saved as JSON so runs can be
+compared against a stored baseline.
+
+Journey per virtual user, repeated until --duration elapses:
+    login -> dashboard fan-out -> course page -> tutorial -> quiz submit -> chat message
+
+Typical local run (from the repo root start MySQL first: docker-compose up -d mysql):
+    cd backend/api
+    MYSQL_HOST=127.0.0.1 MYSQL_PORT=3303 MYSQL_USER=team3_user MYSQL_PASSWORD=team3_password \\
+    MYSQL_DB=skywise_db python -m benchmarks.load_test --boot --users 25 --duration 60 \\
+        --openai-latency-ms 200 --openai-token-delay-ms 15 --output benchmarks/results/main.json
+
+    python -m benchmarks.load_test --users 25 --duration 60 --compare benchmarks/results/main.json
+
+--boot starts app.py on --port with OPENAI_BASE_URL pointed at benchmarks.fake_openai, so no
+real OpenAI traffic is generated. Without --boot the API at --base-url is used as-is.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import requests
+
+from benchmarks.fake_openai import start_fake_openai
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Recorder:
+    """
+    Thread-safe collection of (endpoint, latency, ok) samples.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def add(self, endpoint, seconds, ok):
+        with self.lock:
+            self.samples[endpoint].append(seconds)
+            if not ok:
+                self.errors[endpoint] += 1
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarise(recorder, wall_seconds):
+    endpoints = {}
+    for endpoint, values in sorted(recorder.samples.items()):
+        ordered = sorted(values)
+        endpoints[endpoint] = {
+            'count': len(ordered),
+            'errors': recorder.errors[endpoint],
+            'rps': round(len(ordered) / wall_seconds, 2),
+            'p50_ms': round(percentile(ordered, 0.50) * 1000, 1),
+            'p95_ms': round(percentile(ordered, 0.95) * 1000, 1),
+            'p99_ms': round(percentile(ordered, 0.99) * 1000, 1),
+        }
+    total = sum(e['count'] for e in endpoints.values())
+    return {
+        'total_requests': total,
+        'total_errors': sum(e['errors'] for e in endpoints.values()),
+        'rps': round(total / wall_seconds, 2),
+        'endpoints': endpoints,
+    }
+
+
+class VirtualUser:
+    def __init__(self, index, base_url, recorder, password, chat):
+        self.email = f'loadtest_{index}@example.com'
+        self.username = f'loadtest_{index}'
+        self.base_url = base_url
+        self.recorder = recorder
+        self.password = password
+        self.chat = chat
+        self.session = requests.Session()
+
+    def call(self, method, path, label=None, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, self.base_url + path, timeout=30, **kwargs)
+            ok = response.status_code < 500
+        except requests.RequestException:
+            response, ok = None, False
+        self.recorder.add(f'{method} {label or path}', time.perf_counter() - start, ok)
+        return response
+
+    def _json(self, response, default):
+        if response is None or response.status_code >= 400:
+            return default
+        try:
+            return response.json()
+        except ValueError:
+            return default
+
+    def login(self):
+        credentials = {'email': self.email, 'password': self.password}
+        response = self.call('POST', '/login', json=credentials)
+        if response is None or response.status_code != 200:
+            response = self.call('POST', '/register', json={**credentials, 'username': self.username})
+        token = self._json(response, {}).get('access_token')
+        self.session.headers['Authorization'] = f'Bearer {token}'
+        return token is not None
+
+    def dashboard(self):
+        for path in ('/dashboard/stats', '/courses/unenrolled-courses', '/embedding/recommended',
+                     '/user_details', '/preferences'):
+            self.call('GET', path)
+        return self._json(self.call('GET', '/courses'), [])
+
+    def course_page(self, courses):
+        if not courses:
+            return None, None
+        course_id = random.choice(courses)['id']
+        self.call('GET', f'/courses/{course_id}', label='/courses/<id>')
+        tutorials = self._json(self.call('GET', f'/courses/{course_id}/tutorials', label='/courses/<id>/tutorials'), [])
+        self.call('GET', f'/courses/{course_id}/next-step', label='/courses/<id>/next-step')
+        if not tutorials:
+            return course_id, None
+        tutorial_id = random.choice(tutorials)['id']
+        self.call('GET', f'/courses/{course_id}/tutorials/{tutorial_id}', label='/courses/<id>/tutorials/<id>')
+        return course_id, tutorial_id
+
+    def quiz(self, tutorial_id):
+        quizzes = self._json(self.call('GET', f'/tutorials/{tutorial_id}/quizzes', label='/tutorials/<id>/quizzes'), [])
+        if not quizzes:
+            return
+        quiz_id = quizzes[0]['id']
+        quiz = self._json(self.call('GET', f'/quizzes/{quiz_id}/full', label='/quizzes/<id>/full'), {})
+        answers = [
+            {'question_id': q['id'], 'selected_option_id': random.choice(q['options'])['id']}
+            for q in quiz.get('questions', []) if q.get('options')
+        ]
+        if answers:
+            self.call('POST', f'/quizzes/{quiz_id}/submit', label='/quizzes/<id>/submit', json={'answers': answers})
+
+    def chat_message(self):
+        import socketio
+
+        done = threading.Event()
+        client = socketio.Client(reconnection=False)
+        client.on('completed', lambda data: done.set(), namespace='/chat')
+
+        start = time.perf_counter()
+        ok = False
+        try:
+            client.connect(self.base_url, namespaces=['/chat'], transports=['websocket', 'polling'], wait_timeout=10)
+            client.send('What courses are there for beginners?', namespace='/chat')
+            ok = done.wait(timeout=60)
+        except Exception:
+            ok = False
+        finally:
+            self.recorder.add('WS chat message', time.perf_counter() - start, ok)
+            try:
+                client.disconnect()
+            except Exception:
+                pass
+
+    def run(self, deadline):
+        while time.time() < deadline:
+            if not self.login():
+                time.sleep(1)
+                continue
+            courses = self.dashboard()
+            _, tutorial_id = self.course_page(courses)
+            if tutorial_id is not None:
+                self.quiz(tutorial_id)
+            if self.chat:
+                self.chat_message()
+
+
+def boot_api(port, openai_base_url, extra_env=None):
+    env = dict(os.environ, PORT=str(port), HOST='127.0.0.1', FLASK_DEBUG='False',
+               OPENAI_BASE_URL=openai_base_url, OPENAI_API_KEY=os.getenv('OPENAI_API_KEY') or 'load-test',
+               **(extra_env or {}))
+    process = subprocess.Popen([sys.executable, 'app.py'], cwd=API_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
+    base_url = f'http://127.0.0.1:{port}'
+    for _ in range(120):
+        try:
+            if requests.get(base_url + '/health', timeout=1).status_code == 200:
+                return process, base_url
+        except requests.RequestException:
+            pass
+        if process.poll() is not None:
+            break
+        time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError('API did not become healthy; check the MySQL settings')
+
+
+def compare(current, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)['summary']['endpoints']
+    print(f"\n{'endpoint':<45} {'p95 base':>9} {'p95 now':>9} {'delta':>8}")
+    for endpoint, stats in current['endpoints'].items():
+        base = baseline.get(endpoint)
+        if not base or not base['p95_ms']:
+            continue
+        delta = (stats['p95_ms'] - base['p95_ms']) / base['p95_ms'] * 100
+        print(f"{endpoint:<45} {base['p95_ms']:>9} {stats['p95_ms']:>9} {delta:>+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://127.0.0.1:5003')
+    parser.add_argument('--boot', action='store_true', help='start app.py with a fake OpenAI backend')
+    parser.add_argument('--port', type=int, default=5099, help='port for --boot')
+    parser.add_argument('--users', type=int, default=20, help='concurrent virtual users')
+    parser.add_argument('--duration', type=float, default=60, help='seconds to run')
+    parser.add_argument('--password', default='loadtest-password')
+    parser.add_argument('--no-chat', action='store_true', help='skip the /chat socket step')
+    parser.add_argument('--openai-latency-ms', type=float, default=150)
+    parser.add_argument('--openai-token-delay-ms', type=float, default=10)
+    parser.add_argument('--output', help='write results JSON here')
+    parser.add_argument('--compare', help='baseline results JSON to compare p95 against')
+    args = parser.parse_args()
+
+    api_process = stub = None
+    base_url = args.base_url.rstrip('/')
+    if args.boot:
+        stub, openai_url = start_fake_openai(latency_ms=args.openai_latency_ms,
+                                             token_delay_ms=args.openai_token_delay_ms)
+        api_process, base_url = boot_api(args.port, openai_url)
+
+    recorder = Recorder()
+    deadline = time.time() + args.duration
+    users = [VirtualUser(i, base_url, recorder, args.password, not args.no_chat) for i in range(args.users)]
+    threads = [threading.Thread(target=user.run, args=(deadline,), daemon=True) for user in users]
+
+    started = time.time()
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        if api_process is not None:
+            api_process.terminate()
+            api_process.wait(timeout=10)
+        if stub is not None:
+            stub.shutdown()
+
+    summary = summarise(recorder, time.time() - started)
+
+    print(f"{'endpoint':<45} {'count':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for endpoint, stats in summary['endpoints'].items():
+        print(f"{endpoint:<45} {stats['count']:>7} {stats['errors']:>5} {stats['rps']:>8} "
+              f"{stats['p50_ms']:>8} {stats['p95_ms']:>8} {stats['p99_ms']:>8}")
+    print(f"\ntotal {summary['total_requests']} requests, {summary['total_errors']} errors, {summary['rps']} rps")
+
+    if args.compare:
+        compare(summary, args.compare)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        result = {
+            'meta': {
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'users': args.users,
+                'duration': args.duration,
+                'chat': not args.no_chat,
+                'openai_latency_ms': args.openai_latency_ms,
+                'openai_token_delay_ms': args.openai_token_delay_ms,
+            },
+            'summary': summary,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,14 +6,113 @@ load_dotenv()
 
 class Config:
     MYSQL_HOST = os.getenv('MYSQL_HOST')
+    MYSQL_PORT = int(os.getenv('MYSQL_PORT', 3306))
     MYSQL_USER = os.getenv('MYSQL_USER')
     MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD')
     MYSQL_DB = os.getenv('MYSQL_DB')
 
+    # Idle connections kept for reuse between requests, and how long one may sit before it is pinged
+    MYSQL_POOL_SIZE = int(os.getenv('MYSQL_POOL_SIZE', 10))
+    MYSQL_POOL_RECYCLE_SECONDS = int(os.getenv('MYSQL_POOL_RECYCLE_SECONDS', 300))
+
+    # Read replicas for @read_only views: comma-separated "host[:port]", same credentials as the primary
+    MYSQL_REPLICA_HOSTS = os.getenv('MYSQL_REPLICA_HOSTS', '')
+    MYSQL_REPLICA_MAX_LAG_SECONDS = int(os.getenv('MYSQL_REPLICA_MAX_LAG_SECONDS', 5))
+    MYSQL_REPLICA_LAG_CHECK_SECONDS = int(os.getenv('MYSQL_REPLICA_LAG_CHECK_SECONDS', 5))
+    # After a user's own write their reads stay on the primary for this long
+    READ_YOUR_WRITES_SECONDS = int(os.getenv('READ_YOUR_WRITES_SECONDS', 10))
+
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'change-me-in-env')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=15)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
 
+    # Admin progress export: rows read per keyset batch and pause between batches
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+    EXPORT_THROTTLE_MS = int(os.getenv('EXPORT_THROTTLE_MS', 50))
+
+    # Response compression (gzip, or brotli when installed and accepted)
+    COMPRESS_ENABLED = os.getenv('COMPRESS_ENABLED', 'True').lower() == 'true'
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', 6))
+    COMPRESS_BR_LEVEL = int(os.getenv('COMPRESS_BR_LEVEL', 4))
+    # Compressed public catalog responses kept per catalog version
+    COMPRESS_CATALOG_CACHE_ENTRIES = int(os.getenv('COMPRESS_CATALOG_CACHE_ENTRIES', 64))
+
+    # Timezone of DATETIME columns, and the week/day timezone for users without a timezone preference
+    DB_TIMEZONE = os.getenv('DB_TIMEZONE', 'UTC')
+    DEFAULT_USER_TIMEZONE = os.getenv('DEFAULT_USER_TIMEZONE', 'Europe/London')
+
+    # Shared OpenAI client: per-call deadline, retries of transient errors (capped to a share of calls
+    # by the retry budget), concurrent calls per process, and pooled keep-alive connections
+    OPENAI_TIMEOUT_SECONDS = float(os.getenv('OPENAI_TIMEOUT_SECONDS', 30))
+    OPENAI_CONNECT_TIMEOUT_SECONDS = float(os.getenv('OPENAI_CONNECT_TIMEOUT_SECONDS', 5))
+    OPENAI_MAX_RETRIES = int(os.getenv('OPENAI_MAX_RETRIES', 2))
+    OPENAI_RETRY_BUDGET_RATIO = float(os.getenv('OPENAI_RETRY_BUDGET_RATIO', 0.2))
+    OPENAI_MAX_CONCURRENCY = int(os.getenv('OPENAI_MAX_CONCURRENCY', 32))
+    OPENAI_MAX_CONNECTIONS = int(os.getenv('OPENAI_MAX_CONNECTIONS', 32))
+
+    # Embedding search: deadline per embeddings call, and the circuit breaker that switches course search
+    # to keyword matching after this many consecutive failures, probing the API again after the reset time
+    EMBEDDING_DEADLINE_SECONDS = float(os.getenv('EMBEDDING_DEADLINE_SECONDS', 5))
+    EMBEDDING_BREAKER_FAILURES = int(os.getenv('EMBEDDING_BREAKER_FAILURES', 5))
+    EMBEDDING_BREAKER_RESET_SECONDS = float(os.getenv('EMBEDDING_BREAKER_RESET_SECONDS', 30))
+    # Concurrent single-text embeddings collected for up to EMBEDDING_BATCH_WAIT_MS (0 = no batching)
+    # and sent as one request of at most EMBEDDING_BATCH_MAX texts
+    EMBEDDING_BATCH_WAIT_MS = float(os.getenv('EMBEDDING_BATCH_WAIT_MS', 5))
+    EMBEDDING_BATCH_MAX = int(os.getenv('EMBEDDING_BATCH_MAX', 32))
+
+    # Course search: answer queries naming one course title from the BM25 index alone, and the
+    # reciprocal rank fusion constant for combining BM25 and embedding rankings
+    SEARCH_LEXICAL_FAST_PATH = os.getenv('SEARCH_LEXICAL_FAST_PATH', 'True').lower() == 'true'
+    SEARCH_RRF_K = int(os.getenv('SEARCH_RRF_K', 60))
+
+    # Tutorial transcript search: characters per chunk, chunks and characters per embeddings request,
+    # and how often a worker checks for a re-indexed chunk table
+    TRANSCRIPT_CHUNK_CHARS = int(os.getenv('TRANSCRIPT_CHUNK_CHARS', 800))
+    TRANSCRIPT_EMBED_BATCH_SIZE = int(os.getenv('TRANSCRIPT_EMBED_BATCH_SIZE', 64))
+    TRANSCRIPT_EMBED_BATCH_CHARS = int(os.getenv('TRANSCRIPT_EMBED_BATCH_CHARS', 24000))
+    TRANSCRIPT_INDEX_REFRESH_SECONDS = int(os.getenv('TRANSCRIPT_INDEX_REFRESH_SECONDS', 60))
+
+    # /chat streaming: emit buffered model text CHAT_FLUSH_MS after it arrives (also during pauses in
+    # the stream) or once CHAT_FLUSH_CHARS characters are buffered (0 ms = per delta)
+    CHAT_FLUSH_MS = int(os.getenv('CHAT_FLUSH_MS', 50))
+    CHAT_FLUSH_CHARS = int(os.getenv('CHAT_FLUSH_CHARS', 64))
+
+    # /chat history: tokens of summary + recent turns sent per call, turns never summarised, summary model
+    CHAT_HISTORY_TOKEN_BUDGET = int(os.getenv('CHAT_HISTORY_TOKEN_BUDGET', 1200))
+    CHAT_KEEP_RECENT_TURNS = int(os.getenv('CHAT_KEEP_RECENT_TURNS', 4))
+    CHAT_SUMMARY_MODEL = os.getenv('CHAT_SUMMARY_MODEL', 'gpt-4.1-nano')
+
+    # /chat semantic answer cache: opening questions at least this similar to a recent one reuse its answer
+    CHAT_CACHE_ENABLED = os.getenv('CHAT_CACHE_ENABLED', 'True').lower() == 'true'
+    CHAT_CACHE_SIMILARITY = float(os.getenv('CHAT_CACHE_SIMILARITY', 0.92))
+    CHAT_CACHE_TTL_SECONDS = int(os.getenv('CHAT_CACHE_TTL_SECONDS', 3600))
+    CHAT_CACHE_MAX_ENTRIES = int(os.getenv('CHAT_CACHE_MAX_ENTRIES', 500))
+
+    # JSON encoder for responses: 'fast' (orjson when installed) or 'default' (Flask's stdlib provider)
+    JSON_PROVIDER = os.getenv('JSON_PROVIDER', 'fast')
+
+    # Per-request query counting; warn when one statement repeats more than this many times
+    DB_INSTRUMENTATION = os.getenv('DB_INSTRUMENTATION', 'True').lower() == 'true'
+    DB_N_PLUS_ONE_THRESHOLD = int(os.getenv('DB_N_PLUS_ONE_THRESHOLD', 5))
+
+    # GET /metrics: off unless enabled; with METRICS_TOKEN set, scrapers must send "Authorization: Bearer <token>"
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'False').lower() == 'true'
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+    # /home: section threads shared by all requests (each may hold a MySQL connection, so keep this
+    # well under the server's max_connections), and how long the response waits for a slow section
+    HOME_MAX_WORKERS = int(os.getenv('HOME_MAX_WORKERS', 16))
+    HOME_SECTION_TIMEOUT_MS = int(os.getenv('HOME_SECTION_TIMEOUT_MS', 1500))
+
+    # POST /batch: sub-requests per batch, and how many connections one batch may use at once
+    BATCH_MAX_REQUESTS = int(os.getenv('BATCH_MAX_REQUESTS', 20))
+    BATCH_MAX_CONCURRENCY = int(os.getenv('BATCH_MAX_CONCURRENCY', 4))
+
+    # Coalesce concurrent identical requests on @single_flight views; waiters give up after this long
+    SINGLE_FLIGHT_ENABLED = os.getenv('SINGLE_FLIGHT_ENABLED', 'True').lower() == 'true'
+    SINGLE_FLIGHT_WAIT_SECONDS = float(os.getenv('SINGLE_FLIGHT_WAIT_SECONDS', 30))
+
 
     # Option 1: Set CORS_ORIGINS as comma-separated list: "http://localhost:83,http://localhost:5173"
     # Option 2: Set FRONTEND_URL for a single origin: "https://your-deployed-frontend.com"
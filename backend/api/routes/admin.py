@@ -1,7 +1,14 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from functools import wraps
 from flask_jwt_extended import jwt_required, get_jwt_identity
 import app
+from utils.streaming_utils import open_streaming_cursor, stream_json_rows, NDJSON_MIMETYPE
+import utils.export_utils as export_utils
+from utils.catalog_utils import bump_catalog_version
+from utils.activity_utils import day_counts, since, user_timezone
+from utils.singleflight import single_flight
+from utils.replica_utils import read_only
+from utils.transcript_search import start_indexing
 
 bp = Blueprint('admin', __name__, url_prefix='/admin')
 
@@ -32,7 +39,9 @@ def admin_required(f):
 # ============================================
 
 @bp.route('/dashboard/stats', methods=['GET'])
+@read_only
 @admin_required
+@single_flight(scope='global')
 def get_admin_dashboard_stats():
     """Get overall platform statistics for admin dashboard"""
     cursor = app.mysql.connection.cursor()
@@ -125,11 +134,15 @@ def get_admin_dashboard_stats():
 # ============================================
 
 @bp.route('/users', methods=['GET'])
+@read_only
 @admin_required
 def get_all_users():
-    """Get all users with their statistics"""
-    cursor = app.mysql.connection.cursor()
- 
+    """
+    Get all users with their statistics.
+    Rows are streamed from a server-side cursor as a JSON array (or NDJSON with ?format=ndjson).
+    """
+    cursor = open_streaming_cursor()
+
     try:
         cursor.execute('''
             SELECT
@@ -146,8 +159,12 @@ def get_all_users():
             GROUP BY u.id, u.username, u.email, u.role, u.created_at
             ORDER BY u.created_at DESC
         ''')
- 
-        users = [{
+    except Exception as e:
+        cursor.close()
+        return jsonify({'error': str(e)}), 500
+
+    def format_user(row):
+        return {
             'id': row['id'],
             'username': row['username'],
             'email': row['email'],
@@ -156,17 +173,13 @@ def get_all_users():
             'courses_enrolled': row['courses_enrolled'] or 0,
             'tutorials_watched': row['tutorials_watched'] or 0,
             'avg_progress': round(row['avg_progress'], 2) if row['avg_progress'] else 0
-        } for row in cursor.fetchall()]
- 
-        return jsonify(users), 200
- 
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-    finally:
-        cursor.close()
+        }
+
+    return stream_json_rows(cursor, format_user), 200
 
 
 @bp.route('/users/<int:user_id>', methods=['GET'])
+@read_only
 @admin_required
 def get_user_details(user_id):
     """Get detailed statistics for a specific user"""
@@ -175,8 +188,11 @@ def get_user_details(user_id):
     try:
         # User basic info
         cursor.execute('''
-            SELECT id, username, email, role, language_preference, created_at
-            FROM users WHERE id = %s
+            SELECT u.id, u.username, u.email, u.role, u.language_preference, u.created_at,
+                   JSON_UNQUOTE(JSON_EXTRACT(up.preferences, '$.timezone')) as timezone
+            FROM users u
+            LEFT JOIN user_preferences up ON up.user_id = u.id
+            WHERE u.id = %s
         ''', (user_id,))
         user = cursor.fetchone()
 
@@ -217,25 +233,26 @@ def get_user_details(user_id):
         result = cursor.fetchone()
         avg_quiz_score = round(result['avg_score'], 2) if result['avg_score'] else 0
 
-        # Weekly activity (from course progress, quizzes, and tutorials)
+        # Weekly activity (from course progress, quizzes, and tutorials) over the last 7 days,
+        # bucketed by day in the user's timezone
+        window_start = since(7)
         cursor.execute('''
-            SELECT DAYNAME(activity_date) as day, COUNT(*) as count
-            FROM (
-                SELECT DATE(last_updated) as activity_date
-                FROM user_course_progress
-                WHERE user_id = %s AND last_updated >= DATE_SUB(NOW(), INTERVAL 7 DAY)
-                UNION ALL
-                SELECT DATE(attempted_at) as activity_date
-                FROM user_quiz_results
-                WHERE user_id = %s AND attempted_at >= DATE_SUB(NOW(), INTERVAL 7 DAY)
-                UNION ALL
-                SELECT DATE(completed_at) as activity_date
-                FROM user_tutorial_progress
-                WHERE user_id = %s AND completed_at >= DATE_SUB(NOW(), INTERVAL 7 DAY)
-            ) AS all_activity
-            GROUP BY DAYNAME(activity_date)
-        ''', (user_id, user_id, user_id))
-        weekly_activity = {row[0]: row[1] for row in cursor.fetchall()}
+            SELECT last_updated as activity_at
+            FROM user_course_progress
+            WHERE user_id = %s AND last_updated >= %s
+            UNION ALL
+            SELECT attempted_at as activity_at
+            FROM user_quiz_results
+            WHERE user_id = %s AND attempted_at >= %s
+            UNION ALL
+            SELECT completed_at as activity_at
+            FROM user_tutorial_progress
+            WHERE user_id = %s AND completed = TRUE AND completed_at >= %s
+        ''', (user_id, window_start) * 3)
+        weekly_activity = dict(day_counts(
+            (row['activity_at'] for row in cursor.fetchall()),
+            user_timezone(user.get('timezone'))
+        ))
 
         # Course progress details
         cursor.execute('''
@@ -282,6 +299,51 @@ def get_user_details(user_id):
         cursor.close()
 
 
+# ============================================
+# PROGRESS EXPORT
+# ============================================
+
+@bp.route('/exports/progress', methods=['GET'])
+@read_only
+@admin_required
+def export_progress():
+    """
+    Stream every course progress row, quiz attempt and tutorial completion as CSV or NDJSON.
+
+    Query parameters:
+        format: "csv" (default) or "ndjson"
+        from:   ISO date/datetime, only include records on or after it
+        to:     ISO date/datetime, only include records before it
+        after:  resumption token "<record_type>:<id>" taken from the last row received
+    """
+    export_format = request.args.get('format', 'csv').lower()
+    if export_format not in ('csv', 'ndjson'):
+        return jsonify({'error': 'format must be "csv" or "ndjson"'}), 400
+
+    try:
+        date_from = export_utils.parse_date_bound(request.args.get('from'))
+        date_to = export_utils.parse_date_bound(request.args.get('to'))
+    except ValueError:
+        return jsonify({'error': 'from and to must be ISO dates'}), 400
+
+    resume_token = request.args.get('after')
+    try:
+        export_utils.parse_resume_token(resume_token)
+    except ValueError:
+        return jsonify({'error': 'Invalid resume token'}), 400
+
+    records = export_utils.iter_progress_records(date_from, date_to, resume_token)
+
+    if export_format == 'csv':
+        body, mimetype = export_utils.iter_csv(records), 'text/csv'
+    else:
+        body, mimetype = export_utils.iter_ndjson(records), NDJSON_MIMETYPE
+
+    response = Response(stream_with_context(body), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=progress_export.{export_format}'
+    return response, 200
+
+
 # ============================================
 # COURSE MANAGEMENT (CRUD)
 # ============================================
@@ -325,6 +387,7 @@ def create_course():
             VALUES (%s, %s)
         ''', (user_id, f'Created course: {data.get("name")} (ID: {course_id})'))
         app.mysql.connection.commit()
+        bump_catalog_version()
 
         return jsonify({
             'message': 'Course created successfully',
@@ -380,6 +443,7 @@ def update_course(course_id):
             VALUES (%s, %s)
         ''', (user_id, f'Updated course ID: {course_id}'))
         app.mysql.connection.commit()
+        bump_catalog_version()
 
         return jsonify({'message': 'Course updated successfully'}), 200
 
@@ -423,6 +487,7 @@ def delete_course(course_id):
         ''', (user_id, f'Deleted course: {course_name} (ID: {course_id})'))
 
         app.mysql.connection.commit()
+        bump_catalog_version()
 
         return jsonify({'message': 'Course deleted successfully'}), 200
 
@@ -434,10 +499,14 @@ def delete_course(course_id):
 
 
 @bp.route('/courses', methods=['GET'])
+@read_only
 @admin_required
 def get_all_courses_admin():
-    """Get all courses with additional admin info"""
-    cursor = app.mysql.connection.cursor()
+    """
+    Get all courses with additional admin info.
+    Rows are streamed from a server-side cursor as a JSON array (or NDJSON with ?format=ndjson).
+    """
+    cursor = open_streaming_cursor()
 
     try:
         cursor.execute('''
@@ -460,8 +529,12 @@ def get_all_courses_admin():
             GROUP BY c.id
             ORDER BY c.created_at DESC
         ''')
+    except Exception as e:
+        cursor.close()
+        return jsonify({'error': str(e)}), 500
 
-        courses = [{
+    def format_course(row):
+        return {
             'id': row['id'],
             'name': row['name'],
             'description': row['description'],
@@ -474,11 +547,22 @@ def get_all_courses_admin():
             'created_at': str(row['created_at']),
             'tutorial_count': row['tutorial_count'],
             'enrolled_count': row['enrolled_count']
-        } for row in cursor.fetchall()]
+        }
 
-        return jsonify(courses), 200
+    return stream_json_rows(cursor, format_course), 200
+
+
+# ============================================
+# TRANSCRIPT SEARCH INDEX
+# ============================================
+
+@bp.route('/transcripts/reindex', methods=['POST'])
+@admin_required
+def reindex_transcripts():
+    """
+    Start embedding new and changed tutorial transcripts in the background, e.g. after loading tutorials.
+    Unchanged transcripts are skipped, so this is cheap to repeat.
+    """
+    start_indexing(current_app._get_current_object())
+    return jsonify({'message': 'Transcript indexing started'}), 202
 
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-    finally:
-        cursor.close()
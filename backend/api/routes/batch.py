@@ -0,0 +1,25 @@
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required
+import utils.batch_utils as utils
+
+bp = Blueprint('batch', __name__, url_prefix='')
+
+@bp.route('/batch', methods=['POST'])
+@jwt_required()
+def post_batch():
+    """
+    Runs several GET requests in one HTTP call.
+
+    Request body:
+        { "requests": [ { "id": any (optional), "path": "/courses/1?x=y", "method": "GET" (optional) }, ... ] }
+
+    Response:
+        { "responses": [ { "id", "path", "status": number, "body": json or text, "duration_ms": number }, ... ] }
+    Responses are in request order. Each sub-request is authorised with the caller's token;
+    a failing sub-request only affects its own entry.
+    """
+    items, error = utils.validate_batch(request.get_json(silent=True))
+    if error:
+        return jsonify({'error': error}), 400
+
+    return jsonify({'responses': utils.run_batch(items)}), 200
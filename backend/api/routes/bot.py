@@ -1,25 +1,37 @@
 from socket_wrapper import socketio
-from openai import OpenAI, pydantic_function_tool
+from openai import pydantic_function_tool
 import json
-from flask import jsonify
+from functools import partial
+from flask import current_app, jsonify, request
 import pydantic
 from utils.courses_routes_utils import get_public_courses
 from flask_jwt_extended import jwt_required
+from utils.chat_utils import DeltaBuffer, describe_courses, tool_call_course_ids
+from utils.chat_memory import ConversationMemory, record_usage
+from utils.answer_cache import AnswerCache
+from utils.catalog_utils import get_catalog_version
+from utils.embedding_utils import get_embedding
+from utils import openai_client
 
-client = None
 courses = None
 system_prompt = ""
-conversation = []
 tools = []
+# Public course details by id, for the catalog version in catalog_loaded_version
+catalog = {}
+catalog_loaded_version = None
+# ConversationMemory per connected /chat session id
+memories = {}
 
+SUMMARY_PROMPT = """Summarise this conversation between a Sky Wise learner and the assistant Ano in a few sentences.
+Keep the learner's goals, courses and questions mentioned, and anything Ano promised or recommended.
+Merge it with the existing summary if there is one."""
 
 
-def init():
-    global client, courses, system_prompt, conversation, tools
 
-    client = OpenAI()
+def init():
+    global courses, system_prompt, tools
 
-    courses = json.dumps(get_public_courses())
+    courses = json.dumps(list(get_catalog().values()))
 
 
     system_prompt = f"""
@@ -47,7 +59,7 @@ def init():
 
     {courses}
 
-    Whenever you talk about a specific course, make sure you make the tool call to show the course. Do not tell them how to navigate to it. Just use the tool.
+    Whenever you talk about a specific course, briefly explain it in your reply and, in the same response, make the tool call with the course's id to show it. Do not tell them how to navigate to it.
     However, when you're talking about multiple courses you DO NOT have to use the tool call and may send back markdown.
 
     If the user asks what ANO stands for, jokingly say "Awesomely Nice Overlord"
@@ -58,59 +70,139 @@ def init():
     
     tools = [pydantic_function_tool(courseInput)]
 
-    conversation = [{
-        "role" : "system", "content" : system_prompt,
-    }]
-
 class courseInput(pydantic.BaseModel):
-    courseJson: str
+    """Shows a course card in the chat."""
+    course_id: int = pydantic.Field(description="The id of the course, from the list of available courses")
 
-def sendCourseDetails(course: dict) -> dict:
-    socketio.emit("renderCoursesInChat", {"data": course}, namespace='/chat')
+def get_catalog():
+    """
+    Public course details by id, reloaded when the catalog version moves on.
+    """
+    global catalog, catalog_loaded_version
+    version = get_catalog_version()
+    if version != catalog_loaded_version:
+        catalog = {course["id"]: course for course in get_public_courses()}
+        catalog_loaded_version = version
+    return catalog
 
-def trim_conversation(conversation, max_length=10):
-    system_prompts = [{"role": "system", "content": m["content"]} for m in conversation if m["role"] == "system"]
+def sendCourseDetails(course: dict, sid=None) -> dict:
+    socketio.emit("renderCoursesInChat", {"data": course}, namespace='/chat', to=sid)
 
-    if len(conversation) > max_length:
-        bridged_conversation = system_prompts + conversation[-max_length:]
-        return bridged_conversation
-    return conversation
+def summarize_turns(previous_summary, messages, model="gpt-4.1-nano"):
+    """
+    Folds older chat turns into the running summary. Runs on a background task, off the reply path.
+    """
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+    if previous_summary:
+        transcript = f"Existing summary: {previous_summary}\n\n{transcript}"
+    response = openai_client.call('chat_summary', lambda client: client.responses.create(
+        model=model,
+        input=[{"role": "system", "content": SUMMARY_PROMPT}, {"role": "user", "content": transcript}],
+    ))
+    record_usage(response)
+    return response.output_text
+
+def get_memory(sid):
+    """
+    Returns the session's ConversationMemory, creating it on the first message.
+    """
+    if sid not in memories:
+        memories[sid] = ConversationMemory(
+            system_prompt,
+            partial(summarize_turns, model=current_app.config.get('CHAT_SUMMARY_MODEL', 'gpt-4.1-nano')),
+            socketio.start_background_task,
+            token_budget=current_app.config.get('CHAT_HISTORY_TOKEN_BUDGET', 1200),
+            keep_recent=current_app.config.get('CHAT_KEEP_RECENT_TURNS', 4),
+        )
+    return memories[sid]
+
+def get_answer_cache():
+    return current_app.extensions.setdefault('chat_answer_cache', AnswerCache(
+        threshold=current_app.config.get('CHAT_CACHE_SIMILARITY', 0.92),
+        ttl_seconds=current_app.config.get('CHAT_CACHE_TTL_SECONDS', 3600),
+        max_entries=current_app.config.get('CHAT_CACHE_MAX_ENTRIES', 500),
+    ))
+
+def embed_question(message):
+    """
+    Embedding of a chat question for the answer cache, or None when caching is off or embedding fails.
+    """
+    if not current_app.config.get('CHAT_CACHE_ENABLED', True):
+        return None
+    try:
+        return get_embedding(message)
+    except Exception as e:
+        current_app.logger.warning(f"Error embedding chat question, skipping the answer cache: {e}")
+        return None
+
+def replay_answer(answer, sid=None):
+    """
+    Sends a cached answer to the chat session the same way a streamed one arrives.
+    """
+    socketio.emit('response', {'data': answer['text']}, namespace='/chat', to=sid)
+    socketio.emit('completed', {'data': '[DONE]'}, namespace='/chat', to=sid)
+    if answer.get('course'):
+        sendCourseDetails(answer['course'], sid)
 
-def call_model(conversation):
-    
+def schedule_flush(delay, flush):
+    """
+    Runs flush() after delay seconds on a background task, for DeltaBuffer's time-based flush.
+    """
+    def run():
+        socketio.sleep(delay)
+        flush()
+    socketio.start_background_task(run)
+
+def call_model(conversation, sid=None):
+    """
+    Streams a model response to the chat session sid, coalescing text deltas into frames
+    of up to CHAT_FLUSH_CHARS characters or CHAT_FLUSH_MS milliseconds.
+    """
+    buffer = DeltaBuffer(
+        lambda text: socketio.emit('response', {'data': text}, namespace='/chat', to=sid),
+        flush_ms=current_app.config.get('CHAT_FLUSH_MS', 50),
+        flush_chars=current_app.config.get('CHAT_FLUSH_CHARS', 64),
+        schedule=schedule_flush,
+    )
 
     print(conversation)
-    with client.responses.stream(
+    with openai_client.stream(
+        'chat',
         model="gpt-4.1-nano",
         input=conversation,
         tools=tools,
         tool_choice="auto",
     ) as stream: 
         tool_calls = {}
-        for event in stream:
-            if event.type == "response.refusal.delta":
-                print(event.delta, end="")
-            elif event.type == "response.output_text.delta":
-                print(event.delta, end="")
-                socketio.emit('response', {'data': event.delta}, namespace='/chat')
-            elif event.type == "response.error":
-                print(event.error, end="")
-            elif event.type == "response.completed":
-                print("Completed")
-                socketio.emit('completed', {'data': '[DONE]'}, namespace='/chat')
-                
-            elif event.type == "response.output_tool_call.delta":
-                delta = event.delta
-                idx = delta.get("index", 0)
-                if idx not in tool_calls:
-                    tool_calls[idx] = {"name": "", "arguments": ""}
-                if "name" in delta:
-                    tool_calls[idx]["name"] += delta["name"]
-                if "arguments" in delta:
-                    tool_calls[idx]["arguments"] += delta["arguments"]
-
-
-        return stream.get_final_response()
+        try:
+            for event in stream:
+                if event.type == "response.refusal.delta":
+                    print(event.delta, end="")
+                elif event.type == "response.output_text.delta":
+                    buffer.add(event.delta)
+                elif event.type == "response.error":
+                    print(event.error, end="")
+                elif event.type == "response.completed":
+                    print("Completed")
+                    buffer.flush()
+                    socketio.emit('completed', {'data': '[DONE]'}, namespace='/chat', to=sid)
+                    
+                elif event.type == "response.output_tool_call.delta":
+                    delta = event.delta
+                    idx = delta.get("index", 0)
+                    if idx not in tool_calls:
+                        tool_calls[idx] = {"name": "", "arguments": ""}
+                    if "name" in delta:
+                        tool_calls[idx]["name"] += delta["name"]
+                    if "arguments" in delta:
+                        tool_calls[idx]["arguments"] += delta["arguments"]
+        finally:
+            buffer.flush()
+
+
+        final_response = stream.get_final_response()
+        record_usage(final_response)
+        return final_response
 
 
 @socketio.on('connect' , namespace='/chat')
@@ -121,44 +213,53 @@ def handle_connect():
 @socketio.on('disconnect', namespace='/chat')
 def handle_disconnect():
     print('Client disconnected from /chat namespace')
+    memories.pop(request.sid, None)
 
 @socketio.on('message', namespace='/chat')
 def handle_message(message):
-    global conversation
-    conversation = trim_conversation(conversation, max_length=10)
-    conversation.append({"role": "user", "content": message})
+    sid = request.sid
+    memory = get_memory(sid)
+    # Only opening questions are cached: a follow-up's answer depends on the conversation before it
+    question_embedding = embed_question(message) if not memory.turns and not memory.summary else None
+    catalog_version = get_catalog_version()
+    memory.add("user", message)
     print('Received message:', message)
 
-    final_response = call_model(conversation)
-
-    output = final_response.output 
-    if hasattr(output[0], "parsed_arguments"):
-        if output[0].name == "courseInput":
-            courseJson = json.loads(output[0].arguments, strict=False)["courseJson"]
-
-            explain_prompt = {
-                    "role": "user",
-                    "content": f"Now briefly explain this course: {json.dumps(courseJson)} DO NOT MAKE A TOOL CALL"
-                    }
-
-            conversation.append(explain_prompt)
-            explanation_res = call_model(conversation)
-
-            ex_text = explanation_res.output_text
-            print(explanation_res.output)
-            print(ex_text)
-            conversation.append({"role": "assistant", "content": ex_text})
-            print(courseJson)
-            sendCourseDetails(json.loads(courseJson, strict=False))
-
-
-            # courseName = courseJson["name"]
-
-            # conversation.append({"role": "assistant", "content": f"tool call executed {courseName}"})
-
-
-    else:
-        conversation.append({"role": "assistant", "content": final_response.output_text})
+    if question_embedding is not None:
+        cached = get_answer_cache().lookup(question_embedding, catalog_version)
+        if cached is not None:
+            replay_answer(cached, sid)
+            memory.add("assistant", cached['text'])
+            return
+
+    final_response = call_model(memory.messages(), sid)
+
+    text = final_response.output_text
+    available = get_catalog()
+    course_ids = tool_call_course_ids(final_response.output)
+    shown = [available[course_id] for course_id in course_ids if course_id in available]
+    if len(shown) < len(course_ids):
+        current_app.logger.warning(f"Model asked to show unknown courses: {course_ids}")
+
+    if shown and not text:
+        # The model only made the tool call; explain from the catalog rather than calling it again
+        text = describe_courses(shown)
+        socketio.emit('response', {'data': text}, namespace='/chat', to=sid)
+        socketio.emit('completed', {'data': '[DONE]'}, namespace='/chat', to=sid)
+
+    course = None
+    if shown:
+        course = shown[0] if len(shown) == 1 else shown
+        sendCourseDetails(course, sid)
+
+    memory.add("assistant", text)
+    answer = {"text": text, "course": course}
+
+    if question_embedding is not None and answer["text"]:
+        get_answer_cache().store(question_embedding, catalog_version, answer)
+
+    # The reply has been streamed; fold older turns into the summary in the background
+    memory.compact()
 
 
 
@@ -1,6 +1,9 @@
 from flask import Blueprint, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 import utils.courses_routes_utils as utils
+from utils.compression_utils import precompressed_catalog
+from utils.singleflight import single_flight
+from utils.replica_utils import read_only
 
 bp = Blueprint('courses', __name__, url_prefix='/courses')
 
@@ -70,6 +73,8 @@ def calculate_course_progress(cursor, course_id, user_id):
     return round(progress, 2)
 
 @bp.route('/public', methods=['GET'])
+@precompressed_catalog()
+@single_flight(scope='global')
 def get_public_courses():
     return jsonify(utils.get_public_courses()), 200
 
@@ -77,7 +82,8 @@ def get_public_courses():
 @bp.route('', methods=['GET'])
 @jwt_required()
 def get_courses():
-    return utils.get_courses()
+    data, code = utils.get_courses(get_jwt_identity())
+    return jsonify(data), code
 
 @bp.route('/unenrolled-courses', methods=['GET'])
 @jwt_required()
@@ -92,6 +98,7 @@ def get_course(course_id):
     return  utils.get_course(course_id)
 
 @bp.route('/<int:course_id>/tutorials', methods=['GET'])
+@read_only
 @jwt_required()
 def get_course_tutorials(course_id):
     return utils.get_course_tutorials(course_id)
@@ -101,6 +108,12 @@ def get_course_tutorials(course_id):
 def get_tutorial(course_id, tutorial_id):
    return utils.get_tutorial(course_id, tutorial_id)
 
+@bp.route('/<int:course_id>/tutorials/<int:tutorial_id>/transcript', methods=['GET'])
+@read_only
+@jwt_required()
+def get_tutorial_transcript(course_id, tutorial_id):
+    return utils.get_tutorial_transcript(course_id, tutorial_id)
+
 @bp.route('/<int:course_id>/progress', methods=['POST'])
 @jwt_required()
 def update_course_progress(course_id):
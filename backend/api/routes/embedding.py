@@ -1,11 +1,13 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 import utils.embedding_utils as utils
+from utils.singleflight import single_flight
 
 bp = Blueprint('embedding', __name__, url_prefix='/embedding')
 
 @bp.route('course', methods=['POST'])
 @jwt_required()
+@single_flight()
 def handle_embed_request():
     user_id = get_jwt_identity()
     req = request.get_json()
@@ -0,0 +1,37 @@
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+import utils.home_utils as utils
+from utils.db_metrics import add_server_timing
+from utils.replica_utils import read_only
+
+bp = Blueprint('home', __name__, url_prefix='')
+
+@bp.route('/home', methods=['GET'])
+@read_only
+@jwt_required()
+def get_home():
+    """
+    Everything the dashboard page shows, composed server-side in one response.
+
+    Query params:
+        sections: comma-separated subset of user, preferences, stats, courses,
+                  unenrolled_courses, recommended (default: all)
+
+    Response:
+        {
+            "user": {...}, "preferences": {...}, "stats": {...},
+            "courses": [...], "unenrolled_courses": [...], "recommended": [...],
+            "sections": { "<name>": { "status": "ok" | "error" | "timeout", "duration_ms": number } }
+        }
+    A section that failed or timed out is null; the others are still returned.
+    """
+    sections, unknown = utils.parse_sections(request.args.get('sections'))
+    if unknown:
+        return jsonify({'error': f"Unknown sections: {', '.join(unknown)}",
+                        'sections': list(utils.SECTIONS)}), 400
+
+    data, code = utils.compose_home(int(get_jwt_identity()), sections)
+    response = jsonify(data)
+    for name, status in data['sections'].items():
+        add_server_timing(response, f"{name};dur={status['duration_ms']:.1f};desc=\"{status['status']}\"")
+    return response, code
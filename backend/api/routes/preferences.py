@@ -3,6 +3,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 import json
 
 import app
+from utils.users_utils import get_user_preferences
 
 bp = Blueprint('preferences', __name__, url_prefix='')
 
@@ -15,28 +16,8 @@ def get_preferences():
     Returns:
         { "preferences": { ... } } or empty dict if no preferences set
     """
-    user_id = int(get_jwt_identity())
-    cursor = app.mysql.connection.cursor()
-    
-    try:
-        cursor.execute(
-            "SELECT preferences FROM user_preferences WHERE user_id = %s",
-            (user_id,)
-        )
-        result = cursor.fetchone()
-        cursor.close()
-        
-        if result:
-            # Parse JSON preferences
-            preferences = json.loads(result['preferences']) if isinstance(result['preferences'], str) else result['preferences']
-            return jsonify({"preferences": preferences}), 200
-        else:
-            # Return default preferences if none set
-            return jsonify({"preferences": {}}), 200
-            
-    except Exception as e:
-        cursor.close()
-        return jsonify({'error': str(e)}), 500
+    data, code = get_user_preferences(int(get_jwt_identity()))
+    return jsonify(data), code
 
 
 @bp.route('/preferences', methods=['POST'])
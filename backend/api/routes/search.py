@@ -0,0 +1,39 @@
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required
+import utils.transcript_search as utils
+from utils.replica_utils import read_only
+
+bp = Blueprint('search', __name__, url_prefix='/search')
+
+SEARCH_MAX_RESULTS = 20
+
+@bp.route('/tutorials', methods=['GET'])
+@read_only
+@jwt_required()
+def search_tutorials():
+    """
+    Semantic search over tutorial transcripts.
+
+    Query params:
+        q: search text (required)
+        k: number of tutorials to return (default 5, at most 20)
+
+    Response: best matching tutorials first, each with the transcript chunk that matched
+        [
+            {
+                "tutorial_id": number, "course_id": number | null, "title": string, "score": number,
+                "start_offset": number, "start_seconds": number | null, "snippet": string
+            }
+        ]
+    start_offset can be passed as ?offset= to the tutorial transcript endpoint, and start_seconds
+    is where that passage starts in the video.
+    """
+    query = (request.args.get('q') or '').strip()
+    if not query:
+        return jsonify({'error': 'q is required'}), 400
+    k = request.args.get('k', 5, type=int)
+    if k <= 0:
+        return jsonify({'error': 'k must be > 0'}), 400
+
+    data, code = utils.search_tutorials(query, min(k, SEARCH_MAX_RESULTS))
+    return jsonify(data), code
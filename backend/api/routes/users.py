@@ -1,7 +1,7 @@
 from flask import Blueprint, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
-import app
+import utils.users_utils as utils
 
 bp = Blueprint('users', __name__, url_prefix='')
 
@@ -14,11 +14,5 @@ def user_details():
     Response:
         { "id": number, "username": string, "email": string, "role": string }
     """
-    user_id = int(get_jwt_identity())
-    cursor = app.mysql.connection.cursor()
-    cursor.execute("SELECT id, username, email, role FROM users WHERE id = %s", (user_id,))
-    user = cursor.fetchone()
-    cursor.close()
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
-    return jsonify(user), 200
+    data, code = utils.get_user_details(int(get_jwt_identity()))
+    return jsonify(data), code
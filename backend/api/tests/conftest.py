@@ -2,6 +2,18 @@ import pytest
 from app import create_app
 
 
+class FakeClock:
+    """
+    Stand-in for time.monotonic: returns now, which tests move forward by hand.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
 @pytest.fixture()
 def client(mock_mysql):
     flask_app = create_app(testing=True)
@@ -14,3 +26,23 @@ def mock_mysql(mocker):
     mocked_mysql = mocker.patch('app.mysql')
     mocked_mysql.connection.cursor.return_value = mocker.MagicMock()
     return mocked_mysql
+
+
+def pytest_configure(config):
+    config.query_budget_report = []
+
+
+@pytest.fixture()
+def query_budget_report(request):
+    return request.config.query_budget_report
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    report = getattr(config, 'query_budget_report', [])
+    if not report:
+        return
+    terminalreporter.section('query budget')
+    width = max(len(route) for route, _, _ in report)
+    for route, executed, budget in sorted(report):
+        flag = '  OVER BUDGET' if executed > budget else ''
+        terminalreporter.write_line(f'{route:<{width}}  {executed:>3} / {budget:<3}{flag}')
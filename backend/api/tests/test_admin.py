@@ -1,4 +1,6 @@
+import json
 import pytest
+from datetime import datetime
 from flask_jwt_extended import create_access_token
 
 
@@ -160,7 +162,7 @@ def test_get_all_users_success(client, mock_mysql):
     """Test admin can retrieve all users with stats"""
     cursor = mock_mysql.connection.cursor.return_value
     cursor.fetchone.return_value = {'role': 'admin'}
-    cursor.fetchall.return_value = [
+    cursor.fetchmany.side_effect = [[
         {
             'id': 1, 'username': 'alice', 'email': 'alice@example.com', 
             'role': 'user', 'created_at': '2024-01-01', 'courses_enrolled': 3, 
@@ -171,7 +173,7 @@ def test_get_all_users_success(client, mock_mysql):
             'role': 'user', 'created_at': '2024-01-02', 'courses_enrolled': 2, 
             'tutorials_watched': 10, 'avg_progress': 50.0
         }
-    ]
+    ], []]
 
     with client.application.app_context():
         token = create_access_token(identity='1')
@@ -184,6 +186,67 @@ def test_get_all_users_success(client, mock_mysql):
     assert len(users) == 2
     assert users[0]['username'] == 'alice'
     assert users[0]['courses_enrolled'] == 3
+    cursor.close.assert_called()
+
+
+def test_get_all_users_ndjson(client, mock_mysql):
+    """Test user listing can be streamed as newline-delimited JSON"""
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchone.return_value = {'role': 'admin'}
+    cursor.fetchmany.side_effect = [
+        [{
+            'id': 1, 'username': 'alice', 'email': 'alice@example.com',
+            'role': 'user', 'created_at': '2024-01-01', 'courses_enrolled': 3,
+            'tutorials_watched': 15, 'avg_progress': 75.5
+        }],
+        [{
+            'id': 2, 'username': 'bob', 'email': 'bob@example.com',
+            'role': 'user', 'created_at': '2024-01-02', 'courses_enrolled': None,
+            'tutorials_watched': None, 'avg_progress': None
+        }],
+        []
+    ]
+
+    with client.application.app_context():
+        token = create_access_token(identity='1')
+
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.get('/admin/users?format=ndjson', headers=headers)
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    lines = response.get_data(as_text=True).strip().split('\n')
+    assert len(lines) == 2
+    assert json.loads(lines[0])['username'] == 'alice'
+    assert json.loads(lines[1])['courses_enrolled'] == 0
+
+
+def test_get_all_courses_admin_streams_array(client, mock_mysql):
+    """Test admin course listing is streamed as a JSON array"""
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchone.return_value = {'role': 'admin'}
+    cursor.fetchmany.side_effect = [
+        [{
+            'id': 1, 'name': 'Python Basics', 'description': 'Learn Python',
+            'difficulty': 'Beginner', 'summary': None, 'learning_objectives': None,
+            'duration_min_minutes': 30, 'duration_max_minutes': 60, 'thumbnail_url': None,
+            'created_at': '2024-01-01', 'tutorial_count': 4, 'enrolled_count': 12
+        }],
+        []
+    ]
+
+    with client.application.app_context():
+        token = create_access_token(identity='1')
+
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.get('/admin/courses', headers=headers)
+
+    assert response.status_code == 200
+    courses = response.get_json()
+    assert len(courses) == 1
+    assert courses[0]['name'] == 'Python Basics'
+    assert courses[0]['enrolled_count'] == 12
+    cursor.close.assert_called()
 
 
 def test_get_user_details_success(client, mock_mysql):
@@ -219,6 +282,35 @@ def test_get_user_details_success(client, mock_mysql):
     assert data['stats']['avg_quiz_score'] == 85.5
 
 
+def test_get_user_details_weekly_activity_in_user_timezone(client, mock_mysql):
+    """Test weekly activity is read with a range bound and bucketed by day in the user's timezone"""
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchone.side_effect = [
+        {'role': 'admin'},
+        {
+            'id': 1, 'username': 'alice', 'email': 'alice@example.com', 'role': 'user',
+            'language_preference': 'English', 'created_at': '2024-01-01', 'timezone': 'America/New_York'
+        },
+        {'count': 0}, {'count': 0}, {'count': 0}, {'count': 0}, {'avg_score': None}
+    ]
+    cursor.fetchall.side_effect = [
+        # Stored in UTC: Tuesday 02:00 UTC is still Monday evening in New York
+        [{'activity_at': datetime(2024, 1, 2, 2, 0)}, {'activity_at': datetime(2024, 1, 3, 15, 0)}],
+        []
+    ]
+
+    with client.application.app_context():
+        token = create_access_token(identity='1')
+
+    response = client.get('/admin/users/1', headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    assert response.get_json()['weekly_activity'] == {'Monday': 1, 'Wednesday': 1}
+    activity_sql, params = cursor.execute.call_args_list[7].args
+    assert 'DAYNAME' not in activity_sql
+    assert isinstance(params[1], datetime)
+
+
 def test_get_user_details_not_found(client, mock_mysql):
     """Test getting details for non-existent user returns 404"""
     cursor = mock_mysql.connection.cursor.return_value
@@ -234,3 +326,65 @@ def test_get_user_details_not_found(client, mock_mysql):
     response = client.get('/admin/users/999', headers=headers)
 
     assert response.status_code == 404
+
+
+def test_export_progress_csv(client, mock_mysql):
+    """Test admin can stream a CSV export across all progress record types"""
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchone.return_value = {'role': 'admin'}
+    cursor.fetchmany.side_effect = [
+        [{'id': 7, 'user_id': 2, 'username': 'alice', 'email': 'alice@example.com',
+          'course_id': 1, 'progress_percentage': 50.0, 'occurred_at': '2024-01-01'}], [],
+        [{'id': 3, 'user_id': 2, 'username': 'alice', 'email': 'alice@example.com',
+          'tutorial_id': 4, 'quiz_id': 9, 'score': 80.0, 'occurred_at': '2024-01-02'}], [],
+        [],
+    ]
+
+    with client.application.app_context():
+        token = create_access_token(identity='1')
+
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.get('/admin/exports/progress?from=2024-01-01', headers=headers)
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    lines = response.get_data(as_text=True).strip().splitlines()
+    assert lines[0].startswith('record_type,id,user_id')
+    assert lines[1].startswith('course_progress,7,2,alice')
+    assert lines[2].startswith('quiz_attempt,3,2,alice')
+    assert len(lines) == 3
+
+
+def test_export_progress_resumes_from_token(client, mock_mysql):
+    """Test a resume token skips finished sections and continues after the given id"""
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchone.return_value = {'role': 'admin'}
+    cursor.fetchmany.side_effect = [[], []]
+
+    with client.application.app_context():
+        token = create_access_token(identity='1')
+
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.get('/admin/exports/progress?format=ndjson&after=quiz_attempt:42', headers=headers)
+
+    assert response.status_code == 200
+    assert response.get_data(as_text=True) == ''
+    export_queries = [c.args for c in cursor.execute.call_args_list[1:]]
+    assert 'user_quiz_results' in export_queries[0][0]
+    assert export_queries[0][1][0] == 42
+    assert 'user_tutorial_progress' in export_queries[1][0]
+    assert export_queries[1][1][0] == 0
+
+
+def test_export_progress_invalid_params(client, mock_mysql):
+    """Test export rejects unknown formats and malformed tokens"""
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchone.return_value = {'role': 'admin'}
+
+    with client.application.app_context():
+        token = create_access_token(identity='1')
+
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get('/admin/exports/progress?format=xml', headers=headers).status_code == 400
+    assert client.get('/admin/exports/progress?after=users:1', headers=headers).status_code == 400
+    assert client.get('/admin/exports/progress?from=yesterday', headers=headers).status_code == 400
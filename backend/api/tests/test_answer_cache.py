@@ -0,0 +1,65 @@
+from utils.answer_cache import AnswerCache
+from conftest import FakeClock
+
+
+LOG_OUT = [1.0, 0.0, 0.0]
+LOG_OUT_REPHRASED = [0.98, 0.2, 0.0]
+BEGINNER_COURSES = [0.0, 1.0, 0.0]
+
+
+def make_cache(**kwargs):
+    clock = FakeClock()
+    return AnswerCache(clock=clock, **kwargs), clock
+
+
+def test_near_duplicate_question_hits():
+    """
+    Test a question similar above the threshold returns the stored answer and an unrelated one misses.
+    """
+    cache, _ = make_cache(threshold=0.95)
+    answer = {'text': 'Use the log out button in the sidebar.', 'course': None}
+    cache.store(LOG_OUT, 1, answer)
+
+    assert cache.lookup(LOG_OUT_REPHRASED, 1) == answer
+    assert cache.lookup(BEGINNER_COURSES, 1) is None
+
+
+def test_entries_are_scoped_to_the_catalog_version():
+    """
+    Test a new catalog version empties the cache and answers from an older version are not stored.
+    """
+    cache, _ = make_cache()
+    cache.store(LOG_OUT, 1, {'text': 'old'})
+
+    assert cache.lookup(LOG_OUT, 2) is None
+    cache.store(LOG_OUT, 1, {'text': 'stale'})
+    assert len(cache) == 0
+
+
+def test_entries_expire_after_the_ttl():
+    """
+    Test answers older than ttl_seconds are not returned.
+    """
+    cache, clock = make_cache(ttl_seconds=60)
+    cache.store(LOG_OUT, 1, {'text': 'log out'})
+
+    clock.now = 59
+    assert cache.lookup(LOG_OUT, 1) is not None
+    clock.now = 61
+    assert cache.lookup(LOG_OUT, 1) is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    """
+    Test the cache keeps at most max_entries, dropping the one used longest ago.
+    """
+    cache, _ = make_cache(max_entries=2)
+    cache.store(LOG_OUT, 1, {'text': 'log out'})
+    cache.store(BEGINNER_COURSES, 1, {'text': 'beginner courses'})
+    cache.lookup(LOG_OUT, 1)
+    cache.store([0.0, 0.0, 1.0], 1, {'text': 'quizzes'})
+
+    assert len(cache) == 2
+    assert cache.lookup(LOG_OUT, 1) == {'text': 'log out'}
+    assert cache.lookup(BEGINNER_COURSES, 1) is None
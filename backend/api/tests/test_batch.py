@@ -0,0 +1,84 @@
+import pytest
+from flask_jwt_extended import create_access_token
+
+
+@pytest.fixture()
+def auth_headers(client):
+    with client.application.app_context():
+        token = create_access_token(identity="42")
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_batch_dispatches_get_requests_in_order(client, mock_mysql, auth_headers):
+    """
+    Test sub-requests run through their normal routes and come back in request order.
+    """
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchone.return_value = {'id': 42, 'username': 'testuser', 'email': 'testuser@example.com',
+                                    'preferences': '{"theme": "dark"}'}
+
+    response = client.post('/batch', headers=auth_headers, json={'requests': [
+        {'id': 'me', 'path': '/user_details'},
+        {'id': 'prefs', 'path': '/preferences'},
+        {'path': '/does-not-exist'},
+    ]})
+    body = response.get_json()
+
+    assert response.status_code == 200
+    assert [entry['id'] for entry in body['responses']] == ['me', 'prefs', 2]
+    assert body['responses'][0]['status'] == 200
+    assert body['responses'][0]['body']['username'] == 'testuser'
+    assert body['responses'][1]['body'] == {'preferences': {'theme': 'dark'}}
+    assert body['responses'][2]['status'] == 404
+
+
+def test_batch_forwards_authorization(client, mock_mysql):
+    """
+    Test sub-requests are authorised with the caller's token, so protected routes still need one.
+    """
+    with client.application.app_context():
+        token = create_access_token(identity="42")
+    mock_mysql.connection.cursor.return_value.fetchone.return_value = None
+
+    response = client.post('/batch', headers={"Authorization": f"Bearer {token}"},
+                           json={'requests': [{'path': '/user_details'}]})
+
+    assert response.get_json()['responses'][0]['status'] == 404
+    mock_mysql.connection.cursor.return_value.execute.assert_called_once_with(
+        "SELECT id, username, email, role FROM users WHERE id = %s", (42,))
+
+
+def test_batch_rejects_unsafe_and_nested_requests(client, auth_headers):
+    """
+    Test only GET sub-requests are dispatched, which also keeps batches from containing batches.
+    """
+    response = client.post('/batch', headers=auth_headers, json={'requests': [
+        {'path': '/preferences/reset', 'method': 'POST'},
+        {'path': '/batch'},
+    ]})
+    statuses = [entry['status'] for entry in response.get_json()['responses']]
+
+    assert response.status_code == 200
+    assert statuses == [405, 405]
+
+
+def test_batch_validates_body(client, auth_headers):
+    """
+    Test malformed and oversized batches are rejected.
+    """
+    assert client.post('/batch', headers=auth_headers, json={}).status_code == 400
+    assert client.post('/batch', headers=auth_headers, json={'requests': [{'path': 'courses'}]}).status_code == 400
+
+    client.application.config['BATCH_MAX_REQUESTS'] = 2
+    response = client.post('/batch', headers=auth_headers, json={'requests': [{'path': '/courses'}] * 3})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'At most 2 requests per batch'
+
+
+def test_batch_missing_token(client):
+    """
+    Test /batch requires authentication.
+    """
+    response = client.post('/batch', json={'requests': [{'path': '/courses'}]})
+
+    assert response.status_code == 401
@@ -0,0 +1,106 @@
+from types import SimpleNamespace
+from utils.chat_memory import ConversationMemory, estimate_tokens, record_usage
+
+
+def turn(role, words):
+    return role, ' '.join(['word'] * words)
+
+
+def make_memory(summarize=None, spawn=None, token_budget=100, keep_recent=2):
+    calls = []
+
+    def default_summarize(previous, messages):
+        calls.append((previous, messages))
+        return f'summary of {len(messages)} turns'
+
+    memory = ConversationMemory('You are Ano.', summarize or default_summarize,
+                                spawn or (lambda fn: fn()), token_budget=token_budget, keep_recent=keep_recent)
+    return memory, calls
+
+
+def test_messages_stay_within_the_token_budget():
+    """
+    Test only the most recent turns that fit the budget are sent, after the system prompt.
+    """
+    memory, _ = make_memory(token_budget=100)
+    for i in range(10):
+        memory.add(*turn('user' if i % 2 == 0 else 'assistant', 40))
+
+    messages = memory.messages()
+
+    assert messages[0] == {'role': 'system', 'content': 'You are Ano.'}
+    assert sum(estimate_tokens(m) for m in messages[1:]) <= 100
+    assert messages[-1] == memory.turns[-1]
+
+
+def test_latest_turn_is_always_sent():
+    """
+    Test a single turn larger than the budget is still sent.
+    """
+    memory, _ = make_memory(token_budget=10)
+    memory.add(*turn('user', 200))
+
+    assert memory.messages()[-1] == memory.turns[-1]
+
+
+def test_compact_folds_older_turns_into_the_summary():
+    """
+    Test an over-budget history folds its oldest turns into the summary and keeps the recent ones.
+    """
+    memory, calls = make_memory(token_budget=150, keep_recent=2)
+    for i in range(6):
+        memory.add(*turn('user' if i % 2 == 0 else 'assistant', 20))
+    recent = memory.turns[-2:]
+
+    assert memory.compact()
+
+    previous, folded = calls[0]
+    assert previous == ''
+    assert memory.summary == f'summary of {len(folded)} turns'
+    assert memory.turns[-2:] == recent
+    assert sum(estimate_tokens(t) for t in memory.turns) <= 75
+    assert memory.messages()[1] == {'role': 'system', 'content': f'Summary of the conversation so far: {memory.summary}'}
+
+
+def test_compact_does_nothing_within_budget():
+    """
+    Test a short history is left as it is.
+    """
+    memory, calls = make_memory(token_budget=1000)
+    memory.add(*turn('user', 10))
+    memory.add(*turn('assistant', 10))
+
+    assert not memory.compact()
+    assert calls == []
+
+
+def test_one_background_summary_at_a_time_and_failures_keep_turns():
+    """
+    Test compact() does not start a second summary while one is running, and a failed summary loses nothing.
+    """
+    pending = []
+    memory, _ = make_memory(spawn=pending.append, token_budget=50, keep_recent=1)
+    for _ in range(4):
+        memory.add(*turn('user', 40))
+
+    assert memory.compact()
+    assert not memory.compact()
+    assert len(pending) == 1
+
+    memory.summarize = lambda previous, messages: (_ for _ in ()).throw(RuntimeError('rate limited'))
+    memory.add(*turn('assistant', 40))
+    pending[0]()
+
+    assert len(memory.turns) == 5
+    assert memory.summary == ''
+    assert memory.compact()
+
+
+def test_record_usage():
+    """
+    Test prompt and output tokens are read from the API response usage.
+    """
+    response = SimpleNamespace(usage=SimpleNamespace(input_tokens=812, output_tokens=95))
+
+    assert record_usage(response) == (812, 95)
+    assert record_usage(SimpleNamespace()) == (None, None)
@@ -0,0 +1,116 @@
+from types import SimpleNamespace
+from utils.chat_utils import DeltaBuffer, describe_courses, tool_call_course_ids
+from conftest import FakeClock
+
+
+def make_buffer(flush_ms=50, flush_chars=64):
+    frames = []
+    clock = FakeClock()
+    return DeltaBuffer(frames.append, flush_ms=flush_ms, flush_chars=flush_chars, clock=clock), frames, clock
+
+
+def test_deltas_are_coalesced_until_the_character_limit():
+    """
+    Test deltas are joined in order and emitted once flush_chars characters are buffered.
+    """
+    buffer, frames, _ = make_buffer(flush_chars=10)
+
+    for delta in ['Sky', ' Wise', ' has', ' courses']:
+        buffer.add(delta)
+
+    assert frames == ['Sky Wise has']
+    buffer.flush()
+    assert frames == ['Sky Wise has', ' courses']
+
+
+def test_deltas_are_flushed_after_flush_ms():
+    """
+    Test buffered text is emitted with the first delta arriving flush_ms after the oldest one.
+    """
+    buffer, frames, clock = make_buffer(flush_ms=50)
+
+    buffer.add('Hello')
+    clock.now = 0.03
+    buffer.add(' there')
+    assert frames == []
+
+    clock.now = 0.05
+    buffer.add('!')
+    assert frames == ['Hello there!']
+
+
+def test_buffered_text_is_flushed_by_the_schedule_during_a_pause():
+    """
+    Test the scheduled flush sends text still buffered flush_ms later, and does nothing once it was sent.
+    """
+    scheduled = []
+    frames = []
+    buffer = DeltaBuffer(frames.append, flush_ms=50, flush_chars=64, clock=FakeClock(),
+                         schedule=lambda delay, fn: scheduled.append((delay, fn)))
+
+    buffer.add('Hello')
+    buffer.add(' there')
+    assert [delay for delay, _ in scheduled] == [0.05]
+
+    scheduled[0][1]()
+    assert frames == ['Hello there']
+
+    buffer.add('!')
+    buffer.flush()
+    scheduled[1][1]()
+    assert frames == ['Hello there', '!']
+
+
+def test_flush_on_completion_and_no_empty_frames():
+    """
+    Test flush() sends what is left and never emits an empty frame.
+    """
+    buffer, frames, _ = make_buffer()
+
+    buffer.flush()
+    buffer.add('')
+    buffer.add('Done')
+    buffer.flush()
+    buffer.flush()
+
+    assert frames == ['Done']
+
+
+def test_zero_flush_ms_emits_every_delta():
+    """
+    Test CHAT_FLUSH_MS=0 keeps the one-frame-per-delta behaviour.
+    """
+    buffer, frames, _ = make_buffer(flush_ms=0)
+
+    for delta in ['a', 'b', 'c']:
+        buffer.add(delta)
+
+    assert frames == ['a', 'b', 'c']
+
+
+def test_tool_call_course_ids_reads_course_ids_in_order():
+    """
+    Test course ids come from courseInput calls only, and malformed arguments are skipped.
+    """
+    output = [
+        SimpleNamespace(type='message', content=[]),
+        SimpleNamespace(type='function_call', name='courseInput', arguments='{"course_id": 3}'),
+        SimpleNamespace(type='function_call', name='otherTool', arguments='{"course_id": 4}'),
+        SimpleNamespace(type='function_call', name='courseInput', arguments='{"courseJson": "{}"}'),
+        SimpleNamespace(type='function_call', name='courseInput', arguments='{"course_id": "7"}'),
+    ]
+
+    assert tool_call_course_ids(output) == [3, 7]
+
+
+def test_describe_courses():
+    """
+    Test the fallback explanation names each course with its difficulty and description.
+    """
+    courses = [
+        {'name': 'Cyber Basics', 'difficulty': 'Beginner', 'description': 'Stay safe online.'},
+        {'name': 'Cloud 101', 'difficulty': 'Intermediate', 'description': 'Run services in the cloud.'},
+    ]
+
+    assert describe_courses(courses) == ('**Cyber Basics** (Beginner): Stay safe online.\n\n'
+                                         '**Cloud 101** (Intermediate): Run services in the cloud.')
@@ -0,0 +1,168 @@
+import gzip
+import pytest
+from flask_jwt_extended import create_access_token
+
+
+@pytest.fixture()
+def auth_headers(client):
+    with client.application.app_context():
+        token = create_access_token(identity="456")
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _tutorials(count):
+    return [
+        {
+            'id': i,
+            'title': f'Tutorial {i}',
+            'description': 'Learn how to stay safe online ' * 5,
+            'category': 'security',
+            'video_provider': 'youtube',
+            'video_url': f'https://youtube.com/watch?v={i}',
+            'course_id': 1,
+            'created_at': '2024-01-01 10:00:00'
+        }
+        for i in range(count)
+    ]
+
+
+def test_large_json_is_gzipped_when_accepted(client, mock_mysql, auth_headers):
+    """
+    Test a large JSON payload is gzip encoded when the client accepts gzip.
+    """
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchall.return_value = _tutorials(50)
+
+    response = client.get('/tutorials', headers={**auth_headers, 'Accept-Encoding': 'gzip'})
+
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    body = gzip.decompress(response.get_data())
+    assert b'Tutorial 49' in body
+
+
+def test_brotli_is_preferred_when_accepted(client, mock_mysql, auth_headers):
+    """
+    Test clients accepting br get a brotli body (Brotli is in requirements.txt).
+    """
+    brotli = pytest.importorskip('brotli')
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchall.return_value = _tutorials(50)
+
+    response = client.get('/tutorials', headers={**auth_headers, 'Accept-Encoding': 'gzip, br'})
+
+    assert response.headers['Content-Encoding'] == 'br'
+    assert b'Tutorial 49' in brotli.decompress(response.get_data())
+
+
+def test_small_json_is_not_compressed(client, mock_mysql, auth_headers):
+    """
+    Test payloads under the size threshold are sent as-is.
+    """
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchall.return_value = _tutorials(1)
+
+    response = client.get('/tutorials', headers={**auth_headers, 'Accept-Encoding': 'gzip'})
+
+    assert response.status_code == 200
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_json()[0]['title'] == 'Tutorial 0'
+
+
+def test_no_compression_without_accept_encoding(client, mock_mysql, auth_headers):
+    """
+    Test clients that do not advertise an encoding get an uncompressed body.
+    """
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchall.return_value = _tutorials(50)
+
+    response = client.get('/tutorials', headers=auth_headers)
+
+    assert 'Content-Encoding' not in response.headers
+    assert len(response.get_json()) == 50
+
+
+def test_compressed_transcript_has_its_own_etag(client, mock_mysql, auth_headers):
+    """
+    Test a gzip encoded transcript page gets a different ETag from the identity one, and revalidates with it.
+    """
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchone.return_value = {'total_length': 3000, 'transcript_hash': 'abc123', 'text': 'Welcome ' * 375}
+    url = '/courses/1/tutorials/5/transcript'
+
+    identity = client.get(url, headers=auth_headers)
+    encoded = client.get(url, headers={**auth_headers, 'Accept-Encoding': 'gzip'})
+
+    assert 'Content-Encoding' not in identity.headers
+    assert encoded.headers['Content-Encoding'] == 'gzip'
+    assert identity.headers['ETag'] == '"abc123-0-16000"'
+    assert encoded.headers['ETag'] == '"abc123-0-16000-gzip"'
+
+    cached = client.get(url, headers={**auth_headers, 'Accept-Encoding': 'gzip',
+                                      'If-None-Match': encoded.headers['ETag']})
+    assert cached.status_code == 304
+
+
+def test_public_catalog_served_from_precompressed_cache(client, mock_mysql):
+    """
+    Test the public catalog is compressed once per catalog version and replayed from cache.
+    """
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchall.return_value = [
+        {'id': i, 'name': f'Course {i}', 'description': 'A course ' * 30, 'difficulty': 'Beginner',
+         'duration_min_minutes': 30, 'duration_max_minutes': 60, 'thumbnail_url': None}
+        for i in range(10)
+    ]
+
+    first = client.get('/courses/public', headers={'Accept-Encoding': 'gzip'})
+    second = client.get('/courses/public', headers={'Accept-Encoding': 'gzip'})
+
+    assert cursor.execute.call_count == 1
+    assert second.headers['Content-Encoding'] == 'gzip'
+    assert first.get_data() == second.get_data()
+
+    with client.application.app_context():
+        from utils.catalog_utils import bump_catalog_version
+        bump_catalog_version()
+
+    client.get('/courses/public', headers={'Accept-Encoding': 'gzip'})
+    assert cursor.execute.call_count == 2
+
+
+def test_public_catalog_cache_ignores_unknown_query_params(client, mock_mysql):
+    """
+    Test arbitrary query strings share the cached catalog instead of each adding an entry.
+    """
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchall.return_value = [
+        {'id': 1, 'name': 'Course 1', 'description': 'A course ' * 30, 'difficulty': 'Beginner',
+         'duration_min_minutes': 30, 'duration_max_minutes': 60, 'thumbnail_url': None}
+    ]
+
+    for i in range(5):
+        client.get(f'/courses/public?x={i}', headers={'Accept-Encoding': 'gzip'})
+
+    assert cursor.execute.call_count == 1
+    assert len(client.application.extensions['precompressed_catalog']['entries']) == 1
+
+
+def test_public_catalog_cache_follows_compression_settings(client, mock_mysql):
+    """
+    Test the cached catalog is not encoded when compression is off or the body is under COMPRESS_MIN_SIZE.
+    """
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchall.return_value = [
+        {'id': 1, 'name': 'Course 1', 'description': 'Short', 'difficulty': 'Beginner',
+         'duration_min_minutes': 30, 'duration_max_minutes': 60, 'thumbnail_url': None}
+    ]
+
+    for _ in range(2):
+        small = client.get('/courses/public', headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in small.headers
+        assert small.get_json()[0]['name'] == 'Course 1'
+
+    client.application.config.update(COMPRESS_ENABLED=False, COMPRESS_MIN_SIZE=0)
+    client.application.extensions.pop('precompressed_catalog')
+    disabled = client.get('/courses/public', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in disabled.headers
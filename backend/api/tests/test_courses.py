@@ -1,7 +1,21 @@
+import json
 import pytest
 from flask_jwt_extended import create_access_token
 
 
+def progress_row(course_id, tutorials, quizzes, completed_tutorials, passed_quizzes):
+    """
+    One row of the grouped calculate_courses_progress query.
+    """
+    return {
+        "course_id": course_id,
+        "total_tutorials": tutorials,
+        "total_quizzes": quizzes,
+        "completed_tutorials": completed_tutorials,
+        "passed_quizzes": passed_quizzes,
+    }
+
+
 @pytest.fixture()
 def auth_headers(client):
     with client.application.app_context():
@@ -37,16 +51,8 @@ def test_get_courses_success(client, mock_mysql, auth_headers):
     ]
     
     # Course 1: 2 tutorials, 2 quizzes, 1 completed, 1 submitted -> 50% progress
-    # Course 2: 0 tutorials, 0 quizzes -> 0% progress
-    progress_results = [
-        {"count": 2},
-        {"count": 2},
-        {"count": 1},
-        {"count": 1}, 
-        {"count": 0}, 
-        {"count": 0}, 
-    ]
-    cursor.fetchone.side_effect = progress_results
+    # Course 2: 0 tutorials, 0 quizzes -> no progress row, 0% progress
+    cursor.fetchall.side_effect = [cursor.fetchall.return_value, [progress_row(1, 2, 2, 1, 1)]]
 
     res = client.get("/courses", headers=auth_headers)
     body = res.get_json()
@@ -105,12 +111,8 @@ def test_get_course_success(client, mock_mysql, auth_headers):
             "duration_min_minutes": 45,
             "duration_max_minutes": 60,
         },
-        {"count": 3},
-        {"count": 3}, 
-        {"count": 2},  
-        {"count": 1}, 
     ]
-    cursor.fetchall.side_effect = [[], []] 
+    cursor.fetchall.return_value = [progress_row(1, 3, 3, 2, 1)]
 
     res = client.get("/courses/1", headers=auth_headers)
     body = res.get_json()
@@ -132,7 +134,7 @@ def test_get_course_success(client, mock_mysql, auth_headers):
     assert abs(body["progress"] - 50.0) < 0.01
 
     assert cursor.close.call_count == 1
-    assert cursor.fetchall.call_count == 2
+    assert cursor.fetchall.call_count == 1
 
 
 def test_get_course_not_found(client, mock_mysql, auth_headers):
@@ -158,6 +160,15 @@ def test_get_course_with_prerequisites_and_requirements(client, mock_mysql, auth
     """
     cursor = mock_mysql.connection.cursor.return_value
 
+    mock_prerequisites = [
+        {"id": 10, "name": "Basic Computer Skills"},
+        {"id": 11, "name": "Internet Fundamentals"},
+    ]
+    mock_requirements = [
+        {"requirement_text": "Access to an email account"},
+        {"requirement_text": "Working internet connection"},
+    ]
+    # Prerequisites and requirements arrive as JSON_ARRAYAGG strings on the course row
     cursor.fetchone.side_effect = [
         {
             "id": 1,
@@ -168,21 +179,11 @@ def test_get_course_with_prerequisites_and_requirements(client, mock_mysql, auth
             "learning_objectives": '["Obj 1", "Obj 2"]',
             "duration_min_minutes": 45,
             "duration_max_minutes": 60,
+            "prerequisites": json.dumps(mock_prerequisites),
+            "requirements": json.dumps([item["requirement_text"] for item in mock_requirements]),
         },
-        {"count": 2},  
-        {"count": 2},  
-        {"count": 1},  
-        {"count": 1},  
     ]
-    mock_prerequisites = [
-        {"id": 10, "name": "Basic Computer Skills"},
-        {"id": 11, "name": "Internet Fundamentals"},
-    ]
-    mock_requirements = [
-        {"requirement_text": "Access to an email account"},
-        {"requirement_text": "Working internet connection"},
-    ]
-    cursor.fetchall.side_effect = [mock_prerequisites, mock_requirements]
+    cursor.fetchall.return_value = [progress_row(1, 2, 2, 1, 1)]
 
     res = client.get("/courses/1", headers=auth_headers)
     body = res.get_json()
@@ -196,7 +197,7 @@ def test_get_course_with_prerequisites_and_requirements(client, mock_mysql, auth
     assert isinstance(body["progress"], (int, float))
 
     assert cursor.close.call_count == 1
-    assert cursor.fetchall.call_count == 2
+    assert cursor.fetchall.call_count == 1
 
 
 def test_get_course_learning_objectives_is_null(client, mock_mysql, auth_headers):
@@ -216,10 +217,8 @@ def test_get_course_learning_objectives_is_null(client, mock_mysql, auth_headers
             "duration_min_minutes": 30,
             "duration_max_minutes": 30,
         },
-        {"count": 0},  
-        {"count": 0},  
     ]
-    cursor.fetchall.side_effect = [[], []] 
+    cursor.fetchall.return_value = []
 
     res = client.get("/courses/1", headers=auth_headers)
     body = res.get_json()
@@ -231,7 +230,7 @@ def test_get_course_learning_objectives_is_null(client, mock_mysql, auth_headers
     assert abs(body["progress"] - 0.0) < 0.01
 
     assert cursor.close.call_count == 1
-    assert cursor.fetchall.call_count == 2
+    assert cursor.fetchall.call_count == 1
 
 
 def test_get_course_tutorials_success(client, mock_mysql, auth_headers):
@@ -312,10 +311,8 @@ def test_get_course_progress_zero_when_no_content(client, mock_mysql, auth_heade
             "duration_min_minutes": 0,
             "duration_max_minutes": 0,
         },
-        {"count": 0}, 
-        {"count": 0}, 
     ]
-    cursor.fetchall.side_effect = [[], []] 
+    cursor.fetchall.return_value = []
 
     res = client.get("/courses/1", headers=auth_headers)
     body = res.get_json()
@@ -341,12 +338,8 @@ def test_get_course_progress_complete(client, mock_mysql, auth_headers):
             "duration_min_minutes": 60,
             "duration_max_minutes": 90,
         },
-        {"count": 2},
-        {"count": 2},  
-        {"count": 2}, 
-        {"count": 2},  
     ]
-    cursor.fetchall.side_effect = [[], []] 
+    cursor.fetchall.return_value = [progress_row(1, 2, 2, 2, 2)]
 
     res = client.get("/courses/1", headers=auth_headers)
     body = res.get_json()
@@ -375,12 +368,8 @@ def test_get_course_progress_partial(client, mock_mysql, auth_headers):
             "duration_min_minutes": 45,
             "duration_max_minutes": 60,
         },
-        {"count": 4}, 
-        {"count": 4}, 
-        {"count": 2},  
-        {"count": 1},  
     ]
-    cursor.fetchall.side_effect = [[], []] 
+    cursor.fetchall.return_value = [progress_row(1, 4, 4, 2, 1)]
 
     res = client.get("/courses/1", headers=auth_headers)
     body = res.get_json()
@@ -417,22 +406,10 @@ def test_get_courses_includes_progress(client, mock_mysql, auth_headers):
                 "thumbnail_url": None,
             },
         ],
+        # Course 1: 2 tutorials, 2 quizzes, 1 completed, 1 submitted -> 50%
+        # Course 2: 3 tutorials, 3 quizzes, 2 completed, 2 submitted -> 66.67%
+        [progress_row(1, 2, 2, 1, 1), progress_row(2, 3, 3, 2, 2)],
     ]
-    
-    # Course 1: 2 tutorials, 2 quizzes, 1 completed, 1 submitted -> 50%
-    # Course 2: 3 tutorials, 3 quizzes, 2 completed, 2 submitted -> 66.67%
-    progress_results = [
-        {"count": 2}, 
-        {"count": 2},  
-        {"count": 1}, 
-        {"count": 1},  
-        {"count": 3},  
-        {"count": 3},  
-        {"count": 2},  
-        {"count": 2},  
-    ]
-    
-    cursor.fetchone.side_effect = progress_results
 
     res = client.get("/courses", headers=auth_headers)
     body = res.get_json()
@@ -515,10 +492,10 @@ def test_get_tutorial_details_success(client, mock_mysql, auth_headers):
             'video_url': 'https://youtube.com/watch?v=abc',
             'category': 'security',
             'created_at': '2024-01-01 10:00:00',
-            'video_transcript': 'This is the transcript...'
+            'transcript_length': 25,
+            'has_completed_quiz': 1,
+            'is_completed': 1,
         },
-        {'quiz_completed_count': 1},  
-        {'completed': True},  
     ]
 
     res = client.get("/courses/1/tutorials/5", headers=auth_headers)
@@ -527,6 +504,9 @@ def test_get_tutorial_details_success(client, mock_mysql, auth_headers):
     assert res.status_code == 200
     assert body['id'] == 5
     assert body['title'] == 'Password Security'
+    assert body['transcript_length'] == 25
+    assert 'video_transcript' not in body
+    assert 'video_transcript' not in cursor.execute.call_args_list[0].args[0].split('CHAR_LENGTH')[0]
     assert body['has_completed_quiz'] is True
     assert body['is_completed'] is True
     cursor.close.assert_called_once()
@@ -547,6 +527,64 @@ def test_get_tutorial_details_not_found(client, mock_mysql, auth_headers):
     cursor.close.assert_called_once()
 
 
+def test_get_tutorial_transcript_page(client, mock_mysql, auth_headers):
+    """
+    Test a transcript page ends on a cue boundary and points at the next page.
+    """
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchone.return_value = {
+        'total_length': 200,
+        'transcript_hash': 'abc123',
+        'text': 'WEBVTT\n\n00:00:00.000 --> 00:00:05.000\nWelcome\n\n00:00:05.000 --> 00:0'
+    }
+
+    res = client.get("/courses/1/tutorials/5/transcript?limit=64", headers=auth_headers)
+    body = res.get_json()
+
+    assert res.status_code == 200
+    assert body['text'].endswith('Welcome\n\n')
+    assert body['next_offset'] == len(body['text'])
+    assert body['total_length'] == 200
+    assert cursor.execute.call_args.args[1] == (1, 64, 1, 5)
+    assert res.headers['ETag'] == '"abc123-0-64"'
+
+
+def test_get_tutorial_transcript_last_page_and_etag(client, mock_mysql, auth_headers):
+    """
+    Test the final page has no next offset and a matching ETag returns 304.
+    """
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchone.return_value = {
+        'total_length': 20,
+        'transcript_hash': 'abc123',
+        'text': "Let's get started"
+    }
+
+    res = client.get("/courses/1/tutorials/5/transcript?offset=3", headers=auth_headers)
+    assert res.status_code == 200
+    assert res.get_json()['next_offset'] is None
+
+    cached = client.get(
+        "/courses/1/tutorials/5/transcript?offset=3",
+        headers={**auth_headers, 'If-None-Match': res.headers['ETag']}
+    )
+    assert cached.status_code == 304
+    assert cached.get_data() == b''
+
+
+def test_get_tutorial_transcript_not_found(client, mock_mysql, auth_headers):
+    """
+    Test requesting a transcript for a tutorial outside the course returns 404.
+    """
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchone.return_value = None
+
+    res = client.get("/courses/1/tutorials/999/transcript", headers=auth_headers)
+
+    assert res.status_code == 404
+    assert client.get("/courses/1/tutorials/5/transcript?offset=-1", headers=auth_headers).status_code == 400
+
+
 def test_get_tutorial_details_not_completed(client, mock_mysql, auth_headers):
     """
     Test retrieving tutorial details when user hasn't completed it or the quiz.
@@ -562,10 +600,10 @@ def test_get_tutorial_details_not_completed(client, mock_mysql, auth_headers):
             'video_url': 'https://youtube.com/watch?v=abc',
             'category': 'security',
             'created_at': '2024-01-01 10:00:00',
-            'video_transcript': 'This is the transcript...'
+            'video_transcript': 'This is the transcript...',
+            'has_completed_quiz': 0,
+            'is_completed': None,
         },
-        {'quiz_completed_count': 0},  
-        None, 
     ]
 
     res = client.get("/courses/1/tutorials/5", headers=auth_headers)
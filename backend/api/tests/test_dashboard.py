@@ -1,7 +1,24 @@
 import pytest
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
 from flask_jwt_extended import create_access_token
 
 
+def this_week(weekday, hour=12, tz='Europe/London'):
+    """
+    Naive UTC timestamp (as stored in the database) for weekday (0 = Monday) of the current week in tz.
+    """
+    zone = ZoneInfo(tz)
+    now = datetime.now(zone)
+    monday = (now - timedelta(days=now.weekday())).date()
+    local = datetime(monday.year, monday.month, monday.day, hour, tzinfo=zone) + timedelta(days=weekday)
+    return local.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def activity(source, weekday, hour=12):
+    return {'source': source, 'activity_at': this_week(weekday, hour)}
+
+
 @pytest.fixture()
 def auth_headers(client):
     with client.application.app_context():
@@ -15,17 +32,12 @@ def test_get_dashboard_stats_success(client, mock_mysql, auth_headers):
     """
     cursor = mock_mysql.connection.cursor.return_value
     
-    cursor.fetchone.side_effect = [
-        {'courses_completed': 3}, 
-        {'tutorials_watched': 15}, 
-        {'tutorials_completed_this_week': 6},
-    ]
+    cursor.fetchone.return_value = {'courses_completed': 3, 'tutorials_watched': 15, 'timezone': None}
     
-    cursor.fetchall.return_value = [
-        {'day_name': 'Monday'},
-        {'day_name': 'Wednesday'},
-        {'day_name': 'Friday'},
-    ]
+    cursor.fetchall.return_value = (
+        [activity('tutorial', 0)] * 2 + [activity('tutorial', 2)] * 2 + [activity('tutorial', 4)] * 2
+        + [activity('quiz', 0), activity('course', 4)]
+    )
 
     response = client.get('/dashboard/stats', headers=auth_headers)
     body = response.get_json()
@@ -54,11 +66,7 @@ def test_get_dashboard_stats_no_activity(client, mock_mysql, auth_headers):
     """
     cursor = mock_mysql.connection.cursor.return_value
     
-    cursor.fetchone.side_effect = [
-        {'courses_completed': 0},
-        {'tutorials_watched': 0},
-        {'tutorials_completed_this_week': 0},
-    ]
+    cursor.fetchone.return_value = {'courses_completed': 0, 'tutorials_watched': 0, 'timezone': None}
     
     cursor.fetchall.return_value = []
 
@@ -83,21 +91,11 @@ def test_get_dashboard_stats_all_days_active(client, mock_mysql, auth_headers):
     """
     cursor = mock_mysql.connection.cursor.return_value
     
-    cursor.fetchone.side_effect = [
-        {'courses_completed': 5},
-        {'tutorials_watched': 20},
-        {'tutorials_completed_this_week': 10},
-    ]
+    cursor.fetchone.return_value = {'courses_completed': 5, 'tutorials_watched': 20, 'timezone': None}
     
-    cursor.fetchall.return_value = [
-        {'day_name': 'Monday'},
-        {'day_name': 'Tuesday'},
-        {'day_name': 'Wednesday'},
-        {'day_name': 'Thursday'},
-        {'day_name': 'Friday'},
-        {'day_name': 'Saturday'},
-        {'day_name': 'Sunday'},
-    ]
+    cursor.fetchall.return_value = (
+        [activity('tutorial', day) for day in range(7)] + [activity('tutorial', 0)] * 3
+    )
 
     response = client.get('/dashboard/stats', headers=auth_headers)
     body = response.get_json()
@@ -138,11 +136,7 @@ def test_get_dashboard_stats_null_results(client, mock_mysql, auth_headers):
     """
     cursor = mock_mysql.connection.cursor.return_value
     
-    cursor.fetchone.side_effect = [
-        None, 
-        None, 
-        None,
-    ]
+    cursor.fetchone.return_value = None
     
     cursor.fetchall.return_value = []
 
@@ -154,3 +148,40 @@ def test_get_dashboard_stats_null_results(client, mock_mysql, auth_headers):
     assert body['tutorials_watched'] == 0
     assert abs(body['time_spent_hours'] - 0.0) < 0.01
 
+
+def test_get_dashboard_stats_uses_week_range(client, mock_mysql, auth_headers):
+    """
+    Test this week's activity is filtered with Monday-to-Monday range bounds instead of YEARWEEK().
+    """
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchone.return_value = {'courses_completed': 0, 'tutorials_watched': 0, 'timezone': None}
+    cursor.fetchall.return_value = []
+
+    response = client.get('/dashboard/stats', headers=auth_headers)
+
+    assert response.status_code == 200
+    sql, params = cursor.execute.call_args_list[-1].args
+    assert 'YEARWEEK' not in sql
+    assert 'completed_at >= %s AND completed_at < %s' in sql
+    week_start, week_end = params[1], params[2]
+    assert week_start == this_week(0, hour=0)
+    assert week_end - week_start in (timedelta(days=7), timedelta(days=7, hours=1), timedelta(days=7, hours=-1))
+
+
+def test_get_dashboard_stats_buckets_days_in_user_timezone(client, mock_mysql, auth_headers):
+    """
+    Test activity is assigned to the weekday in the user's timezone preference.
+    """
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchone.return_value = {'courses_completed': 0, 'tutorials_watched': 0, 'timezone': 'Pacific/Auckland'}
+    # Tuesday 12:00 in Auckland is still Monday in UTC
+    cursor.fetchall.return_value = [
+        {'source': 'quiz', 'activity_at': this_week(1, hour=12, tz='Pacific/Auckland')}
+    ]
+
+    response = client.get('/dashboard/stats', headers=auth_headers)
+    body = response.get_json()
+
+    assert response.status_code == 200
+    assert body['weekly_activity']['TU'] is True
+    assert body['weekly_activity']['MO'] is False
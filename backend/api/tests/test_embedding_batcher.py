@@ -0,0 +1,99 @@
+import threading
+import time
+import pytest
+from utils.embedding_batcher import EmbeddingBatcher
+
+
+class FakeEmbeddings:
+    """
+    Records each multi-input call and returns [len(text)] as the vector of each text.
+    """
+
+    def __init__(self, error=None):
+        self.calls = []
+        self.error = error
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        if self.error:
+            raise self.error
+        return [[float(len(text))] for text in texts]
+
+
+def embed_concurrently(batcher, texts):
+    results, errors = {}, {}
+
+    def run(text):
+        try:
+            results[text] = batcher.embed(text)
+        except Exception as e:
+            errors[text] = e
+
+    threads = [threading.Thread(target=run, args=(text,)) for text in texts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results, errors
+
+
+def test_concurrent_texts_share_one_request():
+    """
+    Test texts submitted within the wait window go out as one request and each caller gets its own vector.
+    """
+    embeddings = FakeEmbeddings()
+    batcher = EmbeddingBatcher(embeddings, max_wait_ms=50, max_batch=32)
+    texts = ['a' * n for n in range(1, 9)]
+
+    results, errors = embed_concurrently(batcher, texts)
+
+    assert errors == {}
+    assert len(embeddings.calls) == 1
+    assert sorted(embeddings.calls[0]) == sorted(texts)
+    assert all(results[text] == [float(len(text))] for text in texts)
+
+
+def test_full_batch_is_sent_without_waiting():
+    """
+    Test a batch is sent as soon as it reaches max_batch, not after the wait window.
+    """
+    embeddings = FakeEmbeddings()
+    batcher = EmbeddingBatcher(embeddings, max_wait_ms=2000, max_batch=2)
+
+    started = time.monotonic()
+    results, _ = embed_concurrently(batcher, ['one', 'three'])
+
+    assert time.monotonic() - started < 1
+    assert results == {'one': [3.0], 'three': [5.0]}
+    assert len(embeddings.calls) == 1
+
+
+def test_duplicate_texts_in_a_batch_are_embedded_once():
+    embeddings = FakeEmbeddings()
+    batcher = EmbeddingBatcher(embeddings, max_wait_ms=50)
+
+    results, _ = embed_concurrently(batcher, ['same', 'same', 'other'])
+
+    assert sorted(embeddings.calls[0]) == ['other', 'same']
+    assert results == {'same': [4.0], 'other': [5.0]}
+
+
+def test_failed_request_fails_every_caller_in_the_batch():
+    """
+    Test an upstream error is raised in each caller that was waiting on the batch.
+    """
+    batcher = EmbeddingBatcher(FakeEmbeddings(error=TimeoutError('embeddings timed out')), max_wait_ms=50)
+
+    results, errors = embed_concurrently(batcher, ['x', 'yy', 'zzz'])
+
+    assert results == {}
+    assert sorted(errors) == ['x', 'yy', 'zzz']
+    assert all(isinstance(error, TimeoutError) for error in errors.values())
+
+
+def test_no_wait_window_sends_each_text_on_its_own():
+    embeddings = FakeEmbeddings()
+    batcher = EmbeddingBatcher(embeddings, max_wait_ms=0)
+
+    assert batcher.embed('abc') == [3.0]
+    assert embeddings.calls == [['abc']]
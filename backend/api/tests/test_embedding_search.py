@@ -0,0 +1,182 @@
+import pytest
+from flask_jwt_extended import create_access_token
+from utils.circuit_breaker import CircuitBreaker, CircuitOpen, CLOSED, OPEN, HALF_OPEN
+from utils.search_utils import BM25Index, reciprocal_rank_fusion
+from conftest import FakeClock
+
+
+def fail():
+    raise TimeoutError('embeddings API timed out')
+
+
+@pytest.fixture()
+def auth_headers(client):
+    with client.application.app_context():
+        token = create_access_token(identity="test")
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_breaker_opens_after_consecutive_failures_and_fails_fast():
+    """
+    Test the circuit opens after failure_threshold failures in a row and then rejects without calling.
+    """
+    breaker = CircuitBreaker('test', failure_threshold=2, clock=FakeClock())
+    calls = []
+
+    with pytest.raises(TimeoutError):
+        breaker.call(fail)
+    assert breaker.call(lambda: 'ok') == 'ok'
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            breaker.call(fail)
+
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.call(lambda: calls.append('called'))
+    assert calls == []
+
+
+def test_breaker_half_open_probe_closes_or_reopens():
+    """
+    Test one probe is let through after reset_seconds: failure reopens the circuit, success closes it.
+    """
+    clock = FakeClock()
+    breaker = CircuitBreaker('test', failure_threshold=1, reset_seconds=30, clock=clock)
+    with pytest.raises(TimeoutError):
+        breaker.call(fail)
+
+    clock.now = 31
+    with pytest.raises(TimeoutError):
+        breaker.call(fail)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.call(lambda: 'ok')
+
+    clock.now = 62
+    assert breaker.call(lambda: 'ok') == 'ok'
+    assert breaker.state == CLOSED
+
+
+def test_breaker_allows_a_single_probe_at_a_time():
+    """
+    Test other calls still fail fast while the half-open probe is running.
+    """
+    clock = FakeClock()
+    breaker = CircuitBreaker('test', failure_threshold=1, reset_seconds=30, clock=clock)
+    with pytest.raises(TimeoutError):
+        breaker.call(fail)
+    clock.now = 31
+
+    def probe():
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(CircuitOpen):
+            breaker.call(lambda: 'concurrent')
+        return 'probe'
+
+    assert breaker.call(probe) == 'probe'
+
+
+COURSES = [
+    (1, 'Cyber Basics', 'Stay safe online and spot phishing emails.'),
+    (2, 'Spreadsheet Skills', 'Formulas, charts and tables for everyday spreadsheets.'),
+    (3, 'Teams Unlocked', 'Meetings, chat and sharing files with Microsoft Teams.'),
+    (4, 'Office Charts', 'Make charts for reports.'),
+]
+
+
+def course_rows():
+    return [{'id': course_id, 'name': name, 'description': description, 'summary': None,
+             'learning_objectives': '["Use it at work"]'} for course_id, name, description in COURSES]
+
+
+def make_index():
+    return BM25Index([(course_id, {'name': name, 'description': description})
+                      for course_id, name, description in COURSES])
+
+
+def test_bm25_ranks_title_terms_above_description_terms():
+    """
+    Test a term in a course name outweighs the same term in another course's description, plurals included.
+    """
+    ranking = [key for key, _ in make_index().search('how to learn spreadsheets and charts')]
+
+    assert ranking[:2] == [2, 4]
+    assert 1 not in ranking
+
+
+def test_title_match_needs_a_single_course_name():
+    """
+    Test a query is a title match only when one course name contains all of its terms.
+    """
+    index = make_index()
+
+    assert index.title_match('teams unlocked') == 3
+    assert index.title_match('Teams') == 3
+    assert index.title_match('phishing') is None
+    assert index.title_match('the') is None
+
+
+def test_reciprocal_rank_fusion():
+    """
+    Test a course ranked well by both lists beats one ranked first by only one of them.
+    """
+    fused = reciprocal_rank_fusion([[1, 2, 3], [2, 3]], k=60)
+
+    assert [key for key, _ in fused] == [2, 3, 1]
+
+
+def test_title_query_skips_the_embeddings_call(client, mock_mysql, mocker, auth_headers):
+    """
+    Test a query naming one course is answered from the index without embedding it.
+    """
+    get_embedding = mocker.patch('utils.embedding_utils.get_embedding')
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchall.side_effect = [course_rows(), [{'id': 3, 'name': 'Teams Unlocked'}]]
+
+    res = client.post('/embedding/course', json={'text': 'Teams Unlocked'}, headers=auth_headers)
+
+    assert res.status_code == 200
+    assert res.get_json() == [{'id': 3, 'name': 'Teams Unlocked'}]
+    get_embedding.assert_not_called()
+    assert cursor.execute.call_args_list[-1].args[1] == [3, 3]
+
+
+def test_search_fuses_keyword_and_embedding_rankings(client, mock_mysql, mocker, auth_headers):
+    """
+    Test a keyword match ranked low by embeddings is pulled up by the fused ranking.
+    """
+    mocker.patch('utils.embedding_utils.get_embedding', return_value=[1.0, 0.0])
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchone.return_value = {'count': 4}
+    cursor.fetchall.side_effect = [
+        course_rows(),
+        [{'course_id': 1, 'embedding': '[1.0, 0.0]'}, {'course_id': 3, 'embedding': '[0.9, 0.1]'},
+         {'course_id': 4, 'embedding': '[0.5, 0.5]'}, {'course_id': 2, 'embedding': '[0.0, 1.0]'}],
+        [],
+    ]
+
+    res = client.post('/embedding/course', json={'text': 'formulas'}, headers=auth_headers)
+
+    assert res.status_code == 200
+    assert cursor.execute.call_args_list[-1].args[1] == [2, 1, 3, 2, 1, 3]
+
+
+def test_course_search_falls_back_to_keywords_when_embeddings_fail(client, mock_mysql, mocker, auth_headers):
+    """
+    Test POST /embedding/course still answers when the embeddings API is unavailable.
+    """
+    mocker.patch('utils.embedding_utils.get_embedding', side_effect=CircuitOpen('openai_embeddings circuit is open'))
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchone.return_value = {'count': 3}
+    cursor.fetchall.side_effect = [
+        course_rows(),
+        [{'course_id': 1, 'embedding': '[1.0, 0.0]'}, {'course_id': 2, 'embedding': '[0.0, 1.0]'}],
+        [{'id': 2, 'name': 'Spreadsheet skills'}, {'id': 1, 'name': 'Cyber Basics'}],
+    ]
+
+    res = client.post('/embedding/course', json={'text': 'spreadsheet formulas'}, headers=auth_headers)
+
+    assert res.status_code == 200
+    assert [course['id'] for course in res.get_json()] == [2, 1]
+    ranked_ids = cursor.execute.call_args_list[-1].args[1]
+    assert ranked_ids == [2, 1, 2, 1]
@@ -0,0 +1,145 @@
+import threading
+import time
+import pytest
+from flask_jwt_extended import create_access_token
+import utils.home_utils as home_utils
+
+
+@pytest.fixture()
+def auth_headers(client):
+    with client.application.app_context():
+        token = create_access_token(identity="42")
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_home_returns_requested_sections(client, mock_mysql, auth_headers):
+    """
+    Test /home composes user details and preferences from the shared identity in one response.
+    """
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchone.return_value = {
+        'id': 42, 'username': 'testuser', 'email': 'testuser@example.com', 'role': 'user',
+        'preferences': '{"theme": "dark"}'
+    }
+
+    response = client.get('/home?sections=user,preferences', headers=auth_headers)
+    body = response.get_json()
+
+    assert response.status_code == 200
+    assert body['user']['username'] == 'testuser'
+    assert body['preferences'] == {'preferences': {'theme': 'dark'}}
+    assert set(body['sections']) == {'user', 'preferences'}
+    assert all(status['status'] == 'ok' for status in body['sections'].values())
+    assert 'user;dur=' in response.headers['Server-Timing']
+    for call in cursor.execute.call_args_list:
+        assert call.args[1] == (42,)
+
+
+def test_home_returns_partial_results_when_a_section_is_slow(client, mocker, auth_headers):
+    """
+    Test a section that misses HOME_SECTION_TIMEOUT_MS is reported as timed out while the rest are returned.
+    """
+    client.application.config['HOME_SECTION_TIMEOUT_MS'] = 50
+
+    def slow_recommendations(user_id):
+        time.sleep(0.5)
+        return [{'id': 1}], 200
+
+    mocker.patch.dict(home_utils.SECTIONS, {
+        'stats': lambda user_id: ({'courses_completed': 2}, 200),
+        'recommended': slow_recommendations,
+    })
+
+    response = client.get('/home?sections=stats,recommended', headers=auth_headers)
+    body = response.get_json()
+
+    assert response.status_code == 200
+    assert body['stats'] == {'courses_completed': 2}
+    assert body['recommended'] is None
+    assert body['sections']['stats']['status'] == 'ok'
+    assert body['sections']['recommended'] == {'status': 'timeout', 'duration_ms': 50.0}
+
+
+def test_home_sections_are_bounded_and_abandoned_ones_cancelled(client, mocker, auth_headers):
+    """
+    Test at most HOME_MAX_WORKERS sections run at once, and timed out sections still queued never run.
+    """
+    client.application.config.update(HOME_MAX_WORKERS=2, HOME_SECTION_TIMEOUT_MS=100)
+    release = threading.Event()
+    started = []
+
+    def blocked(user_id):
+        started.append(user_id)
+        release.wait(5)
+        return {'id': user_id}, 200
+
+    mocker.patch.dict(home_utils.SECTIONS, {name: blocked for name in home_utils.SECTIONS})
+
+    try:
+        for _ in range(2):
+            body = client.get('/home', headers=auth_headers).get_json()
+            assert all(status['status'] == 'timeout' for status in body['sections'].values())
+        assert len(started) == 2
+    finally:
+        release.set()
+
+    client.application.config['HOME_SECTION_TIMEOUT_MS'] = 2000
+    body = client.get('/home?sections=user,stats', headers=auth_headers).get_json()
+
+    assert all(status['status'] == 'ok' for status in body['sections'].values())
+    assert len(started) == 4
+
+
+def test_home_sections_cap_their_statement_time(client, mock_mysql, mocker, auth_headers):
+    """
+    Test each section limits its SELECTs to the section timeout, so abandoned sections stop soon.
+    """
+    client.application.config['HOME_SECTION_TIMEOUT_MS'] = 800
+    mocker.patch.dict(home_utils.SECTIONS, {'stats': lambda user_id: ({'courses_completed': 2}, 200)})
+
+    client.get('/home?sections=stats', headers=auth_headers)
+
+    mock_mysql.limit_statement_time.assert_called_once_with(800)
+
+
+def test_home_reports_failed_sections(client, mocker, auth_headers):
+    """
+    Test a section returning an error code or raising is null with its error, without failing the response.
+    """
+    def broken(user_id):
+        raise RuntimeError('connection lost')
+
+    mocker.patch.dict(home_utils.SECTIONS, {
+        'recommended': lambda user_id: ({'error': 'Enroll in courses to get personalized recommendations'}, 404),
+        'courses': broken,
+    })
+
+    response = client.get('/home?sections=courses,recommended', headers=auth_headers)
+    body = response.get_json()
+
+    assert response.status_code == 200
+    assert body['recommended'] is None
+    assert body['sections']['recommended']['code'] == 404
+    assert body['sections']['recommended']['error'] == 'Enroll in courses to get personalized recommendations'
+    assert body['courses'] is None
+    assert body['sections']['courses']['code'] == 500
+    assert body['sections']['courses']['error'] == 'connection lost'
+
+
+def test_home_unknown_section(client, auth_headers):
+    """
+    Test requesting a section that does not exist is rejected.
+    """
+    response = client.get('/home?sections=stats,leaderboard', headers=auth_headers)
+
+    assert response.status_code == 400
+    assert 'leaderboard' in response.get_json()['error']
+
+
+def test_home_missing_token(client):
+    """
+    Test /home requires authentication.
+    """
+    response = client.get('/home')
+
+    assert response.status_code == 401
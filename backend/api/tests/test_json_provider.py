@@ -0,0 +1,91 @@
+import json
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+import numpy as np
+import pytest
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
+import utils.json_provider as json_provider
+
+
+ROWS = [
+    {'id': 2, 'name': 'Staying safe online', 'avg_score': Decimal('87.50'),
+     'created_at': datetime(2024, 1, 1, 10, 30), 'due': date(2024, 2, 1), 'similarity': np.float64(0.25)},
+    {'id': 1, 'name': 'Café basics', 'avg_score': None, 'created_at': None, 'due': None,
+     'similarity': np.float32(0.5), 'embedding': np.array([1.0, 0.5])},
+]
+
+
+@pytest.fixture(params=['orjson', 'stdlib'])
+def provider(request, client, monkeypatch):
+    if request.param == 'stdlib':
+        monkeypatch.setattr(json_provider, 'orjson', None)
+    elif json_provider.orjson is None:
+        pytest.skip('orjson not installed')
+    return json_provider.FastJSONProvider(client.application)
+
+
+def test_app_uses_fast_provider(client):
+    """
+    Test the app serialises responses with FastJSONProvider by default.
+    """
+    assert isinstance(client.application.json, json_provider.FastJSONProvider)
+
+
+def test_output_matches_flask_default_provider(provider, client):
+    """
+    Test documents decode to the same values as Flask's default provider produces, keys sorted.
+    """
+    stdlib_rows = [{k: v for k, v in row.items() if not isinstance(v, (np.ndarray, np.generic))} for row in ROWS]
+    expected = json.loads(DefaultJSONProvider(client.application).dumps(stdlib_rows))
+
+    decoded = json.loads(provider.dumps(stdlib_rows))
+
+    assert decoded == expected
+    assert decoded[0]['avg_score'] == '87.50'
+    assert decoded[0]['created_at'] == 'Mon, 01 Jan 2024 10:30:00 GMT'
+    assert list(decoded[0]) == sorted(decoded[0])
+
+
+def test_numpy_values(provider):
+    """
+    Test NumPy scalars and arrays serialise as plain numbers and lists.
+    """
+    decoded = json.loads(provider.dumps(ROWS))
+
+    assert decoded[0]['similarity'] == 0.25
+    assert decoded[1]['similarity'] == 0.5
+    assert decoded[1]['embedding'] == [1.0, 0.5]
+
+
+def test_response_body(provider, client):
+    """
+    Test jsonify-style responses are compact JSON followed by a newline, and round-trip through loads.
+    """
+    with client.application.app_context():
+        response = provider.response({'b': 1, 'a': [1, 2]})
+
+    assert response.mimetype == 'application/json'
+    assert response.get_data() == b'{"a":[1,2],"b":1}\n'
+    assert provider.loads(response.get_data()) == {'a': [1, 2], 'b': 1}
+
+
+def test_unsupported_values_still_raise(provider):
+    """
+    Test objects no encoder understands raise TypeError like the default provider.
+    """
+    with pytest.raises(TypeError):
+        provider.dumps({'value': object()})
+
+
+@pytest.mark.parametrize('value', [
+    datetime(2024, 1, 1, 10, 30, 5),
+    datetime(1999, 12, 31, 23, 59, 59, 999999),
+    datetime(2024, 3, 31, 1, 0, tzinfo=timezone(timedelta(hours=2))),
+    date(2024, 2, 29),
+])
+def test_http_date_matches_werkzeug(value):
+    """
+    Test the fast HTTP-date formatter agrees with werkzeug's for naive, aware and date values.
+    """
+    assert json_provider.http_date(value) == http_date(value)
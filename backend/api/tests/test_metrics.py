@@ -0,0 +1,69 @@
+from unittest.mock import MagicMock
+from flask import g
+from utils.db_metrics import InstrumentedConnection, fingerprint, record_request
+
+
+def test_fingerprint_normalises_statements():
+    """
+    Test equivalent statements share one fingerprint.
+    """
+    a = fingerprint("SELECT * FROM courses\n   WHERE id IN (%s, %s, %s)")
+    b = fingerprint("SELECT * FROM courses WHERE id IN (%s)")
+    c = fingerprint("SELECT * FROM courses WHERE id = 42 AND name = 'x'")
+
+    assert a == b == "SELECT * FROM courses WHERE id IN (...)"
+    assert c == "SELECT * FROM courses WHERE id = ? AND name = ?"
+
+
+def test_instrumented_cursor_counts_queries_and_flags_n_plus_one(client):
+    """
+    Test statements executed through the connection proxy are recorded per request
+    and a repeated statement above the threshold is logged and exported.
+    """
+    app = client.application
+    app.config['DB_N_PLUS_ONE_THRESHOLD'] = 2
+    raw_connection = MagicMock()
+
+    with app.test_request_context('/courses'):
+        connection = InstrumentedConnection(raw_connection)
+        cursor = connection.cursor()
+        cursor.execute("SELECT id FROM courses")
+        for course_id in range(3):
+            cursor.execute("SELECT COUNT(*) FROM course_tutorials WHERE course_id = %s", (course_id,))
+        cursor.fetchall()
+
+        assert g._db_stats['count'] == 4
+        assert raw_connection.cursor.return_value.execute.call_count == 4
+        raw_connection.cursor.return_value.fetchall.assert_called_once()
+
+        response = record_request(app.response_class())
+        assert '4 queries' in response.headers['Server-Timing']
+
+    client.application.config['METRICS_ENABLED'] = True
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'skywise_db_queries_per_request_count' in body
+    assert 'skywise_db_n_plus_one_total' in body
+
+
+def test_metrics_endpoint_is_prometheus_text(client):
+    """
+    Test /metrics is served as Prometheus text.
+    """
+    client.application.config['METRICS_ENABLED'] = True
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    assert '# TYPE skywise_db_queries_per_request histogram' in response.get_data(as_text=True)
+
+
+def test_metrics_endpoint_is_gated(client):
+    """
+    Test /metrics is hidden unless enabled, and requires the bearer token when one is configured.
+    """
+    assert client.get('/metrics').status_code == 404
+
+    client.application.config.update(METRICS_ENABLED=True, METRICS_TOKEN='scrape-secret')
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer scrape-secret'}).status_code == 200
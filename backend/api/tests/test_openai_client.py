@@ -0,0 +1,116 @@
+import threading
+from contextlib import nullcontext
+import pytest
+from openai import APIConnectionError
+from utils import openai_client
+
+
+class FakeClient:
+    """
+    Stand-in for the OpenAI client: with_options() records the attempt timeout.
+    """
+
+    def __init__(self):
+        self.timeouts = []
+        self.responses = self
+
+    def with_options(self, timeout):
+        self.timeouts.append(timeout)
+        return self
+
+    def stream(self, **kwargs):
+        return nullcontext('stream')
+
+
+@pytest.fixture()
+def fake_client(client, mocker):
+    fake = FakeClient()
+    mocker.patch.object(openai_client, '_client', fake)
+    mocker.patch.object(openai_client, '_slots', threading.BoundedSemaphore(2))
+    mocker.patch.object(openai_client, '_budget', openai_client.RetryBudget(ratio=0.2, max_tokens=10))
+    mocker.patch.object(openai_client, 'backoff_seconds', return_value=0)
+    with client.application.app_context():
+        yield fake
+
+
+def flaky(failures, error=lambda: APIConnectionError(request=None)):
+    calls = []
+
+    def fn(client):
+        calls.append(client)
+        if len(calls) <= failures:
+            raise error()
+        return 'embedding'
+    return fn, calls
+
+
+def test_transient_errors_are_retried(fake_client):
+    """
+    Test connection errors are retried up to OPENAI_MAX_RETRIES times.
+    """
+    fn, calls = flaky(2)
+
+    assert openai_client.call('embeddings', fn) == 'embedding'
+    assert len(calls) == 3
+
+    fn, calls = flaky(3)
+    with pytest.raises(APIConnectionError):
+        openai_client.call('embeddings', fn)
+    assert len(calls) == 3
+
+
+def test_other_errors_are_not_retried(fake_client):
+    """
+    Test a non-transient error fails on the first attempt.
+    """
+    fn, calls = flaky(1, lambda: ValueError('bad request'))
+
+    with pytest.raises(ValueError):
+        openai_client.call('embeddings', fn)
+    assert len(calls) == 1
+
+
+def test_retry_budget_limits_retries(fake_client, mocker):
+    """
+    Test retries stop once the retry budget is spent.
+    """
+    mocker.patch.object(openai_client, '_budget', openai_client.RetryBudget(ratio=0, max_tokens=1))
+    fn, calls = flaky(5)
+
+    with pytest.raises(APIConnectionError):
+        openai_client.call('embeddings', fn)
+    assert len(calls) == 2
+
+
+def test_attempt_timeout_is_cut_to_the_deadline(fake_client):
+    """
+    Test each attempt gets the configured timeout or what is left of the call's deadline, if less.
+    """
+    openai_client.call('embeddings', lambda client: None, deadline_seconds=2)
+
+    assert 0 < fake_client.timeouts[-1] <= 2
+
+
+def test_caller_gives_up_when_no_slot_frees(fake_client, mocker):
+    """
+    Test a call waiting for a concurrency slot fails once its deadline passes.
+    """
+    mocker.patch.object(openai_client, '_slots', threading.BoundedSemaphore(1))
+    openai_client._slots.acquire()
+
+    with pytest.raises(openai_client.OpenAIUnavailable):
+        openai_client.call('embeddings', lambda client: None, deadline_seconds=0.05)
+
+
+def test_stream_timeout_excludes_time_waiting_for_a_slot(fake_client, mocker):
+    """
+    Test a stream that queued for a slot only gets what is left of its deadline.
+    """
+    mocker.patch.object(openai_client, '_slots', threading.BoundedSemaphore(1))
+    openai_client._slots.acquire()
+    threading.Timer(0.2, openai_client._slots.release).start()
+
+    with openai_client.stream('chat', deadline_seconds=1, model='gpt') as response_stream:
+        assert response_stream == 'stream'
+
+    assert 0 < fake_client.timeouts[-1] <= 0.8
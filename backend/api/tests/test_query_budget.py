@@ -0,0 +1,177 @@
+"""
+Query budgets for every API route.
+
+Each route is driven through the mocked cursor with ROW_COUNT rows wherever it lists something,
+and the number of statements it executes is compared with its declared budget.
+A route going over budget (for example a new per-row query inside a loop) fails the suite.
+The per-route counts are printed in the pytest terminal summary.
+"""
+import numpy as np
+import pytest
+from datetime import datetime
+from flask_jwt_extended import create_access_token
+
+ROW_COUNT = 5
+
+
+class Row(dict):
+    """
+    DictCursor row stand-in that answers any column the route reads.
+    """
+    DEFAULTS = {
+        'role': 'admin',
+        'best_score': 100,
+        'embedding': '[1.0, 0.5]',
+        'preferences': '{}',
+        'password_hash': '$2b$12$5MFsjRaeD/eE7WLrY6XqtO8BIDD90pGuxrYVzeJsOQg3koBEh8rxm',
+        'text': '',
+        'transcript_hash': 'abc',
+        'source': 'tutorial',
+        'activity_at': datetime(2024, 1, 1, 12, 0),
+        'timezone': 'Europe/London',
+        'vector': np.array([1.0, 0.5], dtype='<f4').tobytes(),
+        'start_seconds': None,
+    }
+
+    def __missing__(self, key):
+        return self.DEFAULTS.get(key, 1)
+
+    def __bool__(self):
+        return True
+
+
+def rows(count=ROW_COUNT):
+    return [Row(id=i, question_id=i, course_id=i) for i in range(1, count + 1)]
+
+
+# (method, path, json body, leading fetchone values, budget)
+ROUTE_BUDGETS = [
+    ('POST', '/register', {'username': 'u', 'email': 'u@example.com', 'password': 'p'}, [None], 2),
+    ('POST', '/login', {'email': 'u@example.com', 'password': 'secret'}, [], 1),
+    ('GET', '/user_details', None, [], 1),
+    ('GET', '/preferences', None, [], 1),
+    ('POST', '/preferences', {'preferences': {'theme': 'dark'}}, [], 2),
+    ('POST', '/preferences/reset', None, [], 1),
+    ('GET', '/courses/public', None, [], 1),
+    ('GET', '/courses', None, [], 2),
+    ('GET', '/courses/unenrolled-courses', None, [], 1),
+    ('GET', '/courses/1', None, [], 2),
+    ('GET', '/courses/1/tutorials', None, [], 1),
+    ('GET', '/courses/1/tutorials/1', None, [], 1),
+    ('GET', '/courses/1/tutorials/1/transcript', None, [], 1),
+    ('POST', '/courses/1/progress', {'progress_percentage': 50}, [], 2),
+    ('GET', '/courses/1/progress', None, [], 1),
+    ('GET', '/courses/1/next-step', None, [], 16),
+    ('GET', '/tutorials', None, [], 1),
+    ('POST', '/tutorials/1/complete', {'feedback': 'positive'}, [None], 10),
+    ('POST', '/tutorials/1/feedback', {'feedback_type': 'positive'}, [], 1),
+    ('GET', '/tutorials/1/quizzes', None, [], 1),
+    ('GET', '/quizzes/1/questions', None, [], 1),
+    ('GET', '/quizzes/1/questions/1/options', None, [], 1),
+    ('GET', '/quizzes/1/full', None, [], 1),
+    ('POST', '/quizzes/1/questions/1/answer', {'selected_option_id': 1}, [], 1),
+    ('POST', '/quizzes/1/submit', {'answers': [{'question_id': 1, 'selected_option_id': 1}]}, [], 12),
+    ('GET', '/dashboard/stats', None, [], 2),
+    ('GET', '/admin/dashboard/stats', None, [], 8),
+    ('GET', '/admin/users', None, [], 2),
+    ('GET', '/admin/users/1', None, [], 9),
+    ('GET', '/admin/courses', None, [], 2),
+    ('POST', '/admin/courses', {'name': 'New course'}, [], 3),
+    ('PUT', '/admin/courses/1', {'name': 'Renamed'}, [], 4),
+    ('DELETE', '/admin/courses/1', None, [], 8),
+    ('POST', '/admin/transcripts/reindex', None, [], 1),
+    ('GET', '/admin/exports/progress', None, [], 4),
+    ('POST', '/embedding/course', {'text': 'spreadsheets'}, [], 4),
+    ('GET', '/search/tutorials?q=passwords', None, [], 3),
+    ('GET', '/embedding/recommended', None, [], 6),
+    ('GET', '/home', None, [], 13),
+    ('POST', '/batch', {'requests': [{'path': '/courses/1'}, {'path': '/courses/1/tutorials'}]}, [], 3),
+]
+
+
+@pytest.fixture()
+def auth_headers(client):
+    with client.application.app_context():
+        token = create_access_token(identity="1")
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture(autouse=True)
+def no_embedding_calls(mocker):
+    mocker.patch('utils.embedding_utils.get_embedding', return_value=[1.0, 0.5])
+
+
+@pytest.fixture(autouse=True)
+def no_background_indexing(mocker):
+    mocker.patch('routes.admin.start_indexing')
+
+
+@pytest.fixture(autouse=True)
+def known_password(mocker):
+    mocker.patch('bcrypt.checkpw', return_value=True)
+
+
+def _prime_cursor(cursor, leading_fetchone):
+    leading = list(leading_fetchone)
+
+    def fetchone():
+        return leading.pop(0) if leading else Row()
+
+    streamed = [rows()]
+
+    def fetchmany(size=None):
+        return streamed.pop(0) if streamed else []
+
+    cursor.lastrowid = 1
+    cursor.fetchone.side_effect = fetchone
+    cursor.fetchall.side_effect = lambda: rows()
+    cursor.fetchmany.side_effect = fetchmany
+    cursor.__iter__.side_effect = lambda: iter(rows())
+
+
+def statement_count(cursor):
+    return cursor.execute.call_count + cursor.executemany.call_count
+
+
+@pytest.mark.parametrize(
+    'method,path,body,leading_fetchone,budget',
+    ROUTE_BUDGETS,
+    ids=[f'{method} {path}' for method, path, *_ in ROUTE_BUDGETS]
+)
+def test_route_query_budget(client, mock_mysql, auth_headers, query_budget_report,
+                            method, path, body, leading_fetchone, budget):
+    cursor = mock_mysql.connection.cursor.return_value
+    _prime_cursor(cursor, leading_fetchone)
+
+    response = client.open(path, method=method, json=body, headers=auth_headers)
+    response.get_data()
+
+    executed = statement_count(cursor)
+    query_budget_report.append((f'{method} {path}', executed, budget))
+
+    assert response.status_code < 500, response.get_data(as_text=True)
+    assert executed <= budget, f'{method} {path} executed {executed} statements, budget is {budget}'
+
+
+def test_every_route_has_a_budget(client):
+    """
+    Test new routes cannot be added without declaring a query budget.
+    """
+    exempt = {'/health', '/metrics', '/refresh', '/embedding/embed-all', '/static/<path:filename>'}
+    declared = {(method, path.split('?')[0]) for method, path, *_ in ROUTE_BUDGETS}
+
+    missing = []
+    for rule in client.application.url_map.iter_rules():
+        if rule.rule in exempt:
+            continue
+        sample = (rule.rule
+                  .replace('<int:course_id>', '1')
+                  .replace('<int:tutorial_id>', '1')
+                  .replace('<int:quiz_id>', '1')
+                  .replace('<int:question_id>', '1')
+                  .replace('<int:user_id>', '1'))
+        for method in sorted(rule.methods - {'HEAD', 'OPTIONS'}):
+            if (method, sample) not in declared:
+                missing.append(f'{method} {rule.rule}')
+
+    assert not missing, f'Routes without a query budget: {missing}'
@@ -0,0 +1,143 @@
+import pytest
+from flask_jwt_extended import create_access_token
+import app as app_module
+import utils.replica_utils as replica_utils
+
+
+class FakeConnection:
+    """
+    pymysql connection stand-in that remembers which server it was opened against.
+    """
+    def __init__(self, target, lag=0):
+        self.target = target
+        self.lag = lag
+        self.rollbacks = 0
+        self.statements = []
+
+    def cursor(self, *args):
+        connection = self
+
+        class Cursor:
+            def execute(self, sql, args=None):
+                self.sql = sql
+                connection.statements.append((sql, args))
+
+            def fetchone(self):
+                return {'Seconds_Behind_Source': connection.lag}
+
+            def close(self):
+                pass
+
+        return Cursor()
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        pass
+
+
+@pytest.fixture()
+def db(client, mocker):
+    replica_utils._lag_checks.clear()
+    replica_utils._sticky_until.clear()
+    flask_app = client.application
+    flask_app.config.update(MYSQL_REPLICA_HOSTS='replica-1:3307', DB_INSTRUMENTATION=False)
+    extension = app_module.MySQL()
+    extension.init_app(flask_app)
+    extension.opened = []
+
+    def connect(target=replica_utils.PRIMARY):
+        connection = FakeConnection(target, lag=extension.replica_lag)
+        extension.opened.append(connection)
+        return connection
+
+    extension.replica_lag = 0
+    mocker.patch.object(extension, 'connect', side_effect=connect)
+    return extension
+
+
+def test_reads_go_to_primary_by_default(client, db):
+    """
+    Test contexts that did not opt in with @read_only always use the primary.
+    """
+    with client.application.app_context():
+        assert db.connection.target == replica_utils.PRIMARY
+
+
+def test_read_only_context_uses_a_fresh_replica(client, db):
+    """
+    Test a read-only context reads from the configured replica once its lag is within bounds.
+    """
+    with client.application.app_context():
+        replica_utils.use_replica(user_id=7)
+        assert db.connection.target == ('replica-1', 3307)
+
+
+def test_lagging_replica_falls_back_to_primary(client, db):
+    """
+    Test a replica further behind than MYSQL_REPLICA_MAX_LAG_SECONDS (or not replicating) is skipped.
+    """
+    db.replica_lag = 30
+    with client.application.app_context():
+        replica_utils.use_replica(user_id=7)
+        assert db.connection.target == replica_utils.PRIMARY
+
+    # The lag check is cached, so the next context goes straight to the (pooled) primary connection
+    with client.application.app_context():
+        replica_utils.use_replica(user_id=7)
+        assert db.connection.target == replica_utils.PRIMARY
+    assert [c.target for c in db.opened] == [('replica-1', 3307), replica_utils.PRIMARY]
+
+
+def test_reads_stick_to_primary_after_own_write(client, db):
+    """
+    Test a user's successful write request keeps their read-only requests on the primary for a while.
+    """
+    with client.application.app_context():
+        token = create_access_token(identity="7")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.post('/preferences', json={'preferences': {'theme': 'dark'}}, headers=headers)
+    assert response.status_code == 200
+    assert replica_utils.is_sticky('7')
+    assert not replica_utils.is_sticky('8')
+
+    with client.application.app_context():
+        replica_utils.use_replica(user_id=7)
+        assert db.connection.target == replica_utils.PRIMARY
+    with client.application.app_context():
+        replica_utils.use_replica(user_id=8)
+        assert db.connection.target == ('replica-1', 3307)
+
+
+def test_connections_are_rolled_back_and_reused(client, db):
+    """
+    Test teardown rolls back and pools connections so the next context reuses them.
+    """
+    with client.application.app_context():
+        first = db.connection
+    with client.application.app_context():
+        second = db.connection
+
+    assert first is second
+    assert first.rollbacks == 2
+    assert len(db.opened) == 1
+
+
+def test_statement_time_limit_is_set_and_reset(client, db):
+    """
+    Test limit_statement_time sets max_execution_time on the context's connection and resets it before pooling.
+    """
+    with client.application.app_context():
+        db.limit_statement_time(1500)
+        connection = db.connection
+
+    assert connection.statements == [
+        ("SET SESSION max_execution_time = %s", (1500,)),
+        ("SET SESSION max_execution_time = DEFAULT", None),
+    ]
+
+    with client.application.app_context():
+        assert db.connection is connection
+    assert len(connection.statements) == 2
@@ -0,0 +1,118 @@
+import threading
+import time
+import pytest
+from utils.singleflight import SingleFlight
+
+
+def run_concurrently(count, target):
+    results = [None] * count
+    errors = [None] * count
+
+    def call(index):
+        try:
+            results[index] = target()
+        except Exception as e:
+            errors[index] = e
+
+    threads = [threading.Thread(target=call, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_concurrent_calls_share_one_computation():
+    """
+    Test identical concurrent calls run the function once and all get its result.
+    """
+    group = SingleFlight('test')
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return {'courses': [1, 2, 3]}
+
+    results, errors = run_concurrently(5, lambda: group.do('catalog', compute))
+
+    assert len(calls) == 1
+    assert errors == [None] * 5
+    assert all(result == {'courses': [1, 2, 3]} for result in results)
+
+
+def test_waiters_receive_the_leaders_error():
+    """
+    Test a failing computation is raised in every coalesced caller, and the next call runs again.
+    """
+    group = SingleFlight('test')
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        raise RuntimeError('database unavailable')
+
+    _, errors = run_concurrently(3, lambda: group.do('stats', compute))
+
+    assert len(calls) == 1
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    with pytest.raises(RuntimeError):
+        group.do('stats', compute)
+    assert len(calls) == 2
+
+
+def test_different_keys_and_later_calls_are_not_coalesced():
+    """
+    Test only in-flight calls with the same key are shared; nothing is cached afterwards.
+    """
+    group = SingleFlight('test')
+    calls = []
+
+    def compute(value):
+        calls.append(value)
+        return value
+
+    assert group.do('a', lambda: compute('a')) == 'a'
+    assert group.do('a', lambda: compute('a')) == 'a'
+    assert group.do('b', lambda: compute('b')) == 'b'
+    assert calls == ['a', 'a', 'b']
+
+
+def test_slow_flight_waiters_compute_after_timeout():
+    """
+    Test a waiter stops waiting for a flight that takes longer than its timeout.
+    """
+    group = SingleFlight('test')
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return 'done'
+
+    results, _ = run_concurrently(2, lambda: group.do('slow', compute, timeout=0.01))
+
+    assert results == ['done', 'done']
+    assert len(calls) == 2
+
+
+def test_public_catalog_requests_are_coalesced(client, mock_mysql):
+    """
+    Test concurrent /courses/public requests run the catalog query once and get identical responses.
+    """
+    cursor = mock_mysql.connection.cursor.return_value
+
+    def slow_fetchall():
+        time.sleep(0.05)
+        return [{'id': 1, 'name': 'Excel basics'}]
+
+    cursor.fetchall.side_effect = slow_fetchall
+
+    # One test client per thread; the fixture's client keeps its own context stack
+    results, errors = run_concurrently(4, lambda: client.application.test_client().get('/courses/public'))
+
+    assert errors == [None] * 4
+    assert cursor.execute.call_count == 1
+    assert {response.status_code for response in results} == {200}
+    assert all(response.get_json() == [{'id': 1, 'name': 'Excel basics'}] for response in results)
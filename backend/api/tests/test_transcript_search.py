@@ -0,0 +1,143 @@
+import numpy as np
+import pytest
+from flask_jwt_extended import create_access_token
+from utils import transcript_search
+from utils.transcript_search import (best_chunk_per_tutorial, chunk_transcript, embedding_batches, pack_vector,
+                                     parse_cues, unpack_vector)
+
+TRANSCRIPT = """WEBVTT
+
+00:00:00.000 --> 00:00:04.000
+Welcome to this tutorial on passwords.
+
+NOTE speaker changes here
+
+00:00:04.150 --> 00:00:09.000
+A strong password is long
+and hard to guess.
+
+01:00:09.150 --> 01:00:12.000
+Use a password manager to remember them."""
+
+
+@pytest.fixture()
+def auth_headers(client):
+    with client.application.app_context():
+        token = create_access_token(identity="1")
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_parse_cues_keeps_text_offsets_and_start_times():
+    """
+    Test cues are read with their offset in the transcript and start time, skipping header and notes.
+    """
+    cues = parse_cues(TRANSCRIPT)
+
+    assert [(start, text) for _, start, text in cues] == [
+        (0.0, 'Welcome to this tutorial on passwords.'),
+        (4.15, 'A strong password is long and hard to guess.'),
+        (3609.15, 'Use a password manager to remember them.'),
+    ]
+    assert [TRANSCRIPT[offset:offset + 12] for offset, _, _ in cues] == ['00:00:00.000', '00:00:04.150', '01:00:09.150']
+
+    crlf = TRANSCRIPT.replace('\n', '\r\n')
+    assert [crlf[offset:offset + 12] for offset, _, _ in parse_cues(crlf)] == [
+        '00:00:00.000', '00:00:04.150', '01:00:09.150']
+
+
+def test_chunks_overlap_by_one_cue_and_plain_text_is_supported():
+    """
+    Test chunks hold whole cues up to max_chars, each repeating the previous chunk's last cue.
+    """
+    chunks = chunk_transcript(TRANSCRIPT, max_chars=90)
+
+    assert [chunk['text'] for chunk in chunks] == [
+        'Welcome to this tutorial on passwords. A strong password is long and hard to guess.',
+        'A strong password is long and hard to guess. Use a password manager to remember them.',
+    ]
+    assert chunks[1]['start_seconds'] == 4.15
+
+    plain = chunk_transcript('First paragraph.\n\nSecond paragraph.', max_chars=10)
+    assert [(chunk['start_offset'], chunk['start_seconds']) for chunk in plain] == [(0, None), (18, None)]
+
+
+def test_embedding_batches_are_bounded_by_count_and_size():
+    """
+    Test batches respect both the input count and character limits, keeping chunk order.
+    """
+    chunks = [{'text': 'x' * size} for size in (10, 10, 10, 25, 5)]
+
+    batches = list(embedding_batches(chunks, max_inputs=2, max_chars=30))
+
+    assert [[len(chunk['text']) for chunk in batch] for batch in batches] == [[10, 10], [10], [25, 5]]
+
+
+def test_vectors_round_trip_as_float32():
+    vector = [0.25, -1.5, 3.0]
+
+    assert len(pack_vector(vector)) == 12
+    assert unpack_vector(pack_vector(vector)).tolist() == vector
+
+
+def test_best_chunk_per_tutorial():
+    """
+    Test each tutorial is returned once, with its best chunk, even when one tutorial has the top chunks.
+    """
+    scores = np.array([0.9, 0.95, 0.8, 0.1, 0.5])
+    tutorial_ids = [7, 7, 7, 8, 9]
+
+    assert best_chunk_per_tutorial(scores, tutorial_ids, k=2) == {7: 1, 9: 4}
+    assert best_chunk_per_tutorial(scores, tutorial_ids, k=5) == {7: 1, 9: 4, 8: 3}
+
+
+def test_index_only_embeds_changed_transcripts(client, mock_mysql, mocker):
+    """
+    Test unchanged tutorials are skipped, changed ones re-embedded and removed ones dropped.
+    """
+    embed_texts = mocker.patch('utils.embedding_utils.embed_texts', side_effect=lambda texts: [[1.0, 0.0]] * len(texts))
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchone.side_effect = [{'locked': 1}, {'video_transcript': TRANSCRIPT, 'transcript_hash': 'new'}]
+    cursor.fetchall.side_effect = [
+        [{'id': 1, 'transcript_hash': 'same'}, {'id': 2, 'transcript_hash': 'new'}],
+        [{'tutorial_id': 1, 'transcript_hash': 'same'}, {'tutorial_id': 2, 'transcript_hash': 'old'},
+         {'tutorial_id': 3, 'transcript_hash': 'gone'}],
+    ]
+
+    with client.application.app_context():
+        summary = transcript_search.index_transcripts()
+
+    assert summary == {'tutorials_indexed': 1, 'tutorials_removed': 1, 'chunks_written': 1}
+    embed_texts.assert_called_once()
+    statements = [call.args for call in cursor.execute.call_args_list]
+    assert ('DELETE FROM tutorial_transcript_chunks WHERE tutorial_id IN (%s)', [3]) in statements
+    rows = cursor.executemany.call_args.args[1]
+    assert [row[:5] for row in rows] == [(2, 0, 'new', 8, 0.0)]
+    assert statements[-1][0] == 'SELECT RELEASE_LOCK(%s)'
+
+
+def test_search_returns_best_tutorials_with_offsets(client, mock_mysql, mocker, auth_headers):
+    """
+    Test GET /search/tutorials ranks tutorials by their best chunk and points into the transcript.
+    """
+    mocker.patch('utils.embedding_utils.get_embedding', return_value=[1.0, 0.0])
+    cursor = mock_mysql.connection.cursor.return_value
+    cursor.fetchone.return_value = {'chunks': 3, 'last_id': 3}
+    cursor.fetchall.side_effect = [
+        [
+            {'tutorial_id': 1, 'title': 'Passwords', 'start_offset': 0, 'start_seconds': None,
+             'text': 'intro', 'vector': pack_vector([0.2, 1.0])},
+            {'tutorial_id': 1, 'title': 'Passwords', 'start_offset': 120, 'start_seconds': 4.15,
+             'text': 'password managers', 'vector': pack_vector([1.0, 0.1])},
+            {'tutorial_id': 2, 'title': 'Teams', 'start_offset': 40, 'start_seconds': 2.0,
+             'text': 'meetings', 'vector': pack_vector([0.5, 0.5])},
+        ],
+        [{'tutorial_id': 1, 'course_id': 4}],
+    ]
+
+    res = client.get('/search/tutorials?q=password manager&k=5', headers=auth_headers)
+    body = res.get_json()
+
+    assert res.status_code == 200
+    assert [(r['tutorial_id'], r['course_id'], r['start_offset'], r['start_seconds']) for r in body] == [
+        (1, 4, 120, 4.15), (2, None, 40, 2.0)]
+    assert client.get('/search/tutorials', headers=auth_headers).status_code == 400
@@ -0,0 +1,78 @@
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from flask import current_app
+
+
+"""
+ACTIVITY DATE RANGES
+
+Activity timestamps are stored as naive DATETIMEs in the database's timezone (DB_TIMEZONE).
+Queries filter them with plain range predicates (column >= start AND column < end) computed here,
+so MySQL can use the (user_id, timestamp) indexes instead of evaluating YEARWEEK()/DAYNAME() on
+every row of a user's history. Day bucketing happens in Python, in the user's own timezone.
+"""
+
+WEEK_DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def _zone(name, fallback):
+    try:
+        return ZoneInfo(name) if name else ZoneInfo(fallback)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo(fallback)
+
+
+def db_timezone():
+    return _zone(current_app.config.get('DB_TIMEZONE'), 'UTC')
+
+
+def user_timezone(name):
+    """
+    Returns the ZoneInfo for an IANA name from the user's preferences,
+    falling back to DEFAULT_USER_TIMEZONE when it is missing or unknown.
+    """
+    return _zone(name, current_app.config.get('DEFAULT_USER_TIMEZONE') or 'UTC')
+
+
+def to_db_time(moment):
+    """
+    Converts an aware datetime into a naive datetime in the database's timezone, for query parameters.
+    """
+    return moment.astimezone(db_timezone()).replace(tzinfo=None)
+
+
+def week_bounds(tz, now=None):
+    """
+    Start (Monday 00:00) and end (next Monday 00:00) of the current week in timezone tz,
+    as naive database-timezone datetimes for a half-open range predicate.
+    """
+    now = (now or datetime.now(timezone.utc)).astimezone(tz)
+    monday = (now - timedelta(days=now.weekday())).date()
+    start = datetime(monday.year, monday.month, monday.day, tzinfo=tz)
+    # Aware arithmetic is wall-clock, so the end keeps local midnight across a DST change
+    end = start + timedelta(days=7)
+    return to_db_time(start), to_db_time(end)
+
+
+def since(days, now=None):
+    """
+    Naive database-timezone datetime for "days ago", for rolling windows.
+    """
+    return to_db_time((now or datetime.now(timezone.utc)) - timedelta(days=days))
+
+
+def day_counts(timestamps, tz):
+    """
+    Counts database-timezone timestamps per weekday name in timezone tz. None values are skipped.
+    """
+    source_zone = db_timezone()
+    counts = Counter()
+    for moment in timestamps:
+        if moment is None:
+            continue
+        if isinstance(moment, str):
+            moment = datetime.fromisoformat(moment)
+        local = moment.replace(tzinfo=source_zone).astimezone(tz)
+        counts[WEEK_DAYS[local.weekday()]] += 1
+    return counts
@@ -0,0 +1,101 @@
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from utils import metrics
+
+
+"""
+SEMANTIC ANSWER CACHE
+
+Remembers recent chat-bot answers by the embedding of the question that produced them, so a
+near-duplicate question ("how do I log out?" / "how can I log out") is answered from memory instead
+of a new completion. Entries are scoped to the catalog version, since answers quote the catalog,
+expire after a TTL and are evicted least-recently-used beyond a size bound.
+
+Lookups compare against every live entry with one matrix product; at a few hundred entries of
+1536 floats that is well under a millisecond.
+"""
+
+cache_lookups = metrics.counter(
+    'skywise_chat_answer_cache_total', 'Semantic answer cache lookups for /chat, by outcome',
+    label_names=('outcome',))
+cache_entries = metrics.gauge('skywise_chat_answer_cache_entries', 'Answers held in the /chat semantic cache')
+cache_similarity = metrics.histogram(
+    'skywise_chat_answer_cache_similarity', 'Best cosine similarity found per /chat cache lookup',
+    [0.5, 0.7, 0.8, 0.85, 0.9, 0.92, 0.94, 0.96, 0.98, 1.0])
+
+
+def _unit(vector):
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class AnswerCache:
+    """
+    Thread-safe store of (question embedding -> answer) for one catalog version at a time.
+
+    An answer is whatever the caller needs to replay the reply, e.g. {'text': ..., 'course': ...}.
+    """
+
+    def __init__(self, threshold=0.92, ttl_seconds=3600, max_entries=500, clock=time.monotonic):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self.version = None
+        self._entries = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _set_version(self, version):
+        # Answers quote the catalog, so a new catalog version empties the cache
+        if version != self.version:
+            self._entries.clear()
+            self.version = version
+
+    def _purge_expired(self, now):
+        expired = [key for key, (_, _, stored_at) in self._entries.items() if now - stored_at > self.ttl_seconds]
+        for key in expired:
+            del self._entries[key]
+
+    def lookup(self, embedding, version):
+        """
+        Returns the cached answer for the most similar question at or above the threshold, or None.
+        """
+        with self._lock:
+            self._set_version(version)
+            self._purge_expired(self.clock())
+            cache_entries.set(len(self._entries))
+            if not self._entries:
+                cache_lookups.inc(outcome='miss')
+                return None
+
+            keys = list(self._entries)
+            vectors = np.stack([self._entries[key][0] for key in keys])
+            similarities = vectors @ _unit(embedding)
+            best = int(np.argmax(similarities))
+            cache_similarity.observe(float(similarities[best]))
+            if similarities[best] < self.threshold:
+                cache_lookups.inc(outcome='miss')
+                return None
+
+            self._entries.move_to_end(keys[best])
+            cache_lookups.inc(outcome='hit')
+            return self._entries[keys[best]][1]
+
+    def store(self, embedding, version, answer):
+        with self._lock:
+            if self.version is not None and version < self.version:
+                # Generated from a catalog that has since changed
+                return
+            self._set_version(version)
+            self._entries[self._next_id] = (_unit(embedding), answer, self.clock())
+            self._next_id += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            cache_entries.set(len(self._entries))
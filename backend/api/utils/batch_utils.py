@@ -0,0 +1,160 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from urllib.parse import urlsplit
+from flask import current_app, g, request
+from werkzeug.test import EnvironBuilder
+from utils import metrics
+from utils.db_metrics import merge_stats
+from utils.replica_utils import clear_read_only
+
+
+"""
+BATCHED GET REQUESTS
+
+POST /batch dispatches a list of GET sub-requests through the app's own URL map, so each one runs
+the same view (and the same @jwt_required check, against the caller's forwarded Authorization
+header) as if it had been requested directly. Sub-requests are split into at most
+BATCH_MAX_CONCURRENCY lanes: every lane runs its share in order inside one app context and so on
+one pooled connection, and lanes run concurrently. A batch small enough for one lane runs inline
+on the batch request's own connection.
+
+Only GET is accepted, since reads can be reordered and run concurrently safely (and /batch itself is
+POST-only, so batches cannot nest). Before/after request
+hooks (compression, request metrics) are not run for sub-requests; the batch response gets them once.
+"""
+
+SAFE_METHODS = {'GET'}
+
+subrequests_total = metrics.counter(
+    'skywise_batch_subrequests_total', 'Sub-requests dispatched through POST /batch',
+    label_names=('route', 'status'))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _batch_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Room for a few batches' lanes at once
+            _executor = ThreadPoolExecutor(
+                max_workers=current_app.config.get('BATCH_MAX_CONCURRENCY', 4) * 4,
+                thread_name_prefix='batch-lane'
+            )
+    return _executor
+
+
+def validate_batch(payload):
+    """
+    Returns (items, error): items is a list of {"id", "method", "path"}; error is a message or None.
+    """
+    if not isinstance(payload, dict) or not isinstance(payload.get('requests'), list):
+        return None, 'Body must be {"requests": [{"path": "/..."}, ...]}'
+    items = payload['requests']
+    limit = current_app.config.get('BATCH_MAX_REQUESTS', 20)
+    if not items:
+        return None, 'At least one request is required'
+    if len(items) > limit:
+        return None, f'At most {limit} requests per batch'
+
+    normalized = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not isinstance(item.get('path'), str) or not item['path'].startswith('/'):
+            return None, f'Request {index} needs a path starting with /'
+        normalized.append({
+            'id': item.get('id', index),
+            'method': str(item.get('method', 'GET')).upper(),
+            'path': item['path'],
+        })
+    return normalized, None
+
+
+def _subrequest_environ(item, authorization):
+    url = urlsplit(item['path'])
+    headers = {'Authorization': authorization} if authorization else {}
+    builder = EnvironBuilder(
+        path=url.path,
+        query_string=url.query,
+        method=item['method'],
+        headers=headers,
+        base_url=request.host_url,
+        environ_base={'REMOTE_ADDR': request.remote_addr or ''},
+    )
+    try:
+        return builder.get_environ()
+    finally:
+        builder.close()
+
+
+def _dispatch(flask_app, item, environ):
+    """
+    Runs one sub-request in a request context on the current app context. Returns its result entry.
+    """
+    start = time.perf_counter()
+    route = 'unmatched'
+    with flask_app.request_context(environ):
+        # Sub-requests in a lane share g; each view decides its own read routing
+        clear_read_only()
+        if request.url_rule is not None:
+            route = request.url_rule.rule
+        if item['method'] not in SAFE_METHODS:
+            response = flask_app.make_response(({'error': 'Only GET requests can be batched'}, 405))
+        else:
+            try:
+                try:
+                    rv = flask_app.dispatch_request()
+                except Exception as e:
+                    rv = flask_app.handle_user_exception(e)
+                response = flask_app.make_response(rv)
+            except Exception as e:
+                current_app.logger.exception(f"Batched request {item['path']} failed")
+                response = flask_app.make_response(({'error': 'Internal server error', 'message': str(e)}, 500))
+
+        body = response.get_json(silent=True) if response.is_json else response.get_data(as_text=True)
+
+    subrequests_total.inc(route=route, status=response.status_code)
+    return {
+        'id': item['id'],
+        'path': item['path'],
+        'status': response.status_code,
+        'body': body,
+        'duration_ms': round((time.perf_counter() - start) * 1000, 1),
+    }
+
+
+def _run_lane(flask_app, lane):
+    """
+    Runs a lane's sub-requests in order in one app context, so they share one pooled connection.
+    Returns ([(index, result)], db_stats).
+    """
+    with flask_app.app_context():
+        results = [(index, _dispatch(flask_app, item, environ)) for index, item, environ in lane]
+        return results, g.get('_db_stats')
+
+
+def run_batch(items):
+    """
+    Dispatches validated sub-requests and returns their results in request order.
+    """
+    flask_app = current_app._get_current_object()
+    authorization = request.headers.get('Authorization')
+    work = [(index, item, _subrequest_environ(item, authorization)) for index, item in enumerate(items)]
+
+    lane_count = max(1, min(current_app.config.get('BATCH_MAX_CONCURRENCY', 4), len(work)))
+    results = [None] * len(work)
+    if lane_count == 1:
+        for index, item, environ in work:
+            results[index] = _dispatch(flask_app, item, environ)
+        return results
+
+    lanes = [work[i::lane_count] for i in range(lane_count)]
+    executor = _batch_executor()
+    futures = [executor.submit(_run_lane, flask_app, lane) for lane in lanes]
+    for future in futures:
+        lane_results, db_stats = future.result()
+        merge_stats(db_stats)
+        for index, result in lane_results:
+            results[index] = result
+    return results
@@ -0,0 +1,21 @@
+from flask import current_app
+
+
+"""
+COURSE CATALOG VERSIONING
+"""
+
+def get_catalog_version():
+    """
+    Returns the current catalog version for this app.
+    Anything cached from the course catalog should be keyed by this value.
+    """
+    return current_app.extensions.setdefault('catalog_version', 1)
+
+
+def bump_catalog_version():
+    """
+    Invalidates catalog-derived caches. Call after any course is created, updated or deleted.
+    """
+    current_app.extensions['catalog_version'] = get_catalog_version() + 1
+    return current_app.extensions['catalog_version']
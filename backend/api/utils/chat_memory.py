@@ -0,0 +1,139 @@
+import math
+import threading
+from utils import metrics
+
+
+"""
+CHAT CONVERSATION MEMORY
+
+Each chat session keeps its recent turns verbatim and folds older ones into a running summary.
+The history sent to the model (summary plus recent turns, not counting the system prompt) is kept
+within a token budget on every call. Summarising is slow, so it runs in the background after a
+reply has been sent; until it finishes, the oldest turns over the budget are simply left out.
+
+Token counts are estimated at about four characters per token, which is close enough for
+budgeting; the exact prompt size of each call is taken from the API's usage figures.
+"""
+
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+TOKEN_BUCKETS = [250, 500, 1000, 2000, 4000, 8000, 16000, 32000]
+
+prompt_tokens = metrics.histogram(
+    'skywise_chat_prompt_tokens', 'Input tokens per /chat model call (from API usage)', TOKEN_BUCKETS)
+output_tokens = metrics.histogram(
+    'skywise_chat_output_tokens', 'Output tokens per /chat model call (from API usage)', TOKEN_BUCKETS)
+summaries_total = metrics.counter(
+    'skywise_chat_summaries_total', 'Background summaries of older /chat turns, by outcome',
+    label_names=('outcome',))
+
+
+def estimate_tokens(message):
+    return math.ceil(len(message['content']) / CHARS_PER_TOKEN) + MESSAGE_OVERHEAD_TOKENS
+
+
+def record_usage(response):
+    """
+    Records the prompt and output tokens of a model response. Returns (input_tokens, output_tokens).
+    """
+    usage = getattr(response, 'usage', None)
+    if usage is None:
+        return None, None
+    prompt_tokens.observe(usage.input_tokens)
+    output_tokens.observe(usage.output_tokens)
+    return usage.input_tokens, usage.output_tokens
+
+
+class ConversationMemory:
+    """
+    One session's chat history.
+
+    summarize(previous_summary, messages) must return the new summary text; it is called from
+    compact() on a background task started with spawn(fn).
+    """
+
+    def __init__(self, system_prompt, summarize, spawn, token_budget=1200, keep_recent=4):
+        self.system_prompt = system_prompt
+        self.summarize = summarize
+        self.spawn = spawn
+        self.token_budget = token_budget
+        self.keep_recent = keep_recent
+        self.summary = ''
+        self.turns = []
+        self._lock = threading.Lock()
+        self._summarizing = False
+
+    def add(self, role, content):
+        with self._lock:
+            self.turns.append({'role': role, 'content': content})
+
+    def _summary_message(self):
+        return {'role': 'system', 'content': f'Summary of the conversation so far: {self.summary}'}
+
+    def history_tokens(self):
+        with self._lock:
+            tokens = sum(estimate_tokens(turn) for turn in self.turns)
+            return tokens + (estimate_tokens(self._summary_message()) if self.summary else 0)
+
+    def messages(self):
+        """
+        System prompt, summary and as many of the most recent turns as fit the token budget
+        (always at least the latest one).
+        """
+        with self._lock:
+            budget = self.token_budget
+            header = [{'role': 'system', 'content': self.system_prompt}]
+            if self.summary:
+                summary = self._summary_message()
+                header.append(summary)
+                budget -= estimate_tokens(summary)
+
+            recent = []
+            for turn in reversed(self.turns):
+                budget -= estimate_tokens(turn)
+                if budget < 0 and recent:
+                    break
+                recent.append(turn)
+            return header + recent[::-1]
+
+    def compact(self):
+        """
+        When the history is over budget, starts a background summary of the oldest turns, keeping
+        at least keep_recent turns and bringing the rest down to half the budget. Call it after
+        the reply has been sent.
+        """
+        with self._lock:
+            if self._summarizing:
+                return False
+            tokens = [estimate_tokens(turn) for turn in self.turns]
+            if sum(tokens) <= self.token_budget or len(self.turns) <= self.keep_recent:
+                return False
+
+            remaining = sum(tokens)
+            fold = 0
+            while fold < len(self.turns) - self.keep_recent and remaining > self.token_budget // 2:
+                remaining -= tokens[fold]
+                fold += 1
+            folded = self.turns[:fold]
+            previous = self.summary
+            self._summarizing = True
+
+        self.spawn(lambda: self._fold(previous, folded))
+        return True
+
+    def _fold(self, previous, folded):
+        try:
+            summary = self.summarize(previous, folded)
+        except Exception as e:
+            summaries_total.inc(outcome='error')
+            print(f"Error summarising chat history: {str(e)}")
+            with self._lock:
+                self._summarizing = False
+            return
+
+        with self._lock:
+            # Turns are only ever appended, so the folded ones are still at the front
+            self.turns = self.turns[len(folded):]
+            self.summary = summary
+            self._summarizing = False
+        summaries_total.inc(outcome='ok')
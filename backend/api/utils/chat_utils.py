@@ -0,0 +1,104 @@
+import json
+import threading
+import time
+from utils import metrics
+
+
+"""
+CHAT STREAMING HELPERS
+"""
+
+chat_deltas_total = metrics.counter(
+    'skywise_chat_deltas_total', 'Text deltas received from the model for /chat')
+chat_frames_total = metrics.counter(
+    'skywise_chat_frames_total', 'Socket frames emitted for streamed /chat text')
+
+
+class DeltaBuffer:
+    """
+    Coalesces a chat session's streamed text deltas into fewer socket frames.
+
+    Deltas are joined in arrival order and emitted once flush_chars characters are buffered or the
+    oldest buffered delta is flush_ms old. When the stream pauses, schedule(delay_seconds, fn) is
+    used to emit the buffered text flush_ms after it arrived without waiting for the next delta;
+    without a schedule the age is only checked as deltas arrive. The caller must flush() when the
+    response completes or fails. flush_ms <= 0 emits every delta on its own.
+    """
+
+    def __init__(self, emit, flush_ms=50, flush_chars=64, clock=time.monotonic, schedule=None):
+        self.emit = emit
+        self.flush_ms = flush_ms
+        self.flush_chars = flush_chars
+        self.clock = clock
+        self.schedule = schedule
+        self._parts = []
+        self._size = 0
+        self._first_at = None
+        # Bumped by every flush, so a scheduled flush for text already sent does nothing
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def add(self, delta):
+        if not delta:
+            return
+        chat_deltas_total.inc()
+        with self._lock:
+            first = not self._parts
+            if first:
+                self._first_at = self.clock()
+            self._parts.append(delta)
+            self._size += len(delta)
+
+            if (self.flush_ms <= 0 or self._size >= self.flush_chars
+                    or (self.clock() - self._first_at) * 1000 >= self.flush_ms):
+                self._flush()
+                return
+            generation = self._generation
+
+        if first and self.schedule is not None:
+            self.schedule(self.flush_ms / 1000, lambda: self._flush_if_pending(generation))
+
+    def _flush_if_pending(self, generation):
+        with self._lock:
+            if self._generation == generation:
+                self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._parts:
+            return
+        text = ''.join(self._parts)
+        self._parts = []
+        self._size = 0
+        self._first_at = None
+        self._generation += 1
+        chat_frames_total.inc()
+        self.emit(text)
+
+
+def tool_call_course_ids(output, tool_name='courseInput'):
+    """
+    Course ids from the model's tool calls in a response's output items, in call order.
+    Calls with arguments that do not parse are skipped.
+    """
+    course_ids = []
+    for item in output:
+        if getattr(item, 'type', None) != 'function_call' or item.name != tool_name:
+            continue
+        try:
+            course_ids.append(int(json.loads(item.arguments, strict=False)['course_id']))
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Ignoring {tool_name} call with arguments {item.arguments!r}: {str(e)}")
+    return course_ids
+
+
+def describe_courses(courses):
+    """
+    Short Markdown explanation of courses, for a tool-call-only reply that came without any text.
+    """
+    return '\n\n'.join(f"**{course['name']}** ({course['difficulty']}): {course['description']}"
+                         for course in courses)
+
@@ -0,0 +1,91 @@
+import threading
+import time
+from utils import metrics
+
+
+"""
+CIRCUIT BREAKER
+
+Stops calling an upstream that keeps failing, so requests get an immediate CircuitOpen (and the
+caller's fallback) instead of each waiting out a timeout.
+
+closed     calls go through; failure_threshold consecutive failures open the circuit
+open       calls fail fast with CircuitOpen until reset_seconds have passed
+half_open  one probe call goes through while others still fail fast; its success closes the
+           circuit, its failure opens it for another reset_seconds
+"""
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+circuit_state = metrics.gauge(
+    'skywise_circuit_state', 'Circuit breaker state (0 closed, 1 half-open, 2 open)', label_names=('name',))
+circuit_transitions_total = metrics.counter(
+    'skywise_circuit_transitions_total', 'Circuit breaker state changes, by new state', label_names=('name', 'state'))
+circuit_rejections_total = metrics.counter(
+    'skywise_circuit_rejections_total', 'Calls failed fast by an open circuit breaker', label_names=('name',))
+
+
+class CircuitOpen(Exception):
+    """
+    Raised instead of calling the upstream while the circuit is open.
+    """
+
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold=5, reset_seconds=30, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+        circuit_state.set(STATE_VALUES[CLOSED], name=name)
+
+    def _transition(self, state):
+        if state != self.state:
+            self.state = state
+            circuit_transitions_total.inc(name=self.name, state=state)
+            circuit_state.set(STATE_VALUES[state], name=self.name)
+
+    def _before_call(self):
+        with self._lock:
+            if self.state == OPEN and self.clock() - self.opened_at >= self.reset_seconds:
+                self._transition(HALF_OPEN)
+            if self.state == OPEN or (self.state == HALF_OPEN and self._probing):
+                circuit_rejections_total.inc(name=self.name)
+                raise CircuitOpen(f'{self.name} circuit is open')
+            if self.state == HALF_OPEN:
+                self._probing = True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            self._transition(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+                self._transition(OPEN)
+
+    def call(self, fn):
+        """
+        Runs fn() unless the circuit is open. Any exception from fn counts as a failure and is re-raised.
+        """
+        self._before_call()
+        try:
+            result = fn()
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
@@ -0,0 +1,155 @@
+from collections import OrderedDict
+from functools import wraps
+import gzip
+import threading
+from flask import Response, current_app, request
+from utils.catalog_utils import get_catalog_version
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+
+"""
+RESPONSE COMPRESSION
+"""
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/x-ndjson',
+    'text/csv',
+    'text/html',
+    'text/plain',
+    'text/vtt',
+}
+
+
+def negotiate_encoding():
+    """
+    Picks the best content encoding the client accepts: br, then gzip, else None.
+    """
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress(data, encoding):
+    """
+    Compresses bytes with the given encoding using the configured level.
+    """
+    if encoding == 'br':
+        return brotli.compress(data, quality=current_app.config.get('COMPRESS_BR_LEVEL', 4))
+    return gzip.compress(data, compresslevel=current_app.config.get('COMPRESS_GZIP_LEVEL', 6))
+
+
+def _set_encoded_body(response, data, encoding):
+    response.set_data(data)
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    # A strong ETag identifies exact bytes, so each encoding of the body gets its own
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f'{etag}-{encoding}')
+
+
+def compress_response(response):
+    """
+    after_request hook: compresses eligible buffered responses above COMPRESS_MIN_SIZE bytes.
+    Streaming responses, already encoded responses and non-text payloads are passed through.
+    A strong ETag gets the encoding appended ("<etag>-gzip"), so each body has its own validator.
+    """
+    if not current_app.config.get('COMPRESS_ENABLED', True):
+        return response
+    if response.is_streamed or response.direct_passthrough:
+        return response
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return response
+    if 'Content-Encoding' in response.headers or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+
+    response.vary.add('Accept-Encoding')
+    if response.content_length is not None and response.content_length < current_app.config.get('COMPRESS_MIN_SIZE', 1024):
+        return response
+
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+
+    _set_encoded_body(response, compress(response.get_data(), encoding), encoding)
+    if response.get_etag()[0]:
+        # The view compared If-None-Match against the unencoded ETag; check the encoded one too
+        response.make_conditional(request)
+    return response
+
+
+def _catalog_cache():
+    cache = current_app.extensions.get('precompressed_catalog')
+    if cache is None:
+        cache = current_app.extensions.setdefault('precompressed_catalog', {
+            'version': None, 'entries': OrderedDict(), 'lock': threading.Lock(),
+        })
+    return cache
+
+
+def precompressed_catalog(query_params=()):
+    """
+    Decorator for catalog endpoints whose output only changes when the catalog does.
+
+    The first response for each (path, allowed query params, encoding) is stored already compressed
+    and replayed for later requests without running the view or compressing again. It is compressed
+    under the same rules as compress_response: not at all when COMPRESS_ENABLED is off, and only
+    when it is at least COMPRESS_MIN_SIZE bytes. Other query
+    params are ignored, so they cannot create new entries. Only 200 responses are cached, the cache
+    is emptied when the catalog version moves on, and it holds at most COMPRESS_CATALOG_CACHE_ENTRIES
+    responses, evicting the least recently used.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            cache = _catalog_cache()
+            version = get_catalog_version()
+            encoding = negotiate_encoding() if current_app.config.get('COMPRESS_ENABLED', True) else None
+            key = (request.path, tuple(request.args.get(name) for name in query_params), encoding)
+
+            with cache['lock']:
+                if cache['version'] != version:
+                    cache['entries'].clear()
+                    cache['version'] = version
+                entry = cache['entries'].get(key)
+                if entry is not None:
+                    cache['entries'].move_to_end(key)
+
+            if entry is not None:
+                response = Response(entry['body'], status=200, mimetype=entry['mimetype'])
+                if entry['encoding']:
+                    response.headers['Content-Encoding'] = entry['encoding']
+                response.vary.add('Accept-Encoding')
+                return response
+
+            response = current_app.make_response(f(*args, **kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+
+            body = response.get_data()
+            if encoding and len(body) < current_app.config.get('COMPRESS_MIN_SIZE', 1024):
+                encoding = None
+            if encoding:
+                body = compress(body, encoding)
+                _set_encoded_body(response, body, encoding)
+
+            with cache['lock']:
+                # Skip storing if the catalog changed while the view ran
+                if cache['version'] == version:
+                    cache['entries'][key] = {'body': body, 'mimetype': response.mimetype, 'encoding': encoding}
+                    cache['entries'].move_to_end(key)
+                    while len(cache['entries']) > current_app.config.get('COMPRESS_CATALOG_CACHE_ENTRIES', 64):
+                        cache['entries'].popitem(last=False)
+            return response
+
+        return decorated_function
+
+    return decorator
@@ -16,8 +16,9 @@ def get_unenrolled_courses(user_id):
     cursor.execute("SELECT c.* FROM courses c LEFT JOIN user_course_progress up ON c.id = up.course_id AND up.user_id = %s  WHERE up.course_id IS NULL", (user_id,))
     
     courses = cursor.fetchall()
+    cursor.close()
 
-    return courses, 200 
+    return courses, 200
 
 
     
@@ -77,16 +78,61 @@ def calculate_course_progress(cursor, course_id, user_id):
     passed_quizzes_result = cursor.fetchone()
     passed_quizzes = passed_quizzes_result['count'] if passed_quizzes_result else 0
     
+    return progress_percentage(total_tutorials, total_quizzes, completed_tutorials, passed_quizzes)
+
+
+def progress_percentage(total_tutorials, total_quizzes, completed_tutorials, passed_quizzes):
+    """
+    (completed_tutorials + passed_quizzes) / (total_tutorials + total_quizzes) * 100, rounded to 2 places.
+    """
     total_items = total_tutorials + total_quizzes
     completed_items = completed_tutorials + passed_quizzes
-    
+
     if total_items == 0:
         return 0.0
-    
+
     progress = (completed_items / total_items) * 100
     return round(progress, 2)
 
 
+def calculate_courses_progress(cursor, course_ids, user_id):
+    """
+        Batched calculate_course_progress: the user's progress in every course of course_ids
+        from a single grouped query instead of four COUNTs per course.
+
+        Returns:
+            dict: {course_id: progress percentage}, 0.0 for courses without tutorials or quizzes
+        """
+    course_ids = list(course_ids)
+    if not course_ids:
+        return {}
+
+    placeholders = ', '.join(['%s'] * len(course_ids))
+    cursor.execute(f"""
+        SELECT
+            ct.course_id,
+            COUNT(DISTINCT ct.tutorial_id) AS total_tutorials,
+            COUNT(DISTINCT q.id) AS total_quizzes,
+            COUNT(DISTINCT CASE WHEN utp.completed = TRUE THEN ct.tutorial_id END) AS completed_tutorials,
+            COUNT(DISTINCT passed.quiz_id) AS passed_quizzes
+        FROM course_tutorials ct
+        LEFT JOIN quizzes q ON q.tutorial_id = ct.tutorial_id
+        LEFT JOIN user_tutorial_progress utp
+            ON utp.tutorial_id = ct.tutorial_id AND utp.user_id = %s
+        LEFT JOIN user_quiz_results passed
+            ON passed.quiz_id = q.id AND passed.user_id = %s AND passed.score >= 80
+        WHERE ct.course_id IN ({placeholders})
+        GROUP BY ct.course_id
+    """, (user_id, user_id, *course_ids))
+
+    progress = {course_id: 0.0 for course_id in course_ids}
+    for row in cursor.fetchall():
+        progress[row['course_id']] = progress_percentage(
+            row['total_tutorials'], row['total_quizzes'], row['completed_tutorials'], row['passed_quizzes']
+        )
+    return progress
+
+
 def get_public_courses():
     """
     Returns all courses without authentication for landing page display.
@@ -110,12 +156,11 @@ def get_public_courses():
     return courses
 
 
-def get_courses():
+def get_courses(user_id):
     """
     Returns all courses with summary data suitable for a list view.
     Includes progress percentage for each course based on user's completed tutorials and submitted quizzes.
     """
-    user_id = get_jwt_identity()
     cursor = app.mysql.connection.cursor()
     cursor.execute("""
                     SELECT
@@ -131,12 +176,13 @@ def get_courses():
                     """)
     courses = cursor.fetchall()
 
-    # Calculate fresh progress for each course based on completed tutorials and quizzes
+    # Calculate fresh progress for every course in one query, based on completed tutorials and quizzes
+    progress = calculate_courses_progress(cursor, [course['id'] for course in courses], user_id)
     for course in courses:
-        course['progress'] = calculate_course_progress(cursor, course['id'], user_id)
+        course['progress'] = progress.get(course['id'], 0.0)
 
     cursor.close()
-    return jsonify(courses), 200
+    return courses, 200
 
 
 def get_course(course_id):
@@ -161,46 +207,34 @@ def get_course(course_id):
     """
     cursor = app.mysql.connection.cursor()
 
-    # Fetch the main course details
+    # Course details with prerequisites and requirements aggregated into JSON arrays
     cursor.execute("""
-        SELECT id, name, description, difficulty, summary,
-               learning_objectives, duration_min_minutes, duration_max_minutes
-        FROM courses
-        WHERE id = %s
+        SELECT c.id, c.name, c.description, c.difficulty, c.summary,
+               c.learning_objectives, c.duration_min_minutes, c.duration_max_minutes,
+               (SELECT JSON_ARRAYAGG(JSON_OBJECT('id', pc.id, 'name', pc.name))
+                FROM course_prerequisites AS cp
+                INNER JOIN courses AS pc ON cp.prerequisite_course_id = pc.id
+                WHERE cp.course_id = c.id) AS prerequisites,
+               (SELECT JSON_ARRAYAGG(cr.requirement_text)
+                FROM course_requirements AS cr
+                WHERE cr.course_id = c.id) AS requirements
+        FROM courses AS c
+        WHERE c.id = %s
     """, (course_id,))
     course = cursor.fetchone()
 
     if not course:
         cursor.close()
         return jsonify({'error': 'Course not found'}), 404
-        
-    # Parse the learning_objectives string into a list
-    if course.get('learning_objectives'):
-        course['learning_objectives'] = json.loads(course['learning_objectives'])
-    else:
-        course['learning_objectives'] = []
 
-    # Fetch the prerequisites (links to other courses)
-    cursor.execute("""
-        SELECT c.id, c.name
-        FROM course_prerequisites AS cp
-        INNER JOIN courses AS c ON cp.prerequisite_course_id = c.id
-        WHERE cp.course_id = %s
-    """, (course_id,))
-    course['prerequisites'] = cursor.fetchall()
+    # JSON columns arrive as strings; NULL means no rows were aggregated
+    for field in ('learning_objectives', 'prerequisites', 'requirements'):
+        value = course.get(field)
+        course[field] = json.loads(value) if isinstance(value, (str, bytes)) else (value or [])
 
-    # Fetch the text-based requirements
-    cursor.execute("""
-        SELECT requirement_text
-        FROM course_requirements
-        WHERE course_id = %s
-    """, (course_id,))
-    requirements_data = cursor.fetchall()
-    course['requirements'] = [item['requirement_text'] for item in requirements_data]
-    
     # Calculate and add progress
     user_id = get_jwt_identity()
-    course['progress'] = calculate_course_progress(cursor, course_id, user_id)
+    course['progress'] = calculate_courses_progress(cursor, [course_id], user_id)[course_id]
 
     cursor.close()
     return jsonify(course), 200
@@ -234,12 +268,13 @@ def get_course_tutorials(course_id):
 
 def get_tutorial(course_id, tutorial_id):
     """
-    Returns a specific tutorial for a specific course, including quiz completion status
+    Returns a specific tutorial for a specific course, including quiz completion status.
+    The transcript itself is not included, only its length; fetch it from get_tutorial_transcript.
     """
     user_id = get_jwt_identity()
     cursor = app.mysql.connection.cursor()
 
-    # Get tutorial details
+    # Tutorial details with the user's quiz and completion status
     cursor.execute(
         """
         SELECT
@@ -250,46 +285,104 @@ def get_tutorial(course_id, tutorial_id):
             t.video_url,
             t.category,
             t.created_at,
-            t.video_transcript
+            COALESCE(CHAR_LENGTH(t.video_transcript), 0) AS transcript_length,
+            EXISTS (
+                SELECT 1
+                FROM user_quiz_results uqr
+                INNER JOIN quizzes q ON uqr.quiz_id = q.id
+                WHERE q.tutorial_id = t.id AND uqr.user_id = %s
+            ) AS has_completed_quiz,
+            (
+                SELECT utp.completed
+                FROM user_tutorial_progress utp
+                WHERE utp.user_id = %s AND utp.tutorial_id = t.id
+            ) AS is_completed
         FROM course_tutorials AS ct
         INNER JOIN tutorials AS t ON ct.tutorial_id = t.id
         WHERE ct.course_id = %s AND t.id = %s
         """,
-        (course_id, tutorial_id,),
+        (user_id, user_id, course_id, tutorial_id),
     )
     tutorial = cursor.fetchone()
+    cursor.close()
 
     if not tutorial:
-        cursor.close()
         return jsonify({'error': 'Tutorial not found'}), 404
 
-    # Check if user has completed the quiz for this tutorial
-    cursor.execute(
-        """
-        SELECT COUNT(DISTINCT uqr.quiz_id) as quiz_completed_count
-        FROM user_quiz_results uqr
-        INNER JOIN quizzes q ON uqr.quiz_id = q.id
-        WHERE q.tutorial_id = %s AND uqr.user_id = %s
-        """,
-        (tutorial_id, user_id),
-    )
-    quiz_result = cursor.fetchone()
-    tutorial['has_completed_quiz'] = quiz_result['quiz_completed_count'] > 0 if quiz_result else False
+    tutorial['has_completed_quiz'] = bool(tutorial.get('has_completed_quiz'))
+    tutorial['is_completed'] = bool(tutorial.get('is_completed'))
+
+    return jsonify(tutorial), 200
+
+
+TRANSCRIPT_PAGE_SIZE = 16000
+TRANSCRIPT_MAX_PAGE_SIZE = 64000
 
-    # Check if user has completed this tutorial
+
+def get_tutorial_transcript(course_id, tutorial_id):
+    """
+    Returns one page of a tutorial's transcript, selected by character offset.
+
+    Query parameters:
+        offset: character offset to start from (default 0)
+        limit:  maximum characters to return (default 16000, max 64000)
+
+    Pages end on a cue boundary (blank line) where possible so WebVTT segments are never split.
+    Responses carry an ETag of the full transcript, so unchanged pages are answered with 304.
+
+    Response:
+        {
+            "tutorial_id": number,
+            "offset": number,
+            "total_length": number,
+            "next_offset": number | null,
+            "text": string
+        }
+    """
+    offset = request.args.get('offset', 0, type=int)
+    limit = request.args.get('limit', TRANSCRIPT_PAGE_SIZE, type=int)
+    if offset < 0 or limit <= 0:
+        return jsonify({'error': 'offset must be >= 0 and limit must be > 0'}), 400
+    limit = min(limit, TRANSCRIPT_MAX_PAGE_SIZE)
+
+    cursor = app.mysql.connection.cursor()
     cursor.execute(
         """
-        SELECT completed
-        FROM user_tutorial_progress
-        WHERE user_id = %s AND tutorial_id = %s
+        SELECT
+            COALESCE(CHAR_LENGTH(t.video_transcript), 0) AS total_length,
+            MD5(COALESCE(t.video_transcript, '')) AS transcript_hash,
+            SUBSTRING(COALESCE(t.video_transcript, ''), %s, %s) AS text
+        FROM course_tutorials AS ct
+        INNER JOIN tutorials AS t ON ct.tutorial_id = t.id
+        WHERE ct.course_id = %s AND t.id = %s
         """,
-        (user_id, tutorial_id),
+        (offset + 1, limit, course_id, tutorial_id),
     )
-    progress_result = cursor.fetchone()
-    tutorial['is_completed'] = progress_result['completed'] if progress_result else False
-
+    page = cursor.fetchone()
     cursor.close()
-    return jsonify(tutorial), 200
+
+    if not page:
+        return jsonify({'error': 'Tutorial not found'}), 404
+
+    text = page['text'] or ''
+    total_length = page['total_length']
+    if offset + len(text) < total_length:
+        cue_end = text.rfind('\n\n')
+        if cue_end > 0:
+            text = text[:cue_end + 2]
+    end = offset + len(text)
+
+    response = jsonify({
+        'tutorial_id': tutorial_id,
+        'offset': offset,
+        'total_length': total_length,
+        'next_offset': end if end < total_length else None,
+        'text': text
+    })
+    response.set_etag(f"{page['transcript_hash']}-{offset}-{limit}")
+    response.headers['Cache-Control'] = 'private, max-age=300'
+    return response.make_conditional(request)
+
 
 def update_course_progress(course_id):
     """
@@ -0,0 +1,86 @@
+from flask import current_app
+import app
+from utils.activity_utils import WEEK_DAYS, day_counts, user_timezone, week_bounds
+
+
+def get_dashboard_stats(user_id):
+    """
+    Returns dashboard statistics for a user:
+    - Courses Completed
+    - Tutorials Watched
+    - Time Spent (approx. hours this week)
+    - Weekly Activity (M–S booleans)
+    """
+    try:
+        cursor = app.mysql.connection.cursor()
+
+        # ---------------------------
+        # Courses Completed, Tutorials Watched and the user's timezone
+        # ---------------------------
+        cursor.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM user_course_progress
+                 WHERE user_id = %s AND progress_percentage = 100) AS courses_completed,
+                (SELECT COUNT(*) FROM user_tutorial_progress
+                 WHERE user_id = %s AND completed = TRUE) AS tutorials_watched,
+                (SELECT JSON_UNQUOTE(JSON_EXTRACT(preferences, '$.timezone')) FROM user_preferences
+                 WHERE user_id = %s) AS timezone
+        """, (user_id, user_id, user_id))
+        result = cursor.fetchone() or {}
+        courses_completed = result.get('courses_completed') or 0
+        tutorials_watched = result.get('tutorials_watched') or 0
+        tz = user_timezone(result.get('timezone'))
+
+        # ---------------------------
+        # This week's activity (Monday to Sunday in the user's timezone)
+        # ---------------------------
+        # Plain range predicates so the (user_id, timestamp) indexes apply
+        week_start, week_end = week_bounds(tz)
+        cursor.execute("""
+            SELECT 'tutorial' AS source, completed_at AS activity_at
+            FROM user_tutorial_progress
+            WHERE user_id = %s AND completed = TRUE
+              AND completed_at >= %s AND completed_at < %s
+
+            UNION ALL
+
+            SELECT 'course' AS source, last_updated AS activity_at
+            FROM user_course_progress
+            WHERE user_id = %s AND progress_percentage = 100
+              AND last_updated >= %s AND last_updated < %s
+
+            UNION ALL
+
+            SELECT 'quiz' AS source, attempted_at AS activity_at
+            FROM user_quiz_results
+            WHERE user_id = %s
+              AND attempted_at >= %s AND attempted_at < %s
+        """, (user_id, week_start, week_end) * 3)
+        activity = cursor.fetchall()
+
+        cursor.close()
+
+        # ---------------------------
+        # Time Spent (approximation)
+        # ---------------------------
+        # We'll assume each completed tutorial takes ~5 minutes.
+        tutorials_completed_this_week = sum(1 for row in activity if row['source'] == 'tutorial')
+        total_minutes = tutorials_completed_this_week * 5  # assumed 5 minutes per tutorial
+        time_spent_hours = round(total_minutes / 60, 1)
+
+        # ---------------------------
+        # Weekly Activity (M–S)
+        # ---------------------------
+        activity_days = day_counts((row['activity_at'] for row in activity), tz)
+        weekly_activity = {day[:2].upper(): (day in activity_days) for day in WEEK_DAYS}
+
+        return {
+            "courses_completed": courses_completed,
+            "tutorials_watched": tutorials_watched,
+            "time_spent_hours": time_spent_hours,
+            "weekly_activity": weekly_activity
+        }, 200
+
+    except Exception as e:
+        current_app.logger.exception("Error in get_dashboard_stats")
+        return {"error": "Internal server error", "message": str(e)}, 500
@@ -0,0 +1,152 @@
+from collections import Counter as FingerprintCounter
+import re
+import time
+from flask import current_app, g, request
+from utils import metrics
+
+
+"""
+PER-REQUEST DATABASE INSTRUMENTATION
+"""
+
+QUERY_COUNT_BUCKETS = [1, 2, 3, 5, 10, 20, 50, 100, 250]
+DB_TIME_BUCKETS = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5]
+
+queries_per_request = metrics.histogram(
+    'skywise_db_queries_per_request', 'SQL statements executed per request',
+    QUERY_COUNT_BUCKETS, label_names=('route', 'method'))
+db_seconds_per_request = metrics.histogram(
+    'skywise_db_seconds_per_request', 'Time spent executing SQL per request',
+    DB_TIME_BUCKETS, label_names=('route', 'method'))
+n_plus_one_requests = metrics.counter(
+    'skywise_db_n_plus_one_total', 'Requests that repeated one statement more than DB_N_PLUS_ONE_THRESHOLD times',
+    label_names=('route', 'method'))
+
+_WHITESPACE = re.compile(r'\s+')
+_IN_LIST = re.compile(r'\(\s*%s(\s*,\s*%s)*\s*\)')
+_LITERAL = re.compile(r"'[^']*'|\b\d+\b")
+
+
+def fingerprint(sql):
+    """
+    Normalises a statement so repeated executions of the same query compare equal:
+    whitespace collapsed, inline literals replaced and IN (%s, %s, ...) lists folded.
+    """
+    sql = _WHITESPACE.sub(' ', sql).strip()
+    sql = _LITERAL.sub('?', sql)
+    return _IN_LIST.sub('(...)', sql)
+
+
+def _request_stats():
+    stats = g.get('_db_stats')
+    if stats is None:
+        stats = {'count': 0, 'seconds': 0.0, 'fingerprints': FingerprintCounter()}
+        g._db_stats = stats
+    return stats
+
+
+def record_query(sql, seconds):
+    """
+    Adds one executed statement to the current request's totals.
+    """
+    stats = _request_stats()
+    stats['count'] += 1
+    stats['seconds'] += seconds
+    stats['fingerprints'][fingerprint(sql)] += 1
+
+
+def merge_stats(stats):
+    """
+    Adds totals collected in another app context (e.g. a /home section worker) to the current request.
+    """
+    if not stats:
+        return
+    totals = _request_stats()
+    totals['count'] += stats['count']
+    totals['seconds'] += stats['seconds']
+    totals['fingerprints'].update(stats['fingerprints'])
+
+
+def add_server_timing(response, entry):
+    """
+    Appends one metric to the response's Server-Timing header.
+    """
+    existing = response.headers.get('Server-Timing')
+    response.headers['Server-Timing'] = f'{existing}, {entry}' if existing else entry
+
+
+class InstrumentedCursor:
+    """
+    Cursor proxy that times execute/executemany and records them against the current request.
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, query, args=None):
+        start = time.perf_counter()
+        try:
+            return self._cursor.execute(query, args)
+        finally:
+            record_query(query, time.perf_counter() - start)
+
+    def executemany(self, query, args):
+        start = time.perf_counter()
+        try:
+            return self._cursor.executemany(query, args)
+        finally:
+            record_query(query, time.perf_counter() - start)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cursor.close()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class InstrumentedConnection:
+    """
+    Connection proxy whose cursors are InstrumentedCursors. Everything else is delegated.
+    """
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._connection.cursor(*args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+def record_request(response):
+    """
+    after_request hook: publishes the request's query count and DB time, adds a Server-Timing
+    header and warns when one statement was repeated more than DB_N_PLUS_ONE_THRESHOLD times.
+    """
+    stats = g.get('_db_stats')
+    if stats is None:
+        return response
+
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    method = request.method
+
+    queries_per_request.observe(stats['count'], route=route, method=method)
+    db_seconds_per_request.observe(stats['seconds'], route=route, method=method)
+    add_server_timing(response, f"db;dur={stats['seconds'] * 1000:.1f};desc=\"{stats['count']} queries\"")
+
+    threshold = current_app.config.get('DB_N_PLUS_ONE_THRESHOLD', 5)
+    statement, repeats = stats['fingerprints'].most_common(1)[0] if stats['fingerprints'] else (None, 0)
+    if repeats > threshold:
+        n_plus_one_requests.inc(route=route, method=method)
+        current_app.logger.warning(
+            f"Possible N+1 on {method} {route}: statement ran {repeats} times "
+            f"({stats['count']} queries, {stats['seconds'] * 1000:.1f} ms): {statement[:200]}"
+        )
+    return response
@@ -0,0 +1,101 @@
+import threading
+from utils import metrics
+
+
+"""
+EMBEDDING MICRO-BATCHING
+
+Concurrent searches each need one short text embedded. Instead of one API request per text,
+EmbeddingBatcher collects the texts submitted within max_wait_ms of each other (up to max_batch)
+and embeds them in one multi-input request, handing each caller its own vector.
+
+There is no dispatcher thread: the first caller of a batch waits up to max_wait_ms and then sends
+it, unless a caller fills the batch first and sends it straight away. The others wait for the result.
+A failed request fails every caller in its batch with the same error.
+"""
+
+batch_size = metrics.histogram(
+    'skywise_embedding_batch_size', 'Texts per batched embeddings request', [1, 2, 4, 8, 16, 32, 64])
+batched_texts_total = metrics.counter(
+    'skywise_embedding_batched_texts_total', 'Texts submitted to the embedding batcher')
+
+
+class _Batch:
+    def __init__(self):
+        self.texts = []
+        self.positions = {}
+        self.results = None
+        self.error = None
+        self.done = threading.Event()
+
+    def add(self, text):
+        # The same text twice in one batch is embedded once
+        if text not in self.positions:
+            self.positions[text] = len(self.texts)
+            self.texts.append(text)
+        return self.positions[text]
+
+
+class EmbeddingBatcher:
+    """
+    embed_many(texts) must return one vector per text, in order.
+    """
+
+    def __init__(self, embed_many, max_wait_ms=5, max_batch=32, wait_timeout=30):
+        self.embed_many = embed_many
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch = max_batch
+        self.wait_timeout = wait_timeout
+        self._batch = None
+        self._lock = threading.Lock()
+
+    def _take(self, batch):
+        """
+        Detaches batch so no more texts join it. False if another caller already sent it.
+        """
+        with self._lock:
+            if self._batch is not batch:
+                return False
+            self._batch = None
+            return True
+
+    def _send(self, batch):
+        batch_size.observe(len(batch.texts))
+        try:
+            batch.results = self.embed_many(batch.texts)
+        except Exception as e:
+            batch.error = e
+        finally:
+            batch.done.set()
+
+    def embed(self, text):
+        """
+        Returns the embedding of text, sent in a batch with other concurrent callers' texts.
+        """
+        batched_texts_total.inc()
+        if self.max_wait <= 0 or self.max_batch <= 1:
+            return self.embed_many([text])[0]
+
+        with self._lock:
+            first = self._batch is None
+            if first:
+                self._batch = _Batch()
+            batch = self._batch
+            position = batch.add(text)
+            full = len(batch.texts) >= self.max_batch
+            if full:
+                self._batch = None
+
+        if full:
+            self._send(batch)
+        elif first:
+            # Returns early if another caller fills the batch and sends it meanwhile
+            batch.done.wait(self.max_wait)
+            if self._take(batch):
+                self._send(batch)
+
+        if not batch.done.wait(self.max_wait + self.wait_timeout):
+            raise TimeoutError('Timed out waiting for a batched embeddings request')
+        if batch.error is not None:
+            raise batch.error
+        return batch.results[position]
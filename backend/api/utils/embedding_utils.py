@@ -1,14 +1,37 @@
 import json
 from utils.courses_routes_utils import get_public_courses
-from openai import OpenAI
 import app
 import numpy as np
 from utils.embeddings_utils import cosine_similarity
+from flask import current_app
+from utils.singleflight import SingleFlight
+from utils.circuit_breaker import CircuitBreaker
+from utils.embedding_batcher import EmbeddingBatcher
+from utils.search_utils import get_course_index, reciprocal_rank_fusion
+from utils import metrics, openai_client
 import json
 
 COUNT_EMBEDDINGS_QUERY = "SELECT COUNT(*) as count FROM course_embedding"
 
-client = OpenAI()
+# Identical concurrent searches share one embeddings API call
+_embedding_flights = SingleFlight('get_embedding')
+
+course_searches_total = metrics.counter(
+    'skywise_course_searches_total', 'Course text searches, by method (lexical title match, hybrid, or lexical fallback)',
+    label_names=('method',))
+
+
+def get_embedding_breaker():
+    """
+    Circuit breaker around embeddings API calls, shared by the app's requests.
+    """
+    if 'embedding_breaker' not in current_app.extensions:
+        current_app.extensions['embedding_breaker'] = CircuitBreaker(
+            'openai_embeddings',
+            failure_threshold=current_app.config.get('EMBEDDING_BREAKER_FAILURES', 5),
+            reset_seconds=current_app.config.get('EMBEDDING_BREAKER_RESET_SECONDS', 30),
+        )
+    return current_app.extensions['embedding_breaker']
 
 def ensure_courses_embedded():
     """
@@ -52,10 +75,10 @@ def embed_courses(courses: list[str]):
     """
     cursor = app.mysql.connection.cursor()
     course_names_and_descriptions = [course["name"] + " " + course["description"] for course in courses]
-    response = client.embeddings.create(
+    response = openai_client.call('embeddings', lambda client: client.embeddings.create(
             model="text-embedding-3-small",
             input=course_names_and_descriptions
-            )
+            ))
 
     embeddings = [data.embedding for data in response.data]
 
@@ -68,19 +91,72 @@ def embed_courses(courses: list[str]):
     app.mysql.connection.commit()
 
 
+def get_embedding_batcher():
+    """
+    Batches the app's concurrent single-text embedding requests into multi-input API calls.
+    """
+    if 'embedding_batcher' not in current_app.extensions:
+        deadline = current_app.config.get('EMBEDDING_DEADLINE_SECONDS', 5)
+        current_app.extensions['embedding_batcher'] = EmbeddingBatcher(
+            lambda texts: embed_texts(texts, deadline_seconds=deadline),
+            max_wait_ms=current_app.config.get('EMBEDDING_BATCH_WAIT_MS', 5),
+            max_batch=current_app.config.get('EMBEDDING_BATCH_MAX', 32),
+            wait_timeout=deadline + 1,
+        )
+    return current_app.extensions['embedding_batcher']
+
+
 def get_embedding(text: str):
     """
-    Get embedding vectors for a given text
+    Get embedding vectors for a given text, batched with other requests' texts.
+    Raises CircuitOpen without calling the API while recent calls have been failing.
     """
-    return client.embeddings.create(input=[text], model="text-embedding-3-small").data[0].embedding
+    text = ' '.join(text.split())
+    batcher = get_embedding_batcher()
+    return _embedding_flights.do(text, lambda: batcher.embed(text))
     
 
+def embed_texts(texts: list[str], deadline_seconds=None):
+    """
+    Embedding vectors for several texts in one API call, in the same order.
+    """
+    response = get_embedding_breaker().call(lambda: openai_client.call('embeddings', lambda client: client.embeddings.create(
+        input=texts, model="text-embedding-3-small"
+    ), deadline_seconds=deadline_seconds))
+    return [data.embedding for data in response.data]
+
+
+def get_courses_in_order(cursor, course_ids):
+    """
+    Full course rows for course_ids, in the same order.
+    """
+    placeholders = ",".join(["%s"] * len(course_ids))
+    
+    query_values = course_ids + course_ids
+    cursor.execute(f"SELECT * from courses where id in ({placeholders}) order by field(id, {placeholders}) ", query_values)
+    return cursor.fetchall()
+
+
 def get_courses_from_embedding(user_id, text = None, embedding = None, ids: list[int] = None, n=3):
     """
-    Get relevant courses from embedding
+    Get relevant courses from embedding.
+    Text queries are also ranked by the lexical index and the two rankings fused. A query naming one course
+    title is answered from the index alone, and when the text cannot be embedded (API down, or its circuit
+    breaker open) the lexical ranking is used on its own.
     """
     try:
         cursor = app.mysql.connection.cursor()
+        index = get_course_index() if text else None
+
+        # Course titles need no embeddings call
+        if index is not None and not ids and current_app.config.get('SEARCH_LEXICAL_FAST_PATH', True):
+            title_match = index.title_match(text)
+            if title_match is not None:
+                course_searches_total.inc(method='lexical')
+                ranking = [title_match] + [key for key, _ in index.search(text) if key != title_match]
+                courses = get_courses_in_order(cursor, ranking[:n])
+                cursor.close()
+                return courses, 200
         
         # First check if embeddings exist
         cursor.execute(COUNT_EMBEDDINGS_QUERY)
@@ -89,7 +165,13 @@ def get_courses_from_embedding(user_id, text = None, embedding = None, ids: list
             cursor.close()
             return {"error": "Embeddings are being initialized. Please try again in a moment."}, 503
         
-        embedded_text = get_embedding(text) if text else ""
+        embedded_text = ""
+        if text:
+            try:
+                embedded_text = get_embedding(text)
+            except Exception as e:
+                print(f"Embedding unavailable, falling back to keyword search: {str(e)}")
+                embedded_text = None
 
         # Get all courses from the embedding database the the user hasn't completed
         query = "SELECT ce.course_id, ce.embedding from course_embedding ce left join user_course_progress up on ce.course_id = up.course_id and up.user_id = %s"
@@ -112,35 +194,41 @@ def get_courses_from_embedding(user_id, text = None, embedding = None, ids: list
 
         similarities = []
 
-        for obj in embedded_courses:
-            cid = obj["course_id"]
-            emb_json = obj["embedding"]
-            emb = np.array(json.loads(emb_json))
+        if embedded_text is not None:
+            for obj in embedded_courses:
+                cid = obj["course_id"]
+                emb_json = obj["embedding"]
+                emb = np.array(json.loads(emb_json))
 
-            if embedding is not None and embedding.all():
-                embedded_text = embedding
+                if embedding is not None and embedding.all():
+                    embedded_text = embedding
 
-            similarity = cosine_similarity(embedded_text, emb)
-            similarities.append((cid, similarity))
+                similarity = cosine_similarity(embedded_text, emb)
+                similarities.append((cid, similarity))
         
         
         similarities.sort(key=lambda x: x[1], reverse=True)
+        # extract ids after sorting
+        course_ids = [cid for cid, _ in similarities]
+
+        if index is not None:
+            candidates = {obj["course_id"] for obj in embedded_courses}
+            keyword_ids = [key for key, _ in index.search(text) if key in candidates]
+            if embedded_text is None:
+                course_searches_total.inc(method='fallback')
+                # Keyword matches first, then the other candidates as listed
+                course_ids = keyword_ids + [obj["course_id"] for obj in embedded_courses if obj["course_id"] not in keyword_ids]
+            else:
+                course_searches_total.inc(method='hybrid')
+                fused = reciprocal_rank_fusion([course_ids, keyword_ids], k=current_app.config.get('SEARCH_RRF_K', 60))
+                course_ids = [cid for cid, _ in fused]
 
         # Only get top n
-        similarities = similarities[:n]
-        # extract ids after sorting
-        course_ids = []
-        for id, _ in similarities: 
-                course_ids.append(id)
+        course_ids = course_ids[:n]
 
         print(course_ids)
 
-        placeholders = ",".join(["%s"] * len(course_ids))
-        
-        query_values = course_ids + course_ids
-        cursor.execute(f"SELECT * from courses where id in ({placeholders}) order by field(id, {placeholders}) ", query_values)
-
-        courses = cursor.fetchall()
+        courses = get_courses_in_order(cursor, course_ids)
         cursor.close()
         return courses, 200
     except Exception as e:
@@ -0,0 +1,185 @@
+from datetime import datetime
+from decimal import Decimal
+import csv
+import io
+import time
+from flask import current_app
+from utils.streaming_utils import open_streaming_cursor, iter_rows
+
+
+"""
+LEARNER PROGRESS EXPORT FUNCTIONS
+"""
+
+EXPORT_COLUMNS = [
+    'record_type', 'id', 'user_id', 'username', 'email',
+    'course_id', 'tutorial_id', 'quiz_id',
+    'progress_percentage', 'score', 'occurred_at'
+]
+
+# Sections are exported in this order, each one walked by primary key.
+# A resumption token "<record_type>:<id>" continues right after that row.
+EXPORT_SECTIONS = [
+    ('course_progress', 'ucp.last_updated', """
+        SELECT
+            ucp.id,
+            ucp.user_id,
+            u.username,
+            u.email,
+            ucp.course_id,
+            ucp.progress_percentage,
+            ucp.last_updated AS occurred_at
+        FROM user_course_progress ucp
+        INNER JOIN users u ON u.id = ucp.user_id
+        WHERE ucp.id > %s {date_filter}
+        ORDER BY ucp.id
+        LIMIT %s
+    """),
+    ('quiz_attempt', 'uqr.attempted_at', """
+        SELECT
+            uqr.id,
+            uqr.user_id,
+            u.username,
+            u.email,
+            q.tutorial_id,
+            uqr.quiz_id,
+            uqr.score,
+            uqr.attempted_at AS occurred_at
+        FROM user_quiz_results uqr
+        INNER JOIN users u ON u.id = uqr.user_id
+        INNER JOIN quizzes q ON q.id = uqr.quiz_id
+        WHERE uqr.id > %s {date_filter}
+        ORDER BY uqr.id
+        LIMIT %s
+    """),
+    ('tutorial_completion', 'utp.completed_at', """
+        SELECT
+            utp.id,
+            utp.user_id,
+            u.username,
+            u.email,
+            utp.tutorial_id,
+            utp.completed_at AS occurred_at
+        FROM user_tutorial_progress utp
+        INNER JOIN users u ON u.id = utp.user_id
+        WHERE utp.id > %s AND utp.completed = TRUE {date_filter}
+        ORDER BY utp.id
+        LIMIT %s
+    """),
+]
+
+SECTION_NAMES = [name for name, _, _ in EXPORT_SECTIONS]
+
+
+def parse_resume_token(token):
+    """
+    Parses a "<record_type>:<id>" resumption token.
+
+    Returns:
+        (section_index, last_id), or (0, 0) when no token is given
+
+    Raises:
+        ValueError: if the token is malformed
+    """
+    if not token:
+        return 0, 0
+    record_type, _, last_id = token.partition(':')
+    if record_type not in SECTION_NAMES:
+        raise ValueError(f"Unknown record type in resume token: {record_type}")
+    return SECTION_NAMES.index(record_type), int(last_id)
+
+
+def parse_date_bound(value):
+    """
+    Parses an ISO date/datetime query parameter, returning None when absent.
+    """
+    if not value:
+        return None
+    return datetime.fromisoformat(value)
+
+
+def _format_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _build_record(record_type, row):
+    record = {column: None for column in EXPORT_COLUMNS}
+    record['record_type'] = record_type
+    for key, value in row.items():
+        if key in record:
+            record[key] = _format_value(value)
+    return record
+
+
+def iter_progress_records(date_from=None, date_to=None, resume_token=None):
+    """
+    Yields every progress, quiz attempt and tutorial completion record as a flat dict.
+
+    Each section is read in keyset batches of EXPORT_BATCH_SIZE rows on a server-side cursor,
+    sleeping EXPORT_THROTTLE_MS between batches so a full export does not monopolise the database.
+    """
+    batch_size = current_app.config.get('EXPORT_BATCH_SIZE', 1000)
+    throttle_seconds = current_app.config.get('EXPORT_THROTTLE_MS', 0) / 1000
+
+    start_section, last_id = parse_resume_token(resume_token)
+
+    for section_index in range(start_section, len(EXPORT_SECTIONS)):
+        record_type, date_column, query = EXPORT_SECTIONS[section_index]
+
+        date_filter = ""
+        date_values = []
+        if date_from:
+            date_filter += f" AND {date_column} >= %s"
+            date_values.append(date_from)
+        if date_to:
+            date_filter += f" AND {date_column} < %s"
+            date_values.append(date_to)
+        sql = query.format(date_filter=date_filter)
+
+        after_id = last_id if section_index == start_section else 0
+        while True:
+            cursor = open_streaming_cursor()
+            try:
+                cursor.execute(sql, [after_id] + date_values + [batch_size])
+                row_count = 0
+                for row in iter_rows(cursor):
+                    row_count += 1
+                    after_id = row['id']
+                    yield _build_record(record_type, row)
+            finally:
+                cursor.close()
+
+            if row_count < batch_size:
+                break
+            if throttle_seconds:
+                time.sleep(throttle_seconds)
+
+
+def iter_csv(records):
+    """
+    Yields CSV text for a stream of export records, starting with the header row.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    for record in records:
+        buffer.seek(0)
+        buffer.truncate(0)
+        writer.writerow(record)
+        yield buffer.getvalue()
+
+
+def iter_ndjson(records):
+    """
+    Yields one JSON document per line for a stream of export records.
+    """
+    dumps = current_app.json.dumps
+    for record in records:
+        yield dumps(record) + '\n'
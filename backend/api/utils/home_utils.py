@@ -0,0 +1,130 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+import time
+from flask import current_app, g
+import app
+from utils import metrics
+from utils.courses_routes_utils import get_courses, get_unenrolled_courses
+from utils.dashboard_utils import get_dashboard_stats
+from utils.db_metrics import merge_stats
+from utils.embedding_utils import get_recommended_courses_based_on_user_details
+from utils.replica_utils import reads_from_replica, use_replica
+from utils.users_utils import get_user_details, get_user_preferences
+
+
+"""
+HOME PAGE COMPOSITION
+
+/home returns everything the dashboard needs in one response. Each section is an existing
+(data, code) function taking the user id; they run concurrently, each in its own app context
+and therefore on its own pooled connection. Sections that have not finished within
+HOME_SECTION_TIMEOUT_MS are reported as timed out, so one slow part (usually recommendations)
+cannot hold up the rest of the page.
+
+All requests share one executor of HOME_MAX_WORKERS threads, which bounds the threads and MySQL
+connections /home can use however slow its sections get. Abandoned work is kept short: a timed
+out section that has not started is cancelled, and one that is running has its SELECTs capped at
+HOME_SECTION_TIMEOUT_MS by MySQL. Under saturation, sections queue for a worker and that wait
+counts against the timeout, so overload sheds sections instead of piling up work.
+"""
+
+SECTIONS = {
+    'user': get_user_details,
+    'preferences': get_user_preferences,
+    'stats': get_dashboard_stats,
+    'courses': get_courses,
+    'unenrolled_courses': get_unenrolled_courses,
+    'recommended': get_recommended_courses_based_on_user_details,
+}
+
+SECTION_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5]
+
+section_seconds = metrics.histogram(
+    'skywise_home_section_seconds', 'Time taken by each /home section',
+    SECTION_BUCKETS, label_names=('section',))
+section_outcomes = metrics.counter(
+    'skywise_home_sections_total', '/home sections by outcome (ok, error, timeout)',
+    label_names=('section', 'outcome'))
+
+def _section_executor():
+    executor = current_app.extensions.get('home_section_executor')
+    if executor is None:
+        executor = current_app.extensions.setdefault('home_section_executor', ThreadPoolExecutor(
+            max_workers=current_app.config.get('HOME_MAX_WORKERS', 16),
+            thread_name_prefix='home-section'
+        ))
+    return executor
+
+
+def _run_section(flask_app, name, user_id, read_only, timeout_ms):
+    """
+    Runs one section in a fresh app context. Returns (data, code, duration_ms, db_stats).
+    """
+    start = time.perf_counter()
+    with flask_app.app_context():
+        if read_only:
+            use_replica(user_id)
+        app.mysql.limit_statement_time(timeout_ms)
+        try:
+            data, code = SECTIONS[name](user_id)
+        except Exception as e:
+            current_app.logger.exception(f"/home section {name} failed")
+            data, code = {'error': str(e)}, 500
+        db_stats = g.get('_db_stats')
+    return data, code, (time.perf_counter() - start) * 1000, db_stats
+
+
+def parse_sections(value):
+    """
+    Section names from a comma-separated ?sections= value, in SECTIONS order.
+    Returns (names, unknown); no value means every section.
+    """
+    if not value:
+        return list(SECTIONS), []
+    requested = {name.strip() for name in value.split(',') if name.strip()}
+    return [name for name in SECTIONS if name in requested], sorted(requested - set(SECTIONS))
+
+
+def compose_home(user_id, sections):
+    """
+    Runs the requested sections for one user concurrently.
+
+    Returns ({section: data or None, ..., "sections": {section: status}}, 200), where each status is
+    {"status": "ok" | "error" | "timeout", "duration_ms": number} plus "code" and "error" for failures.
+    """
+    flask_app = current_app._get_current_object()
+    timeout_ms = current_app.config.get('HOME_SECTION_TIMEOUT_MS', 1500)
+    executor = _section_executor()
+
+    read_only = reads_from_replica()
+    futures = {
+        name: executor.submit(_run_section, flask_app, name, user_id, read_only, timeout_ms)
+        for name in sections
+    }
+    done, _ = wait(futures.values(), timeout=timeout_ms / 1000)
+
+    body = {}
+    statuses = {}
+    for name, future in futures.items():
+        if future not in done:
+            # Drops it from the queue if no worker picked it up yet
+            future.cancel()
+            body[name] = None
+            statuses[name] = {'status': 'timeout', 'duration_ms': float(timeout_ms)}
+            section_outcomes.inc(section=name, outcome='timeout')
+            continue
+
+        data, code, duration_ms, db_stats = future.result()
+        merge_stats(db_stats)
+        section_seconds.observe(duration_ms / 1000, section=name)
+        if code < 400:
+            body[name] = data
+            statuses[name] = {'status': 'ok', 'duration_ms': round(duration_ms, 1)}
+            section_outcomes.inc(section=name, outcome='ok')
+        else:
+            body[name] = None
+            error = data.get('error') if isinstance(data, dict) else None
+            statuses[name] = {'status': 'error', 'code': code, 'error': error, 'duration_ms': round(duration_ms, 1)}
+            section_outcomes.inc(section=name, outcome='error')
+
+    body['sections'] = statuses
+    return body, 200
@@ -0,0 +1,124 @@
+import bisect
+import threading
+
+
+"""
+IN-PROCESS METRICS REGISTRY (Prometheus text exposition)
+"""
+
+_lock = threading.Lock()
+_metrics = {}
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(f'{key}="{str(value)}"' for key, value in labels)
+    return '{' + pairs + '}'
+
+
+class Counter:
+    def __init__(self, name, description, label_names=()):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self.values = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple((name, labels.get(name, '')) for name in self.label_names)
+        with _lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.description}', f'# TYPE {self.name} counter']
+        for key, value in sorted(self.values.items()):
+            lines.append(f'{self.name}{_format_labels(key)} {value}')
+        return lines
+
+
+class Gauge(Counter):
+    def set(self, value, **labels):
+        key = tuple((name, labels.get(name, '')) for name in self.label_names)
+        with _lock:
+            self.values[key] = value
+
+    def render(self):
+        lines = super().render()
+        lines[1] = f'# TYPE {self.name} gauge'
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, description, buckets, label_names=()):
+        self.name = name
+        self.description = description
+        self.buckets = sorted(buckets)
+        self.label_names = tuple(label_names)
+        self.values = {}
+
+    def observe(self, value, **labels):
+        key = tuple((name, labels.get(name, '')) for name in self.label_names)
+        with _lock:
+            series = self.values.get(key)
+            if series is None:
+                series = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+                self.values[key] = series
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series['counts'][index] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.description}', f'# TYPE {self.name} histogram']
+        for key, series in sorted(self.values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series['counts']):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{_format_labels(key + (("le", bound),))} {cumulative}')
+            lines.append(f'{self.name}_bucket{_format_labels(key + (("le", "+Inf"),))} {series["count"]}')
+            lines.append(f'{self.name}_sum{_format_labels(key)} {round(series["sum"], 6)}')
+            lines.append(f'{self.name}_count{_format_labels(key)} {series["count"]}')
+        return lines
+
+
+def _register(metric):
+    with _lock:
+        existing = _metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        _metrics[metric.name] = metric
+        return metric
+
+
+def counter(name, description, label_names=()):
+    """
+    Returns the counter registered under name, creating it on first use.
+    """
+    return _register(Counter(name, description, label_names))
+
+
+def gauge(name, description, label_names=()):
+    """
+    Returns the gauge registered under name, creating it on first use.
+    """
+    return _register(Gauge(name, description, label_names))
+
+
+def histogram(name, description, buckets, label_names=()):
+    """
+    Returns the histogram registered under name, creating it on first use.
+    """
+    return _register(Histogram(name, description, buckets, label_names))
+
+
+def render_prometheus():
+    """
+    Renders every registered metric in the Prometheus text exposition format.
+    """
+    with _lock:
+        metrics = list(_metrics.values())
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,198 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from flask import current_app, has_app_context
+from openai import OpenAI, APIConnectionError, InternalServerError, RateLimitError
+from config import Config
+from utils import metrics
+
+try:
+    import httpx
+    from openai import DefaultHttpxClient
+except ImportError:
+    httpx = None
+
+
+"""
+SHARED OPENAI CLIENT
+
+One OpenAI client per process, created on first use, so embedding and chat calls share its
+keep-alive connection pool instead of each module opening its own. Every call goes through call()
+or stream(), which:
+
+- hold one of OPENAI_MAX_CONCURRENCY slots, so a slow upstream queues callers instead of tying up
+  every worker (waiting for a slot counts against the deadline);
+- give each call an overall deadline, with each attempt's timeout cut to what is left of it;
+- retry connection errors, timeouts, 429s and 5xxs with jittered exponential backoff, as long as
+  the process-wide retry budget allows (retries may add at most OPENAI_RETRY_BUDGET_RATIO of the
+  call volume, so an outage does not multiply the load on the upstream);
+- record latency, outcome and retry metrics per operation.
+
+The SDK's own retries are turned off so these are the only ones.
+"""
+
+RETRYABLE_ERRORS = (APIConnectionError, RateLimitError, InternalServerError)
+
+request_seconds = metrics.histogram(
+    'skywise_openai_request_seconds', 'OpenAI call latency including retries, by operation',
+    [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60], label_names=('operation',))
+requests_total = metrics.counter(
+    'skywise_openai_requests_total', 'OpenAI calls by operation and outcome', label_names=('operation', 'outcome'))
+retries_total = metrics.counter(
+    'skywise_openai_retries_total', 'OpenAI call retries by operation', label_names=('operation',))
+in_flight = metrics.gauge('skywise_openai_in_flight', 'OpenAI calls currently holding a concurrency slot')
+
+_client = None
+_slots = None
+_budget = None
+_in_flight = 0
+_lock = threading.Lock()
+
+
+class OpenAIUnavailable(Exception):
+    """
+    Raised when no concurrency slot frees up before the call's deadline.
+    """
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries to a fraction of calls: each call deposits ratio tokens, each retry
+    spends one. Starts full so a quiet process can still retry its first failures.
+    """
+
+    def __init__(self, ratio=0.2, max_tokens=10):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self):
+        with self._lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+def _settings():
+    source = current_app.config if has_app_context() else vars(Config)
+    return {name: source.get(name, getattr(Config, name)) for name in (
+        'OPENAI_TIMEOUT_SECONDS', 'OPENAI_CONNECT_TIMEOUT_SECONDS', 'OPENAI_MAX_RETRIES',
+        'OPENAI_MAX_CONCURRENCY', 'OPENAI_MAX_CONNECTIONS', 'OPENAI_RETRY_BUDGET_RATIO',
+    )}
+
+
+def get_client():
+    """
+    Returns the process-wide OpenAI client, creating it (and its connection pool) on first use.
+    """
+    global _client, _slots, _budget
+    if _client is not None:
+        return _client
+    with _lock:
+        if _client is None:
+            settings = _settings()
+            options = {'max_retries': 0, 'timeout': settings['OPENAI_TIMEOUT_SECONDS']}
+            if httpx is not None:
+                options['timeout'] = httpx.Timeout(settings['OPENAI_TIMEOUT_SECONDS'],
+                                                   connect=settings['OPENAI_CONNECT_TIMEOUT_SECONDS'])
+                options['http_client'] = DefaultHttpxClient(limits=httpx.Limits(
+                    max_connections=settings['OPENAI_MAX_CONNECTIONS'],
+                    max_keepalive_connections=settings['OPENAI_MAX_CONNECTIONS'],
+                ))
+            _slots = threading.BoundedSemaphore(settings['OPENAI_MAX_CONCURRENCY'])
+            _budget = RetryBudget(settings['OPENAI_RETRY_BUDGET_RATIO'])
+            _client = OpenAI(**options)
+    return _client
+
+
+def backoff_seconds(attempt, base=0.25, cap=4.0):
+    """
+    Full-jitter exponential backoff for the given retry attempt (1 for the first retry).
+    """
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+@contextmanager
+def _slot(deadline):
+    global _in_flight
+    if not _slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+        raise OpenAIUnavailable('No OpenAI concurrency slot became free before the deadline')
+    with _lock:
+        _in_flight += 1
+        in_flight.set(_in_flight)
+    try:
+        yield
+    finally:
+        with _lock:
+            _in_flight -= 1
+            in_flight.set(_in_flight)
+        _slots.release()
+
+
+def call(operation, fn, deadline_seconds=None):
+    """
+    Runs fn(client) with a concurrency slot, a deadline and retries, and returns its result.
+    fn receives the shared client with this attempt's timeout applied.
+    """
+    client = get_client()
+    settings = _settings()
+    timeout = settings['OPENAI_TIMEOUT_SECONDS']
+    started = time.monotonic()
+    deadline = started + (deadline_seconds or timeout)
+    _budget.deposit()
+    outcome = 'error'
+    attempt = 0
+    try:
+        with _slot(deadline):
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    result = fn(client.with_options(timeout=min(timeout, max(remaining, 0.001))))
+                    outcome = 'ok'
+                    return result
+                except RETRYABLE_ERRORS:
+                    attempt += 1
+                    delay = backoff_seconds(attempt)
+                    if (attempt > settings['OPENAI_MAX_RETRIES'] or time.monotonic() + delay >= deadline
+                            or not _budget.withdraw()):
+                        raise
+                    retries_total.inc(operation=operation)
+                    time.sleep(delay)
+    except OpenAIUnavailable:
+        outcome = 'busy'
+        raise
+    finally:
+        requests_total.inc(operation=operation, outcome=outcome)
+        request_seconds.observe(time.monotonic() - started, operation=operation)
+
+
+@contextmanager
+def stream(operation, deadline_seconds=None, **kwargs):
+    """
+    Opens client.responses.stream(**kwargs) with a concurrency slot held until the stream is closed.
+    Streams are not retried, since part of the response may already have been shown to the user.
+    """
+    client = get_client()
+    started = time.monotonic()
+    deadline = started + (deadline_seconds or _settings()['OPENAI_TIMEOUT_SECONDS'])
+    _budget.deposit()
+    outcome = 'error'
+    try:
+        with _slot(deadline):
+            remaining = max(deadline - time.monotonic(), 0.001)
+            with client.with_options(timeout=remaining).responses.stream(**kwargs) as response_stream:
+                yield response_stream
+            outcome = 'ok'
+    except OpenAIUnavailable:
+        outcome = 'busy'
+        raise
+    finally:
+        requests_total.inc(operation=operation, outcome=outcome)
+        request_seconds.observe(time.monotonic() - started, operation=operation)
@@ -0,0 +1,191 @@
+from functools import wraps
+import random
+import threading
+import time
+from flask import current_app, g, request
+from flask_jwt_extended import get_jwt_identity
+from utils import metrics
+
+
+"""
+READ/WRITE SPLITTING
+
+Views decorated with @read_only read from one of the MYSQL_REPLICA_HOSTS instead of the primary,
+unless:
+- no replica is configured, or every replica is further behind than MYSQL_REPLICA_MAX_LAG_SECONDS
+  (or not replicating at all), checked at most every MYSQL_REPLICA_LAG_CHECK_SECONDS per replica;
+- the user made a successful write (POST/PUT/DELETE) in the last READ_YOUR_WRITES_SECONDS, so
+  e.g. the dashboard right after a quiz submission shows the new result.
+Everything else, including every write, uses the primary.
+
+Write stickiness is kept in process memory, which is enough while a user's requests reach the
+same API process; behind a load balancer without session affinity it needs a shared store.
+"""
+
+PRIMARY = 'primary'
+WRITE_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+
+read_routing_total = metrics.counter(
+    'skywise_db_read_routing_total', 'Connections opened for @read_only requests, by where they went and why',
+    label_names=('target', 'reason'))
+replica_lag_seconds = metrics.gauge(
+    'skywise_db_replica_lag_seconds', 'Last measured replication lag (-1 when not replicating)',
+    label_names=('replica',))
+
+_sticky_until = {}
+_sticky_lock = threading.Lock()
+_lag_checks = {}
+
+
+def replica_hosts():
+    """
+    Configured replicas as [(host, port)], from comma-separated "host[:port]" entries.
+    """
+    hosts = []
+    for entry in (current_app.config.get('MYSQL_REPLICA_HOSTS') or '').split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        host, _, port = entry.partition(':')
+        hosts.append((host, int(port) if port else current_app.config.get('MYSQL_PORT', 3306)))
+    return hosts
+
+
+def current_identity():
+    """
+    JWT identity of the current request, or None outside a verified request.
+    """
+    try:
+        return get_jwt_identity()
+    except RuntimeError:
+        return None
+
+
+def use_replica(user_id=None):
+    """
+    Routes this app context's reads to a replica where possible. user_id is checked for write
+    stickiness; by default it is the identity of the verified JWT when the connection is opened.
+    """
+    g._mysql_read_only = True
+    g._mysql_read_user = user_id
+
+
+def clear_read_only():
+    g.pop('_mysql_read_only', None)
+    g.pop('_mysql_read_user', None)
+
+
+def reads_from_replica():
+    return g.get('_mysql_read_only', False)
+
+
+def read_only(f):
+    """
+    Decorator for views that only read and tolerate replication lag of up to MYSQL_REPLICA_MAX_LAG_SECONDS.
+    Place it directly below @bp.route so auth checks read from the replica too. The routing applies
+    for the rest of the request, including a streamed body.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        use_replica()
+        return f(*args, **kwargs)
+
+    return decorated_function
+
+
+def mark_write(user_id):
+    """
+    Sends user_id's @read_only reads to the primary for the next READ_YOUR_WRITES_SECONDS.
+    """
+    now = time.monotonic()
+    with _sticky_lock:
+        for key in [key for key, until in _sticky_until.items() if until <= now]:
+            del _sticky_until[key]
+        _sticky_until[str(user_id)] = now + current_app.config.get('READ_YOUR_WRITES_SECONDS', 10)
+
+
+def is_sticky(user_id):
+    if user_id is None:
+        return False
+    with _sticky_lock:
+        return _sticky_until.get(str(user_id), 0) > time.monotonic()
+
+
+def record_writes(response):
+    """
+    after_request hook: marks the caller sticky to the primary after a successful write request.
+    """
+    if request.method in WRITE_METHODS and response.status_code < 400:
+        user_id = current_identity()
+        if user_id is not None:
+            mark_write(user_id)
+    return response
+
+
+def _may_be_healthy(replica):
+    """
+    False only for a replica whose last lag check (still current) found it lagging or broken.
+    """
+    checked = _lag_checks.get(replica)
+    if checked is None or time.monotonic() - checked[0] >= current_app.config.get('MYSQL_REPLICA_LAG_CHECK_SECONDS', 5):
+        return True
+    return checked[1] is not None and checked[1] <= current_app.config.get('MYSQL_REPLICA_MAX_LAG_SECONDS', 5)
+
+
+def choose_target():
+    """
+    Where a @read_only context's reads should come from: PRIMARY or a (host, port) replica.
+    A replica returned here still has to pass replica_usable once connected.
+    """
+    replicas = replica_hosts()
+    if not replicas:
+        read_routing_total.inc(target=PRIMARY, reason='no_replica')
+        return PRIMARY
+    if is_sticky(g.get('_mysql_read_user') or current_identity()):
+        read_routing_total.inc(target=PRIMARY, reason='read_your_writes')
+        return PRIMARY
+
+    healthy = [replica for replica in replicas if _may_be_healthy(replica)]
+    if not healthy:
+        read_routing_total.inc(target=PRIMARY, reason='replica_lagging')
+        return PRIMARY
+    return random.choice(healthy)
+
+
+def measure_lag(connection):
+    """
+    Seconds the replica behind connection is behind its source, or None when it is not replicating.
+    """
+    cursor = connection.cursor()
+    try:
+        try:
+            cursor.execute("SHOW REPLICA STATUS")
+            column = 'Seconds_Behind_Source'
+        except Exception:
+            # MySQL before 8.0.22
+            cursor.execute("SHOW SLAVE STATUS")
+            column = 'Seconds_Behind_Master'
+        status = cursor.fetchone()
+    finally:
+        cursor.close()
+    return status.get(column) if status else None
+
+
+def replica_usable(replica, connection):
+    """
+    Checks (at most every MYSQL_REPLICA_LAG_CHECK_SECONDS) that replica is within MYSQL_REPLICA_MAX_LAG_SECONDS.
+    """
+    now = time.monotonic()
+    checked_at, lag = _lag_checks.get(replica, (None, None))
+    if checked_at is None or now - checked_at >= current_app.config.get('MYSQL_REPLICA_LAG_CHECK_SECONDS', 5):
+        try:
+            lag = measure_lag(connection)
+        except Exception as e:
+            current_app.logger.warning(f"Replica lag check on {replica[0]}:{replica[1]} failed: {e}")
+            lag = None
+        _lag_checks[replica] = (now, lag)
+        replica_lag_seconds.set(-1 if lag is None else lag, replica=f'{replica[0]}:{replica[1]}')
+
+    usable = lag is not None and lag <= current_app.config.get('MYSQL_REPLICA_MAX_LAG_SECONDS', 5)
+    read_routing_total.inc(target='replica' if usable else PRIMARY, reason='replica' if usable else 'replica_lagging')
+    return usable
@@ -0,0 +1,152 @@
+import json
+import math
+import re
+from collections import Counter, defaultdict
+from flask import current_app
+import app
+from utils.catalog_utils import get_catalog_version
+
+
+"""
+LEXICAL COURSE SEARCH
+
+An in-process BM25 index over course names, summaries, descriptions and learning objectives,
+rebuilt whenever the catalog version moves on. Course search uses it three ways:
+
+- a query whose terms all appear in exactly one course name ("Teams Unlocked") is answered from
+  the index alone, without an embeddings call;
+- otherwise its ranking is fused with the embedding ranking (reciprocal rank fusion), so exact
+  keywords and meaning both count;
+- when embeddings are unavailable it ranks on its own.
+
+Terms are lower-cased words with a trailing plural "s" removed, so "spreadsheets" finds
+"Spreadsheet basics"; common English words are ignored.
+"""
+
+STOP_WORDS = {
+    'a', 'about', 'an', 'and', 'are', 'for', 'how', 'i', 'in', 'is', 'it', 'learn', 'me', 'my', 'of', 'on',
+    'or', 'the', 'to', 'want', 'what', 'with', 'you',
+}
+
+# A term in the course name counts three times as much as one in the other fields
+FIELD_WEIGHTS = {'name': 3, 'summary': 1, 'description': 1, 'learning_objectives': 1}
+
+COURSE_INDEX_QUERY = "SELECT id, name, description, summary, learning_objectives FROM courses"
+
+
+def tokenize(text):
+    terms = []
+    for word in re.findall(r'[a-z0-9]+', str(text or '').lower()):
+        if word in STOP_WORDS:
+            continue
+        if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]
+        terms.append(word)
+    return terms
+
+
+class BM25Index:
+    """
+    BM25 over documents with weighted fields: a term's frequency and a document's length are the
+    weighted sums over its fields.
+
+    documents is a list of (key, {field: text}) with fields from FIELD_WEIGHTS.
+    """
+
+    def __init__(self, documents, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.keys = []
+        self.name_terms = {}
+        self.lengths = {}
+        self.postings = defaultdict(dict)
+
+        for key, fields in documents:
+            frequencies = Counter()
+            for field, weight in FIELD_WEIGHTS.items():
+                for term in tokenize(fields.get(field)):
+                    frequencies[term] += weight
+            self.keys.append(key)
+            self.name_terms[key] = set(tokenize(fields.get('name')))
+            self.lengths[key] = sum(frequencies.values())
+            for term, frequency in frequencies.items():
+                self.postings[term][key] = frequency
+
+        self.average_length = (sum(self.lengths.values()) / len(self.keys)) if self.keys else 0
+        self._order = {key: position for position, key in enumerate(self.keys)}
+
+    def idf(self, term):
+        matches = len(self.postings.get(term, ()))
+        return math.log(1 + (len(self.keys) - matches + 0.5) / (matches + 0.5))
+
+    def search(self, query):
+        """
+        Returns [(key, score)] for documents matching at least one query term, best first.
+        """
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            idf = self.idf(term)
+            for key, frequency in self.postings.get(term, {}).items():
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[key] / self.average_length)
+                scores[key] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return sorted(scores.items(), key=lambda item: (-item[1], self._order[item[0]]))
+
+    def title_match(self, query):
+        """
+        The key of the only document whose name contains every query term, or None.
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return None
+        matches = [key for key in self.keys if terms <= self.name_terms[key]]
+        return matches[0] if len(matches) == 1 else None
+
+
+def reciprocal_rank_fusion(rankings, k=60):
+    """
+    Fuses several best-first lists of keys: each key scores sum(1 / (k + rank)) over the lists it is in.
+    Returns [(key, score)] best first, ties in order of first appearance.
+    """
+    scores = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] = scores.get(key, 0) + 1 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+def _objectives_text(value):
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return value
+    if isinstance(value, (list, tuple)):
+        return ' '.join(str(item) for item in value)
+    return str(value or '')
+
+
+def get_course_index():
+    """
+    BM25 index of the course catalog, built on first use and rebuilt when the catalog version changes.
+    """
+    version = get_catalog_version()
+    cached = current_app.extensions.get('course_search_index')
+    if cached is not None and cached['version'] == version:
+        return cached['index']
+
+    cursor = app.mysql.connection.cursor()
+    cursor.execute(COURSE_INDEX_QUERY)
+    courses = cursor.fetchall()
+    cursor.close()
+
+    index = BM25Index([
+        (course['id'], {
+            'name': course['name'],
+            'summary': course['summary'],
+            'description': course['description'],
+            'learning_objectives': _objectives_text(course['learning_objectives']),
+        })
+        for course in courses
+    ])
+    current_app.extensions['course_search_index'] = {'version': version, 'index': index}
+    return index
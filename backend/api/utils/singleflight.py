@@ -0,0 +1,148 @@
+from functools import wraps
+import json
+import threading
+from flask import current_app, request
+from flask_jwt_extended import get_jwt_identity
+from utils import metrics
+
+
+"""
+SINGLE-FLIGHT REQUEST COALESCING
+
+When many identical requests arrive together (a course launch, an email campaign), only the
+first one runs the view; the others wait for it and are answered from its result. A flight lasts
+only while that first computation runs: nothing is cached afterwards, so later requests always
+see fresh data.
+
+Identical means same method, route, path arguments, query string and JSON body (whitespace in
+string values collapsed), and for scope='user' the same JWT identity. Use scope='global' only for
+views whose output does not depend on who is asking, below any authorisation decorator.
+"""
+
+DEFAULT_WAIT_SECONDS = 30
+WAITER_BUCKETS = [0, 1, 2, 5, 10, 25, 50, 100, 250, 500]
+
+leaders_total = metrics.counter(
+    'skywise_singleflight_leaders_total', 'Computations actually run by a single-flight group',
+    label_names=('name',))
+coalesced_total = metrics.counter(
+    'skywise_singleflight_coalesced_total', 'Callers answered from another caller\'s in-flight computation',
+    label_names=('name',))
+wait_timeouts_total = metrics.counter(
+    'skywise_singleflight_wait_timeouts_total', 'Waiters that gave up on a slow flight and computed themselves',
+    label_names=('name',))
+waiters_per_flight = metrics.histogram(
+    'skywise_singleflight_waiters', 'Callers that joined each flight',
+    WAITER_BUCKETS, label_names=('name',))
+
+
+class _Flight:
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Group of in-flight computations, one per key.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def do(self, key, fn, timeout=DEFAULT_WAIT_SECONDS):
+        """
+        Returns fn(), or the result of the identical call already running for key.
+        A waiter re-raises the leader's exception, and calls fn itself after timeout seconds.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                flight.waiters += 1
+
+        if not leader:
+            coalesced_total.inc(name=self.name)
+            if not flight.done.wait(timeout):
+                wait_timeouts_total.inc(name=self.name)
+                return fn()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        leaders_total.inc(name=self.name)
+        try:
+            flight.result = fn()
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            # Callers arriving from now on start a new flight and see fresh data
+            with self._lock:
+                self._flights.pop(key, None)
+            waiters_per_flight.observe(flight.waiters, name=self.name)
+            flight.done.set()
+
+
+def _normalize(value):
+    if isinstance(value, str):
+        return ' '.join(value.split())
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def request_key(scope):
+    """
+    Identity of the current request for coalescing: route, arguments, query, JSON body and scope.
+    """
+    body = request.get_json(silent=True) if request.method != 'GET' else None
+    return (
+        request.method,
+        request.url_rule.rule if request.url_rule else request.path,
+        tuple(sorted((request.view_args or {}).items())),
+        tuple(sorted(request.args.items(multi=True))),
+        json.dumps(_normalize(body), sort_keys=True) if body is not None else None,
+        get_jwt_identity() if scope == 'user' else None,
+    )
+
+
+def single_flight(scope='user', name=None):
+    """
+    Decorator for views that coalesces concurrent identical requests (see request_key).
+
+    The shared result is materialised once (body, status, headers) and every caller gets its own
+    copy of the response, so views must return complete, non-streamed responses.
+    Disabled when SINGLE_FLIGHT_ENABLED is false.
+    """
+    def decorator(f):
+        group = SingleFlight(name or f.__name__)
+
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not current_app.config.get('SINGLE_FLIGHT_ENABLED', True):
+                return f(*args, **kwargs)
+
+            def run():
+                response = current_app.make_response(f(*args, **kwargs))
+                return response.get_data(), response.status_code, list(response.headers.items())
+
+            body, status, headers = group.do(
+                request_key(scope), run,
+                timeout=current_app.config.get('SINGLE_FLIGHT_WAIT_SECONDS', DEFAULT_WAIT_SECONDS)
+            )
+            return current_app.response_class(body, status=status, headers=headers)
+
+        return decorated_function
+    return decorator
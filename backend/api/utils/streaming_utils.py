@@ -0,0 +1,74 @@
+from flask import Response, current_app, request, stream_with_context
+import pymysql
+import app
+
+
+"""
+STREAMING RESPONSE HELPERS
+"""
+
+STREAM_BATCH_SIZE = 500
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def open_streaming_cursor():
+    """
+    Opens an unbuffered server-side cursor on the request's connection.
+    Rows are pulled from MySQL as they are fetched instead of being buffered client side,
+    so the cursor must be fully consumed (or closed) before the connection is reused.
+    """
+    return app.mysql.connection.cursor(pymysql.cursors.SSDictCursor)
+
+
+def iter_rows(cursor, batch_size=STREAM_BATCH_SIZE):
+    """
+    Yields rows from a cursor in batches of batch_size without ever holding the full result set.
+    """
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        for row in rows:
+            yield row
+
+
+def wants_ndjson():
+    """
+    Returns True when the client asked for newline-delimited JSON,
+    either with ?format=ndjson or an Accept header of application/x-ndjson.
+    """
+    if request.args.get('format', '').lower() == 'ndjson':
+        return True
+    return request.accept_mimetypes.best == NDJSON_MIMETYPE
+
+
+def stream_json_rows(cursor, transform=None, ndjson=None):
+    """
+    Builds a streaming response from an executed cursor.
+
+    By default the body is a JSON array (same shape as jsonify(list)) written one element at a time.
+    With ndjson=True each row is written as its own line. The cursor is closed once the stream ends.
+    """
+    if ndjson is None:
+        ndjson = wants_ndjson()
+
+    def generate():
+        dumps = current_app.json.dumps
+        try:
+            if ndjson:
+                for row in iter_rows(cursor):
+                    yield dumps(transform(row) if transform else row) + '\n'
+                return
+
+            yield '['
+            first = True
+            for row in iter_rows(cursor):
+                chunk = dumps(transform(row) if transform else row)
+                yield chunk if first else ',' + chunk
+                first = False
+            yield ']'
+        finally:
+            cursor.close()
+
+    mimetype = NDJSON_MIMETYPE if ndjson else 'application/json'
+    return Response(stream_with_context(generate()), mimetype=mimetype)
@@ -0,0 +1,330 @@
+import re
+import threading
+import time
+import numpy as np
+from flask import current_app
+import app
+from utils import embedding_utils, metrics
+
+
+"""
+TUTORIAL TRANSCRIPT SEARCH
+
+index_transcripts() splits each tutorial's WebVTT transcript into chunks of whole cues (about
+TRANSCRIPT_CHUNK_CHARS characters, overlapping by one cue), embeds them in batches bounded by
+TRANSCRIPT_EMBED_BATCH_SIZE inputs and TRANSCRIPT_EMBED_BATCH_CHARS characters, and stores them in
+tutorial_transcript_chunks with the vectors packed as float32. Tutorials are compared by the MD5 of
+their transcript, so a run only embeds new or changed transcripts and drops chunks of removed ones.
+A MySQL named lock keeps two workers from indexing at the same time.
+
+Searching loads every chunk vector into one normalised matrix per process and ranks chunks with a
+single matrix-vector product. The matrix is reloaded when the chunk table's row count or highest id
+changes, checked at most every TRANSCRIPT_INDEX_REFRESH_SECONDS.
+
+Each result points into the transcript: start_offset is a character offset usable with
+GET /courses/<course_id>/tutorials/<tutorial_id>/transcript?offset=, and start_seconds is the
+video time of the chunk's first cue (None for transcripts without cue timings).
+"""
+
+INDEX_LOCK = 'skywise_transcript_index'
+CUE_TIMING = re.compile(r'^(?:(\d+):)?(\d{2}):(\d{2})[.,](\d{3})\s+-->')
+BLOCK_SEPARATOR = re.compile(r'\r?\n\r?\n')
+
+chunks_embedded_total = metrics.counter(
+    'skywise_transcript_chunks_embedded_total', 'Transcript chunks embedded by the indexer')
+searches_total = metrics.counter(
+    'skywise_transcript_searches_total', 'GET /search/tutorials requests, by outcome', label_names=('outcome',))
+index_chunks = metrics.gauge('skywise_transcript_index_chunks', 'Transcript chunks loaded in the search matrix')
+
+
+def _seconds(match):
+    hours, minutes, seconds, millis = match.groups()
+    return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds) + int(millis) / 1000
+
+
+def _blocks(transcript):
+    """
+    Yields (offset, block) for each blank-line separated block, with offsets into the raw text
+    (\n or \r\n line endings), as used by the paged transcript endpoint.
+    """
+    position = 0
+    for separator in BLOCK_SEPARATOR.finditer(transcript):
+        yield position, transcript[position:separator.start()]
+        position = separator.end()
+    yield position, transcript[position:]
+
+
+def parse_cues(transcript):
+    """
+    Returns [(offset, start_seconds, text)] for each blank-line separated block of a transcript.
+    WebVTT cues keep only their text; the header and NOTE blocks are skipped. Blocks without a
+    timing line (plain text transcripts) are kept whole with start_seconds None.
+    """
+    cues = []
+    for offset, block in _blocks(transcript):
+        lines = [line.strip() for line in block.split('\n') if line.strip()]
+        if not lines or lines[0].startswith(('WEBVTT', 'NOTE', 'STYLE', 'REGION')):
+            continue
+
+        start_seconds = None
+        for i, line in enumerate(lines):
+            match = CUE_TIMING.match(line)
+            if match:
+                start_seconds = _seconds(match)
+                lines = lines[i + 1:]
+                break
+        text = ' '.join(lines)
+        if text:
+            cues.append((offset, start_seconds, text))
+    return cues
+
+
+def chunk_transcript(transcript, max_chars=800):
+    """
+    Groups cues into chunks of up to max_chars characters, each starting with the previous chunk's
+    last cue. A single cue longer than max_chars is a chunk on its own.
+    Returns [{'start_offset', 'start_seconds', 'text'}].
+    """
+    cues = parse_cues(transcript or '')
+    chunks = []
+    start = 0
+    while start < len(cues):
+        end = start + 1
+        size = len(cues[start][2])
+        while end < len(cues) and size + 1 + len(cues[end][2]) <= max_chars:
+            size += 1 + len(cues[end][2])
+            end += 1
+
+        offset, start_seconds, _ = cues[start]
+        chunks.append({
+            'start_offset': offset,
+            'start_seconds': start_seconds,
+            'text': ' '.join(text for _, _, text in cues[start:end]),
+        })
+        if end >= len(cues):
+            break
+        start = end - 1 if end - 1 > start else end
+    return chunks
+
+
+def embedding_batches(chunks, max_inputs=64, max_chars=24000):
+    """
+    Splits chunks into consecutive batches of at most max_inputs chunks and max_chars characters.
+    """
+    batch, size = [], 0
+    for chunk in chunks:
+        if batch and (len(batch) >= max_inputs or size + len(chunk['text']) > max_chars):
+            yield batch
+            batch, size = [], 0
+        batch.append(chunk)
+        size += len(chunk['text'])
+    if batch:
+        yield batch
+
+
+def pack_vector(vector):
+    return np.asarray(vector, dtype='<f4').tobytes()
+
+
+def unpack_vector(blob):
+    return np.frombuffer(blob, dtype='<f4')
+
+
+def index_transcripts():
+    """
+    Embeds new and changed tutorial transcripts and drops chunks of tutorials without one.
+    Returns a summary, or None when another process holds the index lock.
+    """
+    config = current_app.config
+    connection = app.mysql.connection
+    cursor = connection.cursor()
+    cursor.execute("SELECT GET_LOCK(%s, 0) AS locked", (INDEX_LOCK,))
+    if not cursor.fetchone()['locked']:
+        cursor.close()
+        return None
+
+    try:
+        cursor.execute("""
+            SELECT id, MD5(video_transcript) AS transcript_hash
+            FROM tutorials
+            WHERE video_transcript IS NOT NULL AND video_transcript <> ''
+        """)
+        current = {row['id']: row['transcript_hash'] for row in cursor.fetchall()}
+        cursor.execute("""
+            SELECT tutorial_id, MIN(transcript_hash) AS transcript_hash
+            FROM tutorial_transcript_chunks
+            GROUP BY tutorial_id
+        """)
+        indexed = {row['tutorial_id']: row['transcript_hash'] for row in cursor.fetchall()}
+
+        removed = [tutorial_id for tutorial_id in indexed if tutorial_id not in current]
+        stale = [tutorial_id for tutorial_id, digest in current.items() if indexed.get(tutorial_id) != digest]
+        chunks_written = 0
+
+        if removed:
+            placeholders = ",".join(["%s"] * len(removed))
+            cursor.execute(f"DELETE FROM tutorial_transcript_chunks WHERE tutorial_id IN ({placeholders})", removed)
+            connection.commit()
+
+        # One tutorial at a time, so only one transcript is held in memory
+        for tutorial_id in stale:
+            cursor.execute(
+                "SELECT video_transcript, MD5(video_transcript) AS transcript_hash FROM tutorials WHERE id = %s",
+                (tutorial_id,)
+            )
+            tutorial = cursor.fetchone()
+            chunks = chunk_transcript(tutorial['video_transcript'], config.get('TRANSCRIPT_CHUNK_CHARS', 800))
+
+            vectors = []
+            for batch in embedding_batches(chunks, config.get('TRANSCRIPT_EMBED_BATCH_SIZE', 64),
+                                           config.get('TRANSCRIPT_EMBED_BATCH_CHARS', 24000)):
+                vectors += embedding_utils.embed_texts([chunk['text'] for chunk in batch])
+                chunks_embedded_total.inc(len(batch))
+
+            cursor.execute("DELETE FROM tutorial_transcript_chunks WHERE tutorial_id = %s", (tutorial_id,))
+            cursor.executemany(
+                """
+                INSERT INTO tutorial_transcript_chunks
+                    (tutorial_id, chunk_index, transcript_hash, start_offset, start_seconds, text, vector)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                """,
+                [(tutorial_id, i, tutorial['transcript_hash'], chunk['start_offset'], chunk['start_seconds'],
+                  chunk['text'], pack_vector(vector)) for i, (chunk, vector) in enumerate(zip(chunks, vectors))]
+            )
+            connection.commit()
+            chunks_written += len(chunks)
+
+        return {'tutorials_indexed': len(stale), 'tutorials_removed': len(removed), 'chunks_written': chunks_written}
+    finally:
+        cursor.execute("SELECT RELEASE_LOCK(%s)", (INDEX_LOCK,))
+        cursor.close()
+
+
+def start_indexing(flask_app):
+    """
+    Runs index_transcripts() on a background thread with its own app context.
+    """
+    def run():
+        try:
+            with flask_app.app_context():
+                summary = index_transcripts()
+            flask_app.logger.info(f"Transcript indexing: {summary or 'already running elsewhere'}")
+        except Exception as e:
+            flask_app.logger.warning(f"Transcript indexing error: {e}")
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def _load_matrix(cursor):
+    cursor.execute("""
+        SELECT c.tutorial_id, c.start_offset, c.start_seconds, c.text, c.vector, t.title
+        FROM tutorial_transcript_chunks c
+        INNER JOIN tutorials t ON t.id = c.tutorial_id
+        ORDER BY c.tutorial_id, c.chunk_index
+    """)
+    chunks, vectors = [], []
+    for row in cursor.fetchall():
+        vectors.append(unpack_vector(row['vector']))
+        chunks.append({key: row[key] for key in ('tutorial_id', 'title', 'start_offset', 'start_seconds', 'text')})
+    if not vectors:
+        return chunks, None
+    matrix = np.vstack(vectors)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return chunks, matrix / np.where(norms == 0, 1, norms)
+
+
+def get_search_matrix(cursor):
+    """
+    Chunk metadata and the normalised vector matrix (None when nothing is indexed), reloaded when
+    the chunk table changes.
+    """
+    cache = current_app.extensions.setdefault('transcript_search', {'fingerprint': None, 'checked_at': 0})
+    refresh_seconds = current_app.config.get('TRANSCRIPT_INDEX_REFRESH_SECONDS', 60)
+    if cache['fingerprint'] is not None and time.monotonic() - cache['checked_at'] < refresh_seconds:
+        return cache['chunks'], cache['matrix']
+
+    cursor.execute("SELECT COUNT(*) AS chunks, COALESCE(MAX(id), 0) AS last_id FROM tutorial_transcript_chunks")
+    row = cursor.fetchone()
+    fingerprint = (row['chunks'], row['last_id'])
+    if fingerprint != cache['fingerprint']:
+        chunks, matrix = _load_matrix(cursor)
+        cache.update(chunks=chunks, matrix=matrix, fingerprint=fingerprint)
+        index_chunks.set(len(chunks))
+    cache['checked_at'] = time.monotonic()
+    return cache['chunks'], cache['matrix']
+
+
+def best_chunk_per_tutorial(scores, tutorial_ids, k):
+    """
+    {tutorial_id: chunk position} for the k tutorials with the best scoring chunks, best first.
+    Only the top few chunks are sorted, unless one tutorial's chunks crowd out the others.
+    """
+    candidates = min(len(scores), k * 8)
+    while True:
+        if candidates < len(scores):
+            top = np.argpartition(-scores, candidates - 1)[:candidates]
+            top = top[np.argsort(-scores[top])]
+        else:
+            top = np.argsort(-scores)
+
+        best = {}
+        for position in top:
+            tutorial_id = tutorial_ids[position]
+            if tutorial_id not in best:
+                best[tutorial_id] = int(position)
+                if len(best) == k:
+                    return best
+        if candidates >= len(scores):
+            return best
+        candidates = len(scores)
+
+
+def search_tutorials(query, k=5):
+    """
+    The k tutorials whose transcripts best match query, each with its best chunk.
+    """
+    try:
+        query_vector = np.asarray(embedding_utils.get_embedding(query), dtype=np.float32)
+    except Exception as e:
+        print(f"Error embedding transcript search: {str(e)}")
+        searches_total.inc(outcome='unavailable')
+        return {"error": "Transcript search is temporarily unavailable. Please try again."}, 503
+
+    cursor = app.mysql.connection.cursor()
+    try:
+        chunks, matrix = get_search_matrix(cursor)
+        if matrix is None or matrix.shape[1] != query_vector.shape[0]:
+            searches_total.inc(outcome='empty')
+            return [], 200
+
+        scores = matrix @ (query_vector / (np.linalg.norm(query_vector) or 1))
+        best = best_chunk_per_tutorial(scores, [chunk['tutorial_id'] for chunk in chunks], k)
+
+        tutorial_ids = list(best)
+        placeholders = ",".join(["%s"] * len(tutorial_ids))
+        cursor.execute(
+            f"SELECT tutorial_id, MIN(course_id) AS course_id FROM course_tutorials "
+            f"WHERE tutorial_id IN ({placeholders}) GROUP BY tutorial_id",
+            tutorial_ids
+        )
+        courses = {row['tutorial_id']: row['course_id'] for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+    results = []
+    for tutorial_id, position in best.items():
+        chunk = chunks[position]
+        start_seconds = chunk['start_seconds']
+        results.append({
+            'tutorial_id': tutorial_id,
+            'course_id': courses.get(tutorial_id),
+            'title': chunk['title'],
+            'score': round(float(scores[position]), 4),
+            'start_offset': chunk['start_offset'],
+            'start_seconds': float(start_seconds) if start_seconds is not None else None,
+            'snippet': chunk['text'],
+        })
+    searches_total.inc(outcome='ok')
+    return results, 200
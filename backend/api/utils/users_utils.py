@@ -0,0 +1,42 @@
+import json
+import app
+
+
+def get_user_details(user_id):
+    """
+    Returns the id, username, email and role of a user.
+    """
+    cursor = app.mysql.connection.cursor()
+    cursor.execute("SELECT id, username, email, role FROM users WHERE id = %s", (user_id,))
+    user = cursor.fetchone()
+    cursor.close()
+    if not user:
+        return {'error': 'User not found'}, 404
+    return user, 200
+
+
+def get_user_preferences(user_id):
+    """
+    Returns { "preferences": { ... } } for a user, or an empty dict if no preferences are set.
+    """
+    cursor = app.mysql.connection.cursor()
+
+    try:
+        cursor.execute(
+            "SELECT preferences FROM user_preferences WHERE user_id = %s",
+            (user_id,)
+        )
+        result = cursor.fetchone()
+        cursor.close()
+
+        if result:
+            # Parse JSON preferences
+            preferences = json.loads(result['preferences']) if isinstance(result['preferences'], str) else result['preferences']
+            return {"preferences": preferences}, 200
+        else:
+            # Return default preferences if none set
+            return {"preferences": {}}, 200
+
+    except Exception as e:
+        cursor.close()
+        return {'error': str(e)}, 500
@@ -6,6 +6,8 @@
 create schema if not exists skywise_db CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
 use skywise_db;
 
+DROP TABLE IF EXISTS schema_migrations;
+DROP TABLE IF EXISTS tutorial_transcript_chunks;
 DROP TABLE IF EXISTS web_traffic;
 DROP TABLE IF EXISTS admin_logs;
 DROP TABLE IF EXISTS user_quiz_answers;
@@ -0,0 +1,23 @@
+#!/bin/bash
+# Applies migrations/*.sql when the MySQL container initialises a fresh volume and records
+# them in schema_migrations, so migrate.py sees them as applied.
+# Sourced by the mysql image entrypoint, which provides docker_process_sql.
+
+docker_process_sql --database="$MYSQL_DATABASE" <<'SQL'
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version VARCHAR(20) PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    checksum CHAR(64) NOT NULL,
+    applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+SQL
+
+for f in /docker-entrypoint-migrations/*.sql; do
+    file=$(basename "$f" .sql)
+    version=${file%%_*}
+    checksum=$(sha256sum "$f" | cut -d ' ' -f 1)
+    echo "Applying migration $file"
+    docker_process_sql --database="$MYSQL_DATABASE" < "$f"
+    echo "INSERT INTO schema_migrations (version, name, checksum) VALUES ('$version', '$file', '$checksum');" \
+        | docker_process_sql --database="$MYSQL_DATABASE"
+done
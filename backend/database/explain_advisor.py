@@ -0,0 +1,153 @@
+"""
+SKYWISE INDEX ADVISOR
+
+Finds every SQL statement in the API's routes/ and utils/ packages, runs EXPLAIN on it against a
+seeded database and flags plans that scan whole tables or indexes, or sort/group through temporary
+tables. Use it with generate_synthetic_data.py loaded so the optimiser sees realistic row counts;
+on the toy seed data MySQL often prefers full scans of tiny tables.
+
+Statements are read from the source with ast: plain string literals, and f-strings whose
+interpolated parts become %s (e.g. "IN ({placeholders})" is explained as "IN (%s)").
+Every %s parameter is bound to 1.
+
+Usage (from backend/database):
+    python explain_advisor.py                    # report flagged statements
+    python explain_advisor.py --all              # include plans that look fine
+    python explain_advisor.py --min-rows 1000 --fail-on-scan   # for CI, exits 1 on a flagged scan
+
+Connection settings come from MYSQL_HOST, MYSQL_PORT, MYSQL_USER, MYSQL_PASSWORD and MYSQL_DB.
+Fixes belong in a new migrations/NNNN_*.sql file, applied with migrate.py.
+"""
+import argparse
+import ast
+import os
+import re
+
+import pymysql
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api')
+SOURCE_PACKAGES = ['routes', 'utils']
+EXPLAINABLE = re.compile(
+    r'^\s*(SELECT\b.+\bFROM\b|WITH\b|UPDATE\s+\w+(\s+\w+)?\s+SET\b|DELETE\b.*\bFROM\b|INSERT\s+INTO\b.+\bSELECT\b)',
+    re.I | re.S
+)
+PLACEHOLDER = re.compile(r'%(?:\(\w+\))?s')
+
+SCAN_TYPES = {'ALL': 'full table scan', 'index': 'full index scan'}
+EXTRA_WARNINGS = ('Using temporary', 'Using filesort', 'Using join buffer')
+
+
+def _string_value(node):
+    """
+    Literal text of a str constant or f-string, with interpolated values replaced by %s.
+    """
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.JoinedStr):
+        parts = []
+        for value in node.values:
+            if isinstance(value, ast.Constant):
+                parts.append(str(value.value))
+            else:
+                parts.append('%s')
+        return ''.join(parts)
+    return None
+
+
+def extract_statements(api_dir=API_DIR, packages=SOURCE_PACKAGES):
+    """
+    Returns [(location, sql)] for every explainable SQL string in the given packages.
+    """
+    statements = []
+    for package in packages:
+        directory = os.path.join(api_dir, package)
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith('.py'):
+                continue
+            path = os.path.join(directory, filename)
+            with open(path, encoding='utf-8') as f:
+                tree = ast.parse(f.read(), filename=path)
+
+            inside_fstring = {id(value) for node in ast.walk(tree) if isinstance(node, ast.JoinedStr)
+                              for value in node.values}
+            for node in ast.walk(tree):
+                if id(node) in inside_fstring:
+                    continue
+                sql = _string_value(node)
+                if sql and EXPLAINABLE.match(sql):
+                    statements.append((f'{package}/{filename}:{node.lineno}', ' '.join(sql.split())))
+    return statements
+
+
+def explain(cursor, sql):
+    params = tuple(1 for _ in PLACEHOLDER.findall(sql))
+    cursor.execute(f'EXPLAIN {PLACEHOLDER.sub("%s", sql)}', params or None)
+    return cursor.fetchall()
+
+
+def findings(plan, min_rows):
+    """
+    Problems in one EXPLAIN result: scans over at least min_rows rows, and temporary tables or filesorts.
+    """
+    problems = []
+    for row in plan:
+        table = row.get('table')
+        rows = row.get('rows') or 0
+        scan = SCAN_TYPES.get(row.get('type'))
+        if scan and rows >= min_rows:
+            problems.append(f"{scan} on {table} (~{rows} rows, possible keys: {row.get('possible_keys') or 'none'})")
+        extra = row.get('Extra') or ''
+        for warning in EXTRA_WARNINGS:
+            if warning in extra and rows >= min_rows:
+                problems.append(f'{warning.lower()} on {table}')
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--min-rows', type=int, default=100, help='ignore scans estimated below this many rows')
+    parser.add_argument('--all', action='store_true', help='print every plan, not only flagged ones')
+    parser.add_argument('--fail-on-scan', action='store_true', help='exit 1 when a statement is flagged')
+    parser.add_argument('--host', default=os.getenv('MYSQL_HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.getenv('MYSQL_PORT', 3306)))
+    parser.add_argument('--user', default=os.getenv('MYSQL_USER', 'root'))
+    parser.add_argument('--password', default=os.getenv('MYSQL_PASSWORD', ''))
+    parser.add_argument('--database', default=os.getenv('MYSQL_DB', 'skywise_db'))
+    args = parser.parse_args()
+
+    connection = pymysql.connect(host=args.host, port=args.port, user=args.user, password=args.password,
+                                 database=args.database, charset='utf8mb4',
+                                 cursorclass=pymysql.cursors.DictCursor)
+    statements = extract_statements()
+    flagged = errors = 0
+    try:
+        with connection.cursor() as cursor:
+            for location, sql in statements:
+                try:
+                    plan = explain(cursor, sql)
+                except pymysql.MySQLError as e:
+                    errors += 1
+                    print(f'{location}\n  could not EXPLAIN: {e.args[-1]}\n  {sql[:160]}\n')
+                    continue
+
+                problems = findings(plan, args.min_rows)
+                if problems:
+                    flagged += 1
+                if problems or args.all:
+                    print(f'{location}\n  {sql[:160]}')
+                    for row in plan:
+                        print(f"    {row.get('table')}: type={row.get('type')} key={row.get('key')} "
+                              f"rows={row.get('rows')} filtered={row.get('filtered')} extra={row.get('Extra') or ''}")
+                    for problem in problems:
+                        print(f'  !! {problem}')
+                    print()
+    finally:
+        connection.close()
+
+    print(f'{len(statements)} statements explained, {flagged} flagged, {errors} could not be explained')
+    if args.fail_on_scan and flagged:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,499 @@
+"""
+SKYWISE SYNTHETIC DATASET GENERATOR
+
+Fills skywise_db with production-sized, skewed data so query plans and performance features can be
+exercised at realistic scale. It runs on top of the normal seed scripts (run_all.sh): new rows are
+given ids after the current MAX(id) of each table, so the hand-written courses and sample users stay
+untouched.
+
+Shape of the data:
+    - course and tutorial popularity, and how active each user is, follow a Zipf distribution (--zipf)
+    - every tutorial has one quiz with --questions-per-quiz questions of --options-per-question options
+    - each quiz attempt stores one answer per question, so answers = attempts * questions-per-quiz
+    - timestamps fall within the last --days days and lean towards recent activity
+
+Rows are written by --workers processes in parallel, either as multi-row INSERTs (default) or with
+LOAD DATA LOCAL INFILE (--method load-data, needs local_infile enabled on the server).
+
+Usage (from backend/database, after run_all.sh):
+    python generate_synthetic_data.py --profile small
+    python generate_synthetic_data.py --profile production --workers 8 --method load-data
+    python generate_synthetic_data.py --users 100000 --quiz-attempts 2000000 --zipf 1.2
+
+Connection settings come from MYSQL_HOST, MYSQL_PORT, MYSQL_USER, MYSQL_PASSWORD and MYSQL_DB,
+the same variables the API reads, and can be overridden on the command line.
+Synthetic users log in as synthetic.user<id>@example.com with the sample users' password.
+"""
+import argparse
+import bisect
+import functools
+import itertools
+import json
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+import pymysql
+
+PROFILES = {
+    'small': dict(users=5_000, courses=20, tutorials=300, quiz_attempts=50_000,
+                  tutorial_progress=60_000, course_progress=15_000),
+    'medium': dict(users=50_000, courses=60, tutorials=1_200, quiz_attempts=1_000_000,
+                   tutorial_progress=1_000_000, course_progress=150_000),
+    'production': dict(users=500_000, courses=200, tutorials=5_000, quiz_attempts=10_000_000,
+                       tutorial_progress=15_000_000, course_progress=1_500_000),
+}
+
+# Same hash as insert_sample_users.sql, so synthetic users share the sample password
+PASSWORD_HASH = '$2b$12$5MFsjRaeD/eE7WLrY6XqtO8BIDD90pGuxrYVzeJsOQg3koBEh8rxm'
+
+CATEGORIES = ['Cybersecurity', 'Email', 'Office Tools', 'Communication', 'Cloud Storage',
+              'Mobile Devices', 'Online Safety', 'Careers', 'Spreadsheets', 'Accessibility']
+TOPICS = ['Passwords', 'Email', 'Spreadsheets', 'Video Calls', 'Cloud Files', 'Online Banking',
+          'Smartphones', 'Job Applications', 'Social Media', 'Printing', 'Web Browsing', 'Shopping']
+LEVELS = ['Beginner', 'Intermediate', 'Advanced']
+WORDS = ('click open the settings menu choose your account then select save and check that '
+         'everything looks right before you continue to the next step in this lesson').split()
+
+CHUNK_ROWS = 50_000
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='small')
+    parser.add_argument('--users', type=int)
+    parser.add_argument('--courses', type=int)
+    parser.add_argument('--tutorials', type=int)
+    parser.add_argument('--quiz-attempts', type=int)
+    parser.add_argument('--tutorial-progress', type=int)
+    parser.add_argument('--course-progress', type=int)
+    parser.add_argument('--questions-per-quiz', type=int, default=5)
+    parser.add_argument('--options-per-question', type=int, default=4)
+    parser.add_argument('--transcript-chars', type=int, default=12_000)
+    parser.add_argument('--zipf', type=float, default=1.1, help='Zipf exponent for popularity skew')
+    parser.add_argument('--days', type=int, default=365, help='spread activity over this many days')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4)
+    parser.add_argument('--batch-size', type=int, default=5_000, help='rows per INSERT batch')
+    parser.add_argument('--method', choices=['insert', 'load-data'], default='insert')
+    parser.add_argument('--host', default=os.getenv('MYSQL_HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.getenv('MYSQL_PORT', 3306)))
+    parser.add_argument('--user', default=os.getenv('MYSQL_USER', 'root'))
+    parser.add_argument('--password', default=os.getenv('MYSQL_PASSWORD', ''))
+    parser.add_argument('--database', default=os.getenv('MYSQL_DB', 'skywise_db'))
+    args = parser.parse_args()
+
+    for key, value in PROFILES[args.profile].items():
+        if getattr(args, key) is None:
+            setattr(args, key, value)
+    return args
+
+
+def connect(settings, local_infile=False):
+    return pymysql.connect(
+        host=settings['host'],
+        port=settings['port'],
+        user=settings['user'],
+        password=settings['password'],
+        database=settings['database'],
+        charset='utf8mb4',
+        autocommit=False,
+        local_infile=local_infile,
+    )
+
+
+"""
+SKEWED SAMPLING
+"""
+
+
+class ZipfSampler:
+    """
+    Draws ids from first_id .. first_id + count - 1 with Zipf(s) popularity.
+    Which ids are popular is a fixed shuffle of the range, so every worker agrees on it.
+    """
+
+    def __init__(self, first_id, count, s, seed):
+        self.ids = list(range(first_id, first_id + count))
+        random.Random(seed).shuffle(self.ids)
+        self.cum_weights = list(itertools.accumulate(1.0 / (rank + 1) ** s for rank in range(count)))
+
+    def one(self, rng):
+        index = bisect.bisect_left(self.cum_weights, rng.random() * self.cum_weights[-1])
+        return self.ids[min(index, len(self.ids) - 1)]
+
+    def distinct(self, rng, k):
+        k = min(k, len(self.ids))
+        chosen = set()
+        attempts = 0
+        while len(chosen) < k and attempts < k * 20:
+            chosen.add(self.one(rng))
+            attempts += 1
+        if len(chosen) < k:
+            remaining = [i for i in self.ids if i not in chosen]
+            chosen.update(rng.sample(remaining, k - len(chosen)))
+        return chosen
+
+
+@functools.lru_cache(maxsize=None)
+def sampler(first_id, count, s, seed):
+    """
+    Per-process cache, so each worker builds the cumulative weights once rather than per chunk.
+    """
+    return ZipfSampler(first_id, count, s, seed)
+
+
+def recent_timestamp(rng, now, days):
+    """
+    Timestamp within the last days days, biased towards now.
+    """
+    return now - timedelta(seconds=int(days * 86400 * rng.random() ** 2))
+
+
+def activity_count(rng, mean, cap):
+    """
+    Heavy-tailed number of items for one user with the given mean.
+    """
+    return min(cap, int(rng.expovariate(1 / mean))) if mean > 0 else 0
+
+
+def transcript(rng, chars):
+    cues = ['WEBVTT']
+    seconds = 0.0
+    length = 6
+    while length < chars:
+        end = seconds + rng.uniform(2, 6)
+        text = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))).capitalize() + '.'
+        cue = f'{_vtt_time(seconds)} --> {_vtt_time(end)}\n{text}'
+        cues.append(cue)
+        length += len(cue) + 2
+        seconds = end + 0.15
+    return '\n\n'.join(cues)
+
+
+def _vtt_time(seconds):
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f'{int(hours):02d}:{int(minutes):02d}:{secs:06.3f}'
+
+
+"""
+ROW GENERATORS
+"""
+
+
+def catalog_layout(plan):
+    """
+    Deterministic id layout of the generated catalog. Tutorial i belongs to course i % courses,
+    has quiz i, whose question k is question i * qpq + k, whose option m is that question's
+    id * opq + m (option 0 is correct).
+    """
+    ids = plan['first_ids']
+    qpq = plan['questions_per_quiz']
+    opq = plan['options_per_question']
+    return {
+        'course': lambda i: ids['courses'] + i,
+        'tutorial': lambda i: ids['tutorials'] + i,
+        'quiz': lambda i: ids['quizzes'] + i,
+        'question': lambda quiz_index, k: ids['quiz_questions'] + quiz_index * qpq + k,
+        'option': lambda question_index, m: ids['quiz_options'] + question_index * opq + m,
+    }
+
+
+def generate_catalog(plan):
+    rng = random.Random(plan['seed'])
+    layout = catalog_layout(plan)
+    courses = plan['courses']
+    tutorials = plan['tutorials']
+    qpq = plan['questions_per_quiz']
+    opq = plan['options_per_question']
+
+    course_rows, requirement_rows, prerequisite_rows = [], [], []
+    for i in range(courses):
+        topic = TOPICS[i % len(TOPICS)]
+        level = LEVELS[rng.randrange(len(LEVELS))]
+        duration = rng.randint(20, 90)
+        objectives = json.dumps([f'Use {topic.lower()} with confidence', f'Avoid common {topic.lower()} mistakes'])
+        course_rows.append((
+            layout['course'](i), f'{topic} Essentials {i + 1}',
+            f'Practical {topic.lower()} skills for everyday life.', level,
+            f'A synthetic {level.lower()} course about {topic.lower()}.', objectives,
+            duration, duration + rng.randint(10, 40), None,
+        ))
+        for k in range(rng.randint(1, 3)):
+            requirement_rows.append((layout['course'](i), f'Requirement {k + 1} for course {i + 1}'))
+        if i and rng.random() < 0.3:
+            prerequisite_rows.append((layout['course'](i), layout['course'](rng.randrange(i))))
+
+    tutorial_rows, course_tutorial_rows, quiz_rows, question_rows, option_rows = [], [], [], [], []
+    for i in range(tutorials):
+        tutorial_id = layout['tutorial'](i)
+        topic = TOPICS[(i % courses) % len(TOPICS)]
+        tutorial_rows.append((
+            tutorial_id, f'{topic} lesson {i // courses + 1}', f'Step-by-step guide to {topic.lower()}.',
+            'synthesia', f'https://share.synthesia.io/embeds/videos/synthetic-{tutorial_id}',
+            CATEGORIES[i % len(CATEGORIES)], transcript(rng, plan['transcript_chars']),
+        ))
+        course_tutorial_rows.append((layout['course'](i % courses), tutorial_id))
+        quiz_rows.append((layout['quiz'](i), tutorial_id, f'{topic} lesson {i // courses + 1} quiz'))
+        for k in range(qpq):
+            question_index = i * qpq + k
+            question_id = layout['question'](i, k)
+            question_rows.append((question_id, layout['quiz'](i), f'Question {k + 1} about {topic.lower()}?', k + 1))
+            for m in range(opq):
+                option_rows.append((layout['option'](question_index, m), question_id, f'Option {m + 1}', m == 0))
+
+    return [
+        ('courses', ('id', 'name', 'description', 'difficulty', 'summary', 'learning_objectives',
+                     'duration_min_minutes', 'duration_max_minutes', 'thumbnail_url'), course_rows),
+        ('course_requirements', ('course_id', 'requirement_text'), requirement_rows),
+        ('course_prerequisites', ('course_id', 'prerequisite_course_id'), prerequisite_rows),
+        ('tutorials', ('id', 'title', 'description', 'video_provider', 'video_url', 'category',
+                       'video_transcript'), tutorial_rows),
+        ('course_tutorials', ('course_id', 'tutorial_id'), course_tutorial_rows),
+        ('quizzes', ('id', 'tutorial_id', 'title'), quiz_rows),
+        ('quiz_questions', ('id', 'quiz_id', 'question_text', 'question_order'), question_rows),
+        ('quiz_options', ('id', 'question_id', 'option_text', 'is_correct'), option_rows),
+    ]
+
+
+def generate_users(plan, start, end):
+    rng = random.Random(f"{plan['seed']}:users:{start}")
+    now = datetime.fromisoformat(plan['now'])
+    first_id = plan['first_ids']['users']
+    rows = []
+    for i in range(start, end):
+        user_id = first_id + i
+        rows.append((user_id, f'synthetic_user_{user_id}', f'synthetic.user{user_id}@example.com',
+                     PASSWORD_HASH, 'user', 'English', recent_timestamp(rng, now, plan['days'])))
+    return [('users', ('id', 'username', 'email', 'password_hash', 'role', 'language_preference', 'created_at'), rows)]
+
+
+def generate_progress(plan, start, end):
+    """
+    Tutorial and course progress for users start .. end - 1. Chunking by user keeps the
+    (user_id, tutorial_id) and (user_id, course_id) unique keys collision-free across workers.
+    """
+    rng = random.Random(f"{plan['seed']}:progress:{start}")
+    now = datetime.fromisoformat(plan['now'])
+    tutorials = sampler(plan['first_ids']['tutorials'], plan['tutorials'], plan['zipf'], plan['seed'])
+    courses = sampler(plan['first_ids']['courses'], plan['courses'], plan['zipf'], plan['seed'] + 1)
+    tutorial_mean = plan['tutorial_progress'] / plan['users']
+    course_mean = plan['course_progress'] / plan['users']
+
+    tutorial_rows, course_rows = [], []
+    for i in range(start, end):
+        user_id = plan['first_ids']['users'] + i
+        for tutorial_id in tutorials.distinct(rng, activity_count(rng, tutorial_mean, plan['tutorials'])):
+            completed = rng.random() < 0.8
+            feedback = rng.choices([None, 'positive', 'negative'], weights=[70, 22, 8])[0]
+            tutorial_rows.append((user_id, tutorial_id, completed,
+                                  recent_timestamp(rng, now, plan['days']) if completed else None, feedback))
+        for course_id in courses.distinct(rng, activity_count(rng, course_mean, plan['courses'])):
+            progress = 100 if rng.random() < 0.35 else round(rng.uniform(0, 99), 2)
+            course_rows.append((user_id, course_id, progress, recent_timestamp(rng, now, plan['days'])))
+
+    return [
+        ('user_tutorial_progress', ('user_id', 'tutorial_id', 'completed', 'completed_at', 'feedback'), tutorial_rows),
+        ('user_course_progress', ('user_id', 'course_id', 'progress_percentage', 'last_updated'), course_rows),
+    ]
+
+
+def generate_attempts(plan, start, end):
+    """
+    Quiz attempts start .. end - 1 and one answer per question for each of them.
+    """
+    rng = random.Random(f"{plan['seed']}:attempts:{start}")
+    now = datetime.fromisoformat(plan['now'])
+    layout = catalog_layout(plan)
+    users = sampler(plan['first_ids']['users'], plan['users'], plan['zipf'], plan['seed'] + 2)
+    quizzes = sampler(0, plan['tutorials'], plan['zipf'], plan['seed'])
+    qpq = plan['questions_per_quiz']
+    opq = plan['options_per_question']
+
+    result_rows, answer_rows = [], []
+    for i in range(start, end):
+        result_id = plan['first_ids']['user_quiz_results'] + i
+        quiz_index = quizzes.one(rng)
+        skill = rng.betavariate(4, 2)
+        correct = 0
+        for k in range(qpq):
+            question_index = quiz_index * qpq + k
+            is_correct = rng.random() < skill
+            option = 0 if is_correct else rng.randrange(1, opq)
+            correct += is_correct
+            answer_rows.append((result_id, layout['question'](quiz_index, k),
+                                layout['option'](question_index, option), is_correct))
+        result_rows.append((result_id, users.one(rng), layout['quiz'](quiz_index),
+                            round(correct / qpq * 100, 2), qpq, correct, recent_timestamp(rng, now, plan['days'])))
+
+    return [
+        ('user_quiz_results', ('id', 'user_id', 'quiz_id', 'score', 'total_questions', 'correct_answers',
+                               'attempted_at'), result_rows),
+        ('user_quiz_answers', ('user_quiz_result_id', 'question_id', 'selected_option_id', 'is_correct'), answer_rows),
+    ]
+
+
+GENERATORS = {
+    'catalog': lambda plan, start, end: generate_catalog(plan),
+    'users': generate_users,
+    'progress': generate_progress,
+    'attempts': generate_attempts,
+}
+
+
+"""
+BULK WRITERS
+"""
+
+
+def _tsv_value(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def write_insert(connection, table, columns, rows, batch_size):
+    """
+    Multi-row INSERTs: pymysql folds executemany on an INSERT ... VALUES into batched statements.
+    """
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+    with connection.cursor() as cursor:
+        for offset in range(0, len(rows), batch_size):
+            cursor.executemany(sql, rows[offset:offset + batch_size])
+            connection.commit()
+
+
+def write_load_data(connection, table, columns, rows, batch_size):
+    with tempfile.NamedTemporaryFile('w', suffix='.tsv', encoding='utf-8', delete=False) as f:
+        for row in rows:
+            f.write('\t'.join(_tsv_value(value) for value in row) + '\n')
+        path = f.name
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} CHARACTER SET utf8mb4 "
+                f"FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' ({', '.join(columns)})",
+                (path,)
+            )
+        connection.commit()
+    finally:
+        os.remove(path)
+
+
+WRITERS = {'insert': write_insert, 'load-data': write_load_data}
+
+
+def run_task(plan, settings, kind, start, end):
+    """
+    Worker entry point: generates one chunk and writes it on the worker's own connection.
+    """
+    connection = connect(settings, local_infile=plan['method'] == 'load-data')
+    written = {}
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SET SESSION unique_checks = 0, foreign_key_checks = 0")
+        for table, columns, rows in GENERATORS[kind](plan, start, end):
+            WRITERS[plan['method']](connection, table, columns, rows, plan['batch_size'])
+            written[table] = written.get(table, 0) + len(rows)
+    finally:
+        connection.close()
+    return written
+
+
+"""
+ORCHESTRATION
+"""
+
+ID_TABLES = ['users', 'courses', 'tutorials', 'quizzes', 'quiz_questions', 'quiz_options', 'user_quiz_results']
+
+
+def build_plan(args, settings):
+    connection = connect(settings)
+    try:
+        with connection.cursor() as cursor:
+            first_ids = {}
+            for table in ID_TABLES:
+                cursor.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}")
+                first_ids[table] = cursor.fetchone()[0]
+    finally:
+        connection.close()
+
+    return {
+        'users': args.users,
+        'courses': args.courses,
+        'tutorials': args.tutorials,
+        'quiz_attempts': args.quiz_attempts,
+        'tutorial_progress': args.tutorial_progress,
+        'course_progress': args.course_progress,
+        'questions_per_quiz': args.questions_per_quiz,
+        'options_per_question': args.options_per_question,
+        'transcript_chars': args.transcript_chars,
+        'zipf': args.zipf,
+        'days': args.days,
+        'seed': args.seed,
+        'batch_size': args.batch_size,
+        'method': args.method,
+        'now': datetime.now().replace(microsecond=0).isoformat(),
+        'first_ids': first_ids,
+    }
+
+
+def chunks(total, size=CHUNK_ROWS):
+    return [(start, min(start + size, total)) for start in range(0, total, size)]
+
+
+def run_phase(name, tasks, plan, settings, workers):
+    started = time.time()
+    totals = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_task, plan, settings, kind, start, end) for kind, start, end in tasks]
+        for done, future in enumerate(as_completed(futures), 1):
+            for table, count in future.result().items():
+                totals[table] = totals.get(table, 0) + count
+            print(f'  {name}: {done}/{len(futures)} chunks', end='\r', flush=True)
+    elapsed = time.time() - started
+    summary = ', '.join(f'{table} {count:,}' for table, count in totals.items())
+    print(f'  {name}: {summary} in {elapsed:.1f}s' + ' ' * 20)
+    return totals
+
+
+def main():
+    args = parse_args()
+    settings = {'host': args.host, 'port': args.port, 'user': args.user,
+                'password': args.password, 'database': args.database}
+    plan = build_plan(args, settings)
+
+    print(f"Generating into {args.database} on {args.host}:{args.port} with {args.workers} workers ({args.method})")
+    print(f"  {plan['users']:,} users, {plan['courses']:,} courses, {plan['tutorials']:,} tutorials, "
+          f"{plan['quiz_attempts']:,} quiz attempts ({plan['quiz_attempts'] * plan['questions_per_quiz']:,} answers)")
+
+    run_phase('catalog', [('catalog', 0, 0)], plan, settings, 1)
+    run_phase('users', [('users', s, e) for s, e in chunks(plan['users'])], plan, settings, args.workers)
+    run_phase('activity',
+              [('progress', s, e) for s, e in chunks(plan['users'], CHUNK_ROWS // 5)]
+              + [('attempts', s, e) for s, e in chunks(plan['quiz_attempts'], CHUNK_ROWS // plan['questions_per_quiz'])],
+              plan, settings, args.workers)
+
+    connection = connect(settings)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "ANALYZE TABLE users, courses, course_requirements, course_prerequisites, tutorials, "
+                "course_tutorials, quizzes, quiz_questions, quiz_options, user_tutorial_progress, "
+                "user_course_progress, user_quiz_results, user_quiz_answers"
+            )
+            cursor.fetchall()
+    finally:
+        connection.close()
+    print('Done. Table statistics refreshed with ANALYZE TABLE.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""
+SKYWISE SCHEMA MIGRATIONS
+
+Applies the versioned scripts in migrations/ (NNNN_description.sql) that have not run yet, in order,
+and records each one in the schema_migrations table with a checksum of its contents.
+Editing a migration after it has been applied is reported, since the database will not pick it up:
+add a new migration instead.
+
+Usage (from backend/database, after db_creation.sql):
+    python migrate.py            # apply pending migrations
+    python migrate.py --status   # list applied and pending migrations
+    python migrate.py --dry-run  # print the pending statements without running them
+
+Connection settings come from MYSQL_HOST, MYSQL_PORT, MYSQL_USER, MYSQL_PASSWORD and MYSQL_DB,
+the same variables the API reads, and can be overridden on the command line. --socket (or
+MYSQL_UNIX_SOCKET) connects over the local Unix socket instead of TCP, which also works for
+accounts that use socket authentication.
+"""
+import argparse
+import hashlib
+import os
+import re
+import sys
+
+import pymysql
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+MIGRATION_FILE = re.compile(r'^(\d{4})_[\w-]+\.sql$')
+
+CREATE_MIGRATIONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version VARCHAR(20) PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        checksum CHAR(64) NOT NULL,
+        applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def discover_migrations(directory=MIGRATIONS_DIR):
+    """
+    Returns [(version, name, path, checksum)] for every migration file, ordered by version.
+    """
+    migrations = []
+    for filename in sorted(os.listdir(directory)):
+        match = MIGRATION_FILE.match(filename)
+        if not match:
+            continue
+        path = os.path.join(directory, filename)
+        with open(path, 'rb') as f:
+            checksum = hashlib.sha256(f.read()).hexdigest()
+        migrations.append((match.group(1), filename[:-4], path, checksum))
+
+    versions = [version for version, *_ in migrations]
+    duplicates = {version for version in versions if versions.count(version) > 1}
+    if duplicates:
+        raise SystemExit(f"Duplicate migration versions: {', '.join(sorted(duplicates))}")
+    return migrations
+
+
+def split_statements(sql):
+    """
+    Splits a migration script into statements on semicolons at the end of a line,
+    dropping -- comment lines.
+    """
+    lines = [line for line in sql.splitlines() if not line.strip().startswith('--')]
+    statements = re.split(r';\s*$', '\n'.join(lines), flags=re.MULTILINE)
+    return [statement.strip() for statement in statements if statement.strip()]
+
+
+def applied_migrations(cursor):
+    cursor.execute(CREATE_MIGRATIONS_TABLE)
+    cursor.execute("SELECT version, name, checksum FROM schema_migrations ORDER BY version")
+    return {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--status', action='store_true', help='list migrations and exit')
+    parser.add_argument('--dry-run', action='store_true', help='print pending statements without running them')
+    parser.add_argument('--host', default=os.getenv('MYSQL_HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.getenv('MYSQL_PORT', 3306)))
+    parser.add_argument('--user', default=os.getenv('MYSQL_USER', 'root'))
+    parser.add_argument('--password', default=os.getenv('MYSQL_PASSWORD', ''))
+    parser.add_argument('--database', default=os.getenv('MYSQL_DB', 'skywise_db'))
+    parser.add_argument('--socket', default=os.getenv('MYSQL_UNIX_SOCKET') or None,
+                        help='Unix socket path; --host and --port are ignored when set')
+    args = parser.parse_args()
+
+    migrations = discover_migrations()
+    connection = pymysql.connect(host=args.host, port=args.port, unix_socket=args.socket, user=args.user,
+                                 password=args.password, database=args.database, charset='utf8mb4',
+                                 autocommit=True)
+    try:
+        with connection.cursor() as cursor:
+            applied = applied_migrations(cursor)
+
+            for version, name, _, checksum in migrations:
+                if version in applied and applied[version][1] != checksum:
+                    print(f"WARNING: {name} was edited after it was applied; add a new migration instead")
+
+            pending = [m for m in migrations if m[0] not in applied]
+
+            if args.status:
+                for version, name, _, _ in migrations:
+                    print(f"{'applied' if version in applied else 'pending':<8} {name}")
+                return
+
+            if not pending:
+                print('Database is up to date.')
+                return
+
+            for version, name, path, checksum in pending:
+                with open(path, encoding='utf-8') as f:
+                    statements = split_statements(f.read())
+
+                print(f"Applying {name} ({len(statements)} statements)")
+                for statement in statements:
+                    if args.dry_run:
+                        print(f"{statement};\n")
+                        continue
+                    try:
+                        cursor.execute(statement)
+                    except pymysql.MySQLError as e:
+                        # MySQL DDL is not transactional, so report exactly where it stopped
+                        print(f"Migration {name} failed on:\n{statement}\n{e}", file=sys.stderr)
+                        raise SystemExit(1)
+
+                if not args.dry_run:
+                    cursor.execute(
+                        "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                        (version, name, checksum)
+                    )
+    finally:
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
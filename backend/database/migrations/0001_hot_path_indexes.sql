@@ -0,0 +1,17 @@
+-- =============================================================
+--  0001 HOT PATH INDEXES
+--  Indexes for predicates flagged by explain_advisor.py
+-- =============================================================
+
+-- calculate_course_progress, complete_tutorial and get_next_step filter quiz results
+-- by user and quiz and compare or aggregate the score
+CREATE INDEX idx_user_quiz_score ON user_quiz_results (user_id, quiz_id, score);
+
+-- One embedding per course: drop duplicates (keeping the newest row) before making course_id unique
+DELETE older FROM course_embedding older
+JOIN course_embedding newer ON older.course_id = newer.course_id AND older.id < newer.id;
+
+ALTER TABLE course_embedding ADD UNIQUE KEY unique_course_embedding (course_id);
+
+-- Dashboard and admin counts of completed tutorials per user, and weekly completed_at ranges
+CREATE INDEX idx_user_completed_at ON user_tutorial_progress (user_id, completed, completed_at);
@@ -0,0 +1,10 @@
+-- =============================================================
+--  0002 ACTIVITY RANGE INDEXES
+--  (user_id, timestamp) indexes for the weekly activity range queries
+--  in dashboard.get_dashboard_stats and admin.get_user_details.
+--  user_tutorial_progress is covered by idx_user_completed_at from 0001.
+-- =============================================================
+
+CREATE INDEX idx_user_attempted_at ON user_quiz_results (user_id, attempted_at);
+
+CREATE INDEX idx_user_last_updated ON user_course_progress (user_id, last_updated);
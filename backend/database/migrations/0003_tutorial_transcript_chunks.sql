@@ -0,0 +1,21 @@
+-- =============================================================
+--  0003 TUTORIAL TRANSCRIPT CHUNKS
+--  Embedded transcript chunks for GET /search/tutorials, written by
+--  utils/transcript_search.index_transcripts(). vector holds the
+--  embedding as packed little-endian float32 (6 KB for 1536 dimensions,
+--  against ~30 KB as JSON). transcript_hash is the MD5 of the transcript
+--  the chunk came from, so only changed tutorials are re-embedded.
+-- =============================================================
+
+CREATE TABLE tutorial_transcript_chunks (
+    id INT PRIMARY KEY AUTO_INCREMENT,
+    tutorial_id INT NOT NULL,
+    chunk_index INT NOT NULL,
+    transcript_hash CHAR(32) NOT NULL,
+    start_offset INT NOT NULL,
+    start_seconds DECIMAL(10, 3),
+    text TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    UNIQUE KEY uq_tutorial_chunk (tutorial_id, chunk_index),
+    FOREIGN KEY (tutorial_id) REFERENCES tutorials(id) ON DELETE CASCADE
+);
@@ -26,4 +26,9 @@ mysql -u root skywise_db < insert_everyday_computing_course.sql
 echo "Sourcing ./insert_sample_users.sql"
 mysql -u root skywise_db < insert_sample_users.sql
 
+echo "Applying schema migrations"
+# Same account as the steps above: root over the local socket, without a password
+socket=$(mysql -u root -N -B -e "SELECT @@socket")
+python3 migrate.py --socket "$socket" --user root --password "" --database skywise_db
+
 echo "Database initialization complete!"
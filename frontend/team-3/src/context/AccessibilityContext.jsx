@@ -5,6 +5,8 @@ const AccessibilityContext = createContext();
 
 const defaultSettings = {
   fontSize: 100,
+  // Used by the API to work out "this week" and weekday activity in the learner's local time
+  timezone: Intl.DateTimeFormat().resolvedOptions().timeZone,
 };
 
 export const AccessibilityProvider = ({ children }) => {
@@ -29,7 +31,7 @@ export const AccessibilityProvider = ({ children }) => {
     try {
       const response = await api.get('/preferences');
       if (response.data.preferences && Object.keys(response.data.preferences).length > 0) {
-        setSettings(response.data.preferences);
+        setSettings({ ...defaultSettings, ...response.data.preferences });
       }
     } catch (error) {
       console.error("Error fetching preferences:", error);
@@ -47,6 +47,7 @@ const HOLD_DURATION_FRAMES = 60; // ~2 seconds at 30fps
 const Learning = () => {
   // State
   const [tutorialData, setTutorialData] = useState();
+  const [transcript, setTranscript] = useState(null);
   const [courseData, setCourseData] = useState();
   const [quizzes, setQuizzes] = useState([]);
   const [allTutorials, setAllTutorials] = useState([]);
@@ -116,6 +117,36 @@ const Learning = () => {
     fetchData();
   }, [courseId, tutorialId, api]);
  
+  // Fetch the transcript lazily, only once the transcript tab is opened
+  useEffect(() => {
+    setTranscript(null);
+  }, [courseId, tutorialId]);
+ 
+  useEffect(() => {
+    const fetchTranscript = async () => {
+      if (!api || activeTab !== 1 || transcript !== null) return;
+      if (!tutorialData?.transcript_length) return;
+ 
+      try {
+        let text = "";
+        let offset = 0;
+        while (offset !== null && offset !== undefined) {
+          const res = await api.get(
+            `/courses/${courseId}/tutorials/${tutorialId}/transcript`,
+            { params: { offset } }
+          );
+          text += res.data?.text || "";
+          offset = res.data?.next_offset;
+        }
+        setTranscript(text);
+      } catch (err) {
+        console.error("Error fetching transcript:", err);
+      }
+    };
+ 
+    fetchTranscript();
+  }, [activeTab, tutorialData, transcript, courseId, tutorialId, api]);
+ 
   // Load Teachable Machine scripts
   useEffect(() => {
     const loadScripts = async () => {
@@ -697,8 +728,10 @@ const Learning = () => {
           } flex-col w-full h-full p-5 gap-3 text-black max-h-100 overflow-y-scroll`}
         >
           <p className="font-bold">Transcript</p>
-          {tutorialData?.video_transcript ? (
-            <p>{getRawTxtFromVtt(tutorialData.video_transcript)}</p>
+          {transcript ? (
+            <p>{getRawTxtFromVtt(transcript)}</p>
+          ) : tutorialData?.transcript_length ? (
+            <p>Loading transcript...</p>
           ) : (
             <p>No transcript available</p>
           )}
@@ -43,6 +43,7 @@ export default function Settings() {
   const handleReset = async () => {
     const defaultSettings = {
       fontSize: 100,
+      timezone: Intl.DateTimeFormat().resolvedOptions().timeZone,
     };
     setLocalSettings(defaultSettings);
     
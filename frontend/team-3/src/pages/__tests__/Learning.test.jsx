@@ -45,7 +45,7 @@ const mockTutorialData = {
   description: 'Learn the basics of JavaScript',
   category: 'Programming',
   video_url: 'https://example.com/video.mp4',
-  video_transcript: 'WEBTVV\n\n00:00:00.000 --> 00:00:05.000\nWelcome to JavaScript\n\n00:00:05.000 --> 00:00:10.000\nLet\'s get started',
+  transcript_length: 92,
   created_at: '2024-01-01',
   is_completed: false,
   has_completed_quiz: false,